@@ -0,0 +1,253 @@
+"""
+Benchmarks for competitive analysis on synthetic datasets
+
+Generates competitive launch datasets in the schema of
+data/competitive_launches.json, then records latency and peak memory of the
+competitive analysis functions at each size. Runs fully offline in a
+temporary directory.
+
+    $ python -m benchmarks.competitive_bench --save
+    $ python -m benchmarks.competitive_bench --sizes 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import competitive_analysis, competitive_index, competitive_store, launch_search
+from utils.competitive_index import COMPETITIVE_DATA_PATH
+from utils.launch_labels import FUNDING_LEVELS, LAUNCH_TYPES
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# 10⁶ examples needs several GB of memory to index, so it is opt-in with --sizes
+DEFAULT_SIZES = (100, 10_000)
+
+# Timed calls per function; the slowest sizes get fewer
+REPEATS = 50
+MIN_REPEATS = 5
+
+INDUSTRIES = (
+    "SaaS", "D2C / E-commerce", "Fintech", "Healthcare", "Enterprise Software", "AI/ML", "Service"
+)
+
+_words = (
+    "launch", "waitlist", "invite-only", "community", "content", "referral", "program", "beta",
+    "partners", "press", "founders", "twitter", "newsletter", "webinar", "pricing", "freemium",
+    "onboarding", "creators", "developers", "enterprise", "viral", "growth", "template", "podcast",
+    "influencers", "ambassadors", "events", "marketplace", "integration", "api", "demo", "trial"
+)
+
+_fundings = (
+    "Bootstrapped", "Raised $500K pre-seed", "Raised $1.5M seed", "Raised $2M seed",
+    "Raised $8M Series A", "Raised $25M Series B", "Undisclosed"
+)
+
+def _sentence(rng, length):
+    """Random sentence from the benchmark vocabulary"""
+    return " ".join(rng.choice(_words) for _ in range(length)).capitalize()
+
+def generate_example(rng, number):
+    """
+    Generate one synthetic competitive launch example
+
+    Args:
+        rng (random.Random): Random generator
+        number (int): Example number, used for the company name
+
+    Returns:
+        dict: Example in the competitive launch JSON schema
+    """
+    return {
+        "company": f"Company {number}",
+        "launch_year": rng.randint(2005, 2024),
+        "funding_at_launch": rng.choice(_fundings),
+        "approach": _sentence(rng, 8),
+        "key_strategies": [_sentence(rng, 10) for _ in range(3)],
+        "results": _sentence(rng, 10),
+        "notable_tactics": _sentence(rng, 14),
+        "retrospective_insight": _sentence(rng, 16)
+    }
+
+def write_dataset(path, size, seed=0):
+    """
+    Write a synthetic dataset of ``size`` examples, streamed so large sizes fit in memory
+
+    Args:
+        path (str): Output JSON path
+        size (int): Number of examples
+        seed (int, optional): Random seed
+    """
+    rng = random.Random(seed)
+    names = {industry: [] for industry in INDUSTRIES}
+
+    with open(path, "w") as f:
+        f.write('{"industries": {')
+        for position, industry in enumerate(INDUSTRIES):
+            count = size // len(INDUSTRIES) + (1 if position < size % len(INDUSTRIES) else 0)
+            f.write(("" if position == 0 else ", ") + json.dumps(industry) + ': {"examples": [')
+            for offset in range(count):
+                example = generate_example(rng, len(names[industry]) * len(INDUSTRIES) + position)
+                names[industry].append(example["company"])
+                f.write(("" if offset == 0 else ", ") + json.dumps(example))
+            f.write("]}")
+
+        # Curated lists reference a sample of companies, as in the real dataset
+        samples = [name for industry_names in names.values() for name in industry_names[:20]]
+        launch_types = {launch_type: rng.sample(samples, min(10, len(samples))) for launch_type in LAUNCH_TYPES}
+        funding_levels = {level: rng.sample(samples, min(10, len(samples))) for level in FUNDING_LEVELS}
+        f.write('}, "launch_types": ' + json.dumps(launch_types))
+        f.write(', "funding_levels": ' + json.dumps(funding_levels) + "}")
+
+def _reset_caches():
+    """Drop process-wide caches so each size starts cold"""
+    competitive_index._index_cache.clear()
+    competitive_store._prepared_stores.clear()
+    competitive_store._synced_signatures.clear()
+    launch_search._search_cache.clear()
+    competitive_analysis._bundle_cache['index'] = None
+    competitive_analysis._bundle_cache['cells'] = {}
+    competitive_analysis._bundle_cache['profiles'] = {}
+    gc.collect()
+
+def _benchmark_cases():
+    """Functions to benchmark, as (name, callable) pairs"""
+    companies = []
+
+    def similar_companies():
+        companies[:] = competitive_analysis.get_similar_companies(
+            LAUNCH_TYPES[0], FUNDING_LEVELS[1], "SaaS", profile="grow a developer community", seed=0
+        )
+
+    def similar_companies_no_filters():
+        competitive_analysis.get_similar_companies(seed=0)
+
+    return [
+        ("get_industries", competitive_analysis.get_industries),
+        ("get_similar_companies", similar_companies),
+        ("get_similar_companies_no_filters", similar_companies_no_filters),
+        ("generate_takeaways", lambda: competitive_analysis.generate_takeaways(
+            companies, LAUNCH_TYPES[0], FUNDING_LEVELS[1]
+        )),
+        ("search_launches", lambda: competitive_analysis.search_launches("referral program"))
+    ]
+
+def measure(function, repeats):
+    """
+    Measure latency and peak memory of a function
+
+    Args:
+        function (callable): Function to call without arguments
+        repeats (int): Number of timed calls
+
+    Returns:
+        dict: Median and p95 latency in milliseconds and peak memory in KiB
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # Traced separately, since tracemalloc slows down the calls it traces
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'median_ms': round(statistics.median(timings), 4),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        'peak_kib': round(peak / 1024, 1)
+    }
+
+def run_size(size, repeats=REPEATS):
+    """
+    Benchmark every function against a synthetic dataset of one size
+
+    Args:
+        size (int): Number of examples
+        repeats (int, optional): Timed calls per function
+
+    Returns:
+        dict: Results per function name, including the cold index build
+    """
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # The app reads relative data/ paths, so the dataset is laid out the same way
+        os.chdir(workdir)
+        try:
+            os.makedirs(os.path.dirname(COMPETITIVE_DATA_PATH))
+            write_dataset(COMPETITIVE_DATA_PATH, size)
+            _reset_caches()
+
+            start = time.perf_counter()
+            competitive_analysis.load_competitive_index()
+            results['build_index'] = {'median_ms': round((time.perf_counter() - start) * 1000, 4)}
+
+            repeats = max(MIN_REPEATS, min(repeats, repeats * 10_000 // size))
+            for name, function in _benchmark_cases():
+                function()
+                results[name] = measure(function, repeats)
+        finally:
+            _reset_caches()
+            os.chdir(cwd)
+    return results
+
+def compare(results, baselines):
+    """
+    Print results next to stored baselines
+
+    Args:
+        results (dict): Results per size, from run_size
+        baselines (dict): Stored baselines in the same shape
+    """
+    for size, size_results in results.items():
+        print(f"\n{int(size):,} examples")
+        for name, result in size_results.items():
+            baseline = baselines.get(size, {}).get(name, {})
+            line = f"  {name:34} {result['median_ms']:10.3f} ms"
+            if 'peak_kib' in result:
+                line += f"  p95 {result['p95_ms']:10.3f} ms  peak {result['peak_kib']:10.1f} KiB"
+            if baseline.get('median_ms'):
+                line += f"  ({result['median_ms'] / baseline['median_ms']:.2f}x baseline)"
+            print(line)
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark competitive analysis on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Numbers of examples to generate")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="Timed calls per function")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baselines = json.load(f)
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = run_size(size, args.repeats)
+    compare(results, baselines)
+
+    if args.save:
+        baselines.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.baseline}")
+
+if __name__ == "__main__":
+    main()
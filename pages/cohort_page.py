@@ -0,0 +1,68 @@
+import html
+import streamlit as st
+from utils.calendar_integration import MILESTONE_TYPE_TITLES, build_timeline_html
+from utils.cohort_calendar import cohort_calendar_page, get_shared_cohort, page_cursor
+
+def display_cohort_calendar(cohort_id, share_token):
+    """
+    Display the combined milestone calendar of every founder in a cohort
+
+    Args:
+        cohort_id (str): Cohort ID from the ``cohort`` query parameter
+        share_token (str): Share token from the ``token`` query parameter
+    """
+    cohort = get_shared_cohort(cohort_id, share_token)
+    if not cohort:
+        # The same message either way, so the link doesn't reveal which cohort IDs exist
+        st.error("This cohort calendar doesn't exist or the link is incomplete.")
+        return
+
+    members = cohort.get("members", {})
+    st.markdown('<div class="result-card">', unsafe_allow_html=True)
+    st.markdown('<div class="result-header">', unsafe_allow_html=True)
+    st.markdown(f'<h2>{html.escape(cohort.get("name", "Cohort"))} Launch Calendar</h2>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.caption(f"{len(members)} companies")
+
+    types = st.multiselect(
+        "Milestone types",
+        list(MILESTONE_TYPE_TITLES),
+        default=list(MILESTONE_TYPE_TITLES),
+        format_func=MILESTONE_TYPE_TITLES.get
+    )
+
+    # Cursors of the pages before the current one; a new filter starts over
+    view = (cohort_id, tuple(types))
+    if st.session_state.get("cohort_view") != view:
+        st.session_state.cohort_view = view
+        st.session_state.cohort_cursors = [None]
+    cursors = st.session_state.cohort_cursors
+
+    milestones, has_more = cohort_calendar_page(list(members), types, cursors[-1])
+
+    if not milestones:
+        st.info("No milestones scheduled yet.")
+    else:
+        # Show which company each milestone belongs to
+        labelled = [
+            dict(milestone, name=f"{members.get(milestone['email'], milestone['email'])}: {milestone['name']}")
+            for milestone in milestones
+        ]
+        st.markdown(build_timeline_html(labelled), unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+
+    with col1:
+        if len(cursors) > 1 and st.button("← Earlier", use_container_width=True):
+            cursors.pop()
+            st.experimental_rerun()
+
+    with col2:
+        st.markdown(f"<p style='text-align:center'>Page {len(cursors)}</p>", unsafe_allow_html=True)
+
+    with col3:
+        if has_more and st.button("Later →", use_container_width=True):
+            cursors.append(page_cursor(milestones[-1]))
+            st.experimental_rerun()
+
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -1,9 +1,50 @@
 import streamlit as st
-from utils.email_sender import send_email_to_user as send_email
-from utils.competitive_analysis import display_competitive_analysis
+from utils.email_outbox import delivery_status, plan_idempotency_key, queue_email
+from utils.email_sender import create_plan_message
+from utils.competitive_analysis import display_competitive_analysis, build_founder_profile
 from utils.ui_components import pricing_section, display_user_responses_summary
 from utils.state_management import reset_form
 
+def display_email_button(email, plan):
+    """
+    Display the Email My Plan button and the delivery status of the email
+    
+    The email goes through the durable outbox and is sent by a background
+    worker, so the button returns immediately. The status is read back from
+    the outbox by the plan's idempotency key, so reruns and double clicks
+    never send the same plan twice.
+    
+    Args:
+        email (str): User's email
+        plan (dict): The generated launch plan
+    """
+    idempotency_key = plan_idempotency_key(email, plan) if email else None
+    status = delivery_status(idempotency_key) if idempotency_key else None
+    
+    if st.session_state.get("email_sent", False) or (status and status["status"] == "sent"):
+        st.session_state.email_sent = True
+        st.success("Plan sent to your email!")
+        return
+    
+    if status and status["status"] in ("queued", "sending"):
+        if status["error"]:
+            st.warning(f"Sending is taking longer than usual; retrying (attempt {status['attempts'] + 1}).")
+        else:
+            st.info("Sending your plan...")
+        if st.button("Check Email Status", use_container_width=True):
+            st.experimental_rerun()
+        return
+    
+    if status and status["status"] == "failed":
+        st.error(f"Failed to send email. Please try again. {status['error']}")
+    
+    if st.button("Email My Plan", use_container_width=True):
+        if email:
+            queue_email(create_plan_message(email, plan), idempotency_key)
+            st.experimental_rerun()
+        else:
+            st.error("No email address provided.")
+
 def display_results():
     """Display the launch plan results page"""
     try:
@@ -100,7 +141,13 @@ def display_results():
             industry = st.session_state.form_data.get("industry")
         
         if industry:
-            display_competitive_analysis(industry)
+            form_data = st.session_state.form_data
+            display_competitive_analysis(
+                launch_type=form_data.get("launch_type"),
+                funding_status=form_data.get("funding_status"),
+                selected_industry=industry,
+                profile=build_founder_profile(form_data)
+            )
         
         # Show user responses
         if "form_data" in st.session_state:
@@ -116,21 +163,7 @@ def display_results():
         col1, col2 = st.columns([1, 1])
         
         with col1:
-            if not st.session_state.get("email_sent", False):
-                if st.button("Email My Plan", use_container_width=True):
-                    if email:
-                        # Send email - using the proper function
-                        success = send_email(email, plan)
-                        if success:
-                            st.session_state.email_sent = True
-                            st.success("Plan sent to your email!")
-                            st.experimental_rerun()
-                        else:
-                            st.error("Failed to send email. Please try again.")
-                    else:
-                        st.error("No email address provided.")
-            else:
-                st.success("Plan sent to your email!")
+            display_email_button(email, plan)
         
         with col2:
             if st.button("Schedule in Calendar", use_container_width=True):
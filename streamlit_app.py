@@ -16,10 +16,13 @@ from pages.form_steps import (
 )
 from pages.results_page import display_results
 from pages.calendar_page import display_calendar
+from pages.cohort_page import display_cohort_calendar
 
 # Import utilities
 from utils.state_management import reset_form
 from utils.data_loader import load_strategies
+from utils.email_outbox import start_outbox_workers
+from utils.reminder_scheduler import start_reminder_worker
 
 
 
@@ -63,11 +66,23 @@ if 'email_sent' not in st.session_state:
 if 'show_calendar' not in st.session_state:
     st.session_state.show_calendar = False
 
+# Send queued plan emails and milestone reminders in the background
+start_outbox_workers()
+start_reminder_worker()
+
 # Main app
 def main():
     # Display header
     display_header()
     
+    # Shared cohort calendars are linked as ?cohort=<id>&token=<share token>
+    query_params = st.experimental_get_query_params()
+    cohort_id = query_params.get("cohort", [None])[0]
+    if cohort_id:
+        display_cohort_calendar(cohort_id, query_params.get("token", [None])[0])
+        display_footer()
+        return
+    
     # Progress bar (only show if not on results page)
     if st.session_state.generated_plan is None and 1 <= st.session_state.step <= 9:
         progress = (st.session_state.step - 1) / 8
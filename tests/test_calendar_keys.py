@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+import streamlit as st
+
+from utils.calendar_integration import get_session_milestones, load_user_calendar, new_milestone, save_milestone_change
+from utils.milestone_db import (
+    MILESTONES_DB_PATH, flush_writes, issue_calendar_key, load_user_milestones, queue_write, verify_calendar_key
+)
+
+FOUNDER = "founder@example.com"
+
+class SessionState(dict):
+    """Attribute-style stand-in for st.session_state outside a Streamlit run"""
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+    __delattr__ = dict.__delitem__
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """Start a fresh session against a fresh milestone database"""
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(st, "session_state", SessionState())
+    return st.session_state
+
+def _milestone(name, day):
+    return new_milestone(name, datetime.date(2030, 1, day), f"{name} description")
+
+def test_each_email_gets_one_key(session):
+    calendar_key = issue_calendar_key(FOUNDER)
+    assert calendar_key
+    assert issue_calendar_key(FOUNDER) is None
+
+    assert verify_calendar_key(FOUNDER, calendar_key)
+    assert not verify_calendar_key(FOUNDER, "guess")
+    assert not verify_calendar_key(FOUNDER, "")
+    assert not verify_calendar_key("other@example.com", calendar_key)
+
+def test_milestones_saved_without_a_key_cant_be_claimed(session):
+    queue_write("save", FOUNDER, _milestone("Beta", 1), MILESTONES_DB_PATH)
+    flush_writes(MILESTONES_DB_PATH)
+
+    assert issue_calendar_key(FOUNDER) is None
+    assert load_user_calendar(FOUNDER) is False
+    assert get_session_milestones() == []
+
+def test_saved_calendar_opens_only_with_its_key(session):
+    assert load_user_calendar(FOUNDER) is True
+    calendar_key = session.new_calendar_key
+    beta = _milestone("Beta", 1)
+    save_milestone_change("save", beta)
+    flush_writes(MILESTONES_DB_PATH)
+
+    # Someone else types in the founder's email
+    session.clear()
+    assert load_user_calendar(FOUNDER) is False
+    assert load_user_calendar(FOUNDER, "guess") is False
+    assert get_session_milestones() == []
+    assert "milestone_store_email" not in session
+
+    # Without the key, edits stay in the session and the saved calendar is untouched
+    save_milestone_change("delete", beta["id"])
+    flush_writes(MILESTONES_DB_PATH)
+    assert [milestone["name"] for milestone in load_user_milestones(FOUNDER)] == ["Beta"]
+
+    assert load_user_calendar(FOUNDER, calendar_key) is True
+    assert [milestone["name"] for milestone in get_session_milestones()] == ["Beta"]
+    assert "new_calendar_key" not in session
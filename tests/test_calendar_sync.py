@@ -0,0 +1,148 @@
+import datetime
+import itertools
+
+import pytest
+
+from utils.calendar_sync import sync_milestones
+from utils.milestone_db import flush_writes, queue_write
+
+FOUNDER = "founder@example.com"
+OTHER_FOUNDER = "other@example.com"
+
+def fake_calendar_transport():
+    """
+    In-memory stand-in for the remote calendars
+
+    Returns:
+        dict: Transport with ``create_calendar`` and ``batch``, plus the server's
+        ``calendars`` (calendar ID -> owner and events, remote ID -> event and
+        ETag) and a ``requests`` log of (method, remote ID) pairs
+    """
+    server = {"calendars": {}, "requests": []}
+    calendar_ids = itertools.count(1)
+    remote_ids = itertools.count(1)
+    versions = itertools.count(1)
+
+    def create_calendar(email, name):
+        calendar_id = f"calendar{next(calendar_ids)}"
+        server["calendars"][calendar_id] = {"owner": email, "name": name, "events": {}}
+        return calendar_id
+
+    def batch(calendar_id, operations):
+        events = server["calendars"][calendar_id]["events"]
+        results = []
+        for operation in operations:
+            server["requests"].append((operation["method"], operation["remote_id"]))
+            stored = events.get(operation["remote_id"])
+            if operation["method"] != "insert" and stored is None:
+                results.append({"status": 404})
+            elif operation["method"] != "insert" and operation["etag"] and operation["etag"] != stored["etag"]:
+                results.append({"status": 412})
+            elif operation["method"] == "delete":
+                del events[operation["remote_id"]]
+                results.append({"status": 204})
+            else:
+                remote_id = operation["remote_id"] or f"event{next(remote_ids)}"
+                etag = f'"{next(versions)}"'
+                events[remote_id] = {"event": operation["event"], "etag": etag}
+                results.append({"status": 200, "remote_id": remote_id, "etag": etag})
+        return results
+
+    return {"create_calendar": create_calendar, "batch": batch, **server}
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Run against a fresh milestone database with no legacy JSON to import"""
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / "milestones.db")
+
+def _save(db_path, email, milestone_id, name, day):
+    queue_write("save", email, {
+        "id": milestone_id,
+        "name": name,
+        "date": datetime.date(2030, 1, day),
+        "description": f"{name} description",
+        "type": "launch"
+    }, db_path)
+    flush_writes(db_path)
+
+def _user_events(transport, email):
+    (calendar,) = [calendar for calendar in transport["calendars"].values() if calendar["owner"] == email]
+    return calendar["events"]
+
+def _summary(**counts):
+    return dict({"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0, "failed": 0, "batches": 1}, **counts)
+
+def test_first_sync_inserts_into_the_users_own_calendar(db_path):
+    transport = fake_calendar_transport()
+    _save(db_path, FOUNDER, "m1", "Beta", 1)
+    _save(db_path, FOUNDER, "m2", "Launch Day", 2)
+    _save(db_path, OTHER_FOUNDER, "m3", "Other launch", 3)
+
+    assert sync_milestones(FOUNDER, transport, db_path) == _summary(inserted=2)
+    assert sync_milestones(OTHER_FOUNDER, transport, db_path) == _summary(inserted=1)
+
+    assert sorted(event["event"]["summary"] for event in _user_events(transport, FOUNDER).values()) == ["Beta", "Launch Day"]
+    assert [event["event"]["summary"] for event in _user_events(transport, OTHER_FOUNDER).values()] == ["Other launch"]
+
+def test_unchanged_milestones_send_no_requests(db_path):
+    transport = fake_calendar_transport()
+    _save(db_path, FOUNDER, "m1", "Beta", 1)
+    sync_milestones(FOUNDER, transport, db_path)
+    transport["requests"].clear()
+
+    assert sync_milestones(FOUNDER, transport, db_path) == _summary(unchanged=1, batches=0)
+    assert transport["requests"] == []
+    assert len(transport["calendars"]) == 1
+
+def test_only_changed_milestones_are_sent(db_path):
+    transport = fake_calendar_transport()
+    _save(db_path, FOUNDER, "m1", "Beta", 1)
+    _save(db_path, FOUNDER, "m2", "Launch Day", 2)
+    sync_milestones(FOUNDER, transport, db_path)
+    remote_id = next(remote_id for remote_id, event in _user_events(transport, FOUNDER).items()
+                     if event["event"]["summary"] == "Launch Day")
+    transport["requests"].clear()
+
+    _save(db_path, FOUNDER, "m2", "Launch Day", 9)
+    queue_write("delete", FOUNDER, "m1", db_path)
+    flush_writes(db_path)
+
+    assert sync_milestones(FOUNDER, transport, db_path) == _summary(updated=1, deleted=1)
+    assert sorted(transport["requests"], key=str) == sorted([("update", remote_id), ("delete", "event1")], key=str)
+    assert _user_events(transport, FOUNDER)[remote_id]["event"]["start"] == {"date": "2030-01-09"}
+
+def test_remote_edit_conflict_is_overwritten(db_path):
+    transport = fake_calendar_transport()
+    _save(db_path, FOUNDER, "m1", "Beta", 1)
+    sync_milestones(FOUNDER, transport, db_path)
+    (remote_id, event), = _user_events(transport, FOUNDER).items()
+    # Edited in the calendar since the last sync, so the stored ETag is stale
+    event["etag"] = '"remote"'
+    transport["requests"].clear()
+
+    _save(db_path, FOUNDER, "m1", "Beta", 5)
+
+    assert sync_milestones(FOUNDER, transport, db_path) == _summary(updated=1, batches=2)
+    assert transport["requests"] == [("update", remote_id), ("update", remote_id)]
+    assert _user_events(transport, FOUNDER)[remote_id]["event"]["start"] == {"date": "2030-01-05"}
+
+def test_remotely_deleted_event_is_recreated(db_path):
+    transport = fake_calendar_transport()
+    _save(db_path, FOUNDER, "m1", "Beta", 1)
+    sync_milestones(FOUNDER, transport, db_path)
+    (remote_id,) = _user_events(transport, FOUNDER)
+    del _user_events(transport, FOUNDER)[remote_id]
+    transport["requests"].clear()
+
+    _save(db_path, FOUNDER, "m1", "Beta", 5)
+
+    assert sync_milestones(FOUNDER, transport, db_path) == _summary(inserted=1, batches=2)
+    assert transport["requests"] == [("update", remote_id), ("insert", None)]
+    (event,) = _user_events(transport, FOUNDER).values()
+    assert event["event"]["start"] == {"date": "2030-01-05"}
+
+    # The new event is tracked, so the next sync is a no-op
+    transport["requests"].clear()
+    assert sync_milestones(FOUNDER, transport, db_path)["unchanged"] == 1
+    assert transport["requests"] == []
@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from utils.cohort_calendar import get_shared_cohort
+
+COHORTS = {
+    "spring-2026": {"name": "Spring 2026", "share_token": "s3cret-token", "members": {"founder@acme.com": "Acme"}},
+    "fall-2026": {"name": "Fall 2026", "members": {"founder@beta.com": "Beta"}}
+}
+
+@pytest.fixture
+def cohorts(tmp_path, monkeypatch):
+    """Run against a cohorts file in a fresh data directory"""
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "cohorts.json").write_text(json.dumps(COHORTS))
+    monkeypatch.chdir(tmp_path)
+
+def test_cohort_opens_only_with_its_share_token(cohorts):
+    assert get_shared_cohort("spring-2026", "s3cret-token")["name"] == "Spring 2026"
+
+    assert get_shared_cohort("spring-2026", None) is None
+    assert get_shared_cohort("spring-2026", "") is None
+    assert get_shared_cohort("spring-2026", "s3cret") is None
+    assert get_shared_cohort("unknown", "s3cret-token") is None
+
+def test_cohort_without_a_share_token_cant_be_opened(cohorts):
+    assert get_shared_cohort("fall-2026", None) is None
+    assert get_shared_cohort("fall-2026", "") is None
@@ -0,0 +1,99 @@
+import copy
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+import streamlit as st
+
+from utils.competitive_analysis import (
+    BUNDLE_SEED, get_competitive_bundle, get_similar_companies, load_competitive_index
+)
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data" / "competitive_launches.json"
+
+THREADS = 16
+CALLS_PER_THREAD = 20
+
+# (launch_type, funding_status, industry): a faceted query and one that
+# matches nothing, so it takes the random fallback sample
+QUERIES = [
+    ("New Startup/Product Launch", "Raised under $1M", None),
+    ("Unknown launch", "Unknown funding", None)
+]
+
+class SessionState(dict):
+    """Attribute-style stand-in for st.session_state outside a Streamlit run"""
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+    __delattr__ = dict.__delitem__
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Run against a private copy of the competitive data, with a fresh index"""
+    (tmp_path / "data").mkdir()
+    shutil.copy(DATA_FILE, tmp_path / "data" / DATA_FILE.name)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(st, "session_state", SessionState())
+    return load_competitive_index()
+
+def _company_names(examples):
+    return [example["company"] for example in examples]
+
+def test_get_similar_companies_is_thread_safe(store):
+    industry_row_ids = copy.deepcopy(store['industry_row_ids'])
+    facets = copy.deepcopy(store['facets'])
+
+    seeds = [None, 1, 2, 3]
+    expected = {
+        (query, seed): _company_names(get_similar_companies(*query, seed=seed))
+        for query in QUERIES
+        for seed in seeds
+    }
+
+    errors = []
+    mismatches = []
+    start = threading.Barrier(THREADS)
+
+    def worker(number):
+        try:
+            start.wait()
+            for call in range(CALLS_PER_THREAD):
+                query = QUERIES[(number + call) % len(QUERIES)]
+                seed = seeds[(number * 7 + call) % len(seeds)]
+                result = _company_names(get_similar_companies(*query, seed=seed))
+                if result != expected[(query, seed)]:
+                    mismatches.append((query, seed, result))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert mismatches == []
+
+    # The shared index must come out untouched
+    index = load_competitive_index()
+    assert index is store
+    assert index['industry_row_ids'] == industry_row_ids
+    assert index['facets'] == facets
+
+def test_fallback_sample_depends_only_on_seed(store):
+    query = QUERIES[1]
+    first = _company_names(get_similar_companies(*query, seed=42))
+    assert first
+    assert all(_company_names(get_similar_companies(*query, seed=42)) == first for _ in range(5))
+
+def test_profile_bundle_reranks_the_cell_shortlist(store):
+    # The sample dataset fits in one shortlist, so re-ranking it must agree
+    # with ranking the whole dataset
+    for query in (QUERIES[0], (None, None, None)):
+        for profile in (None, "grow a developer community", "waitlist referral program"):
+            bundle = get_competitive_bundle(*query, profile=profile)
+            expected = get_similar_companies(*query, profile=profile, seed=BUNDLE_SEED)
+            assert _company_names(bundle['companies']) == _company_names(expected)
+            assert get_competitive_bundle(*query, profile=profile) is bundle
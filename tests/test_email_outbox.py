@@ -0,0 +1,138 @@
+import datetime
+import smtplib
+from contextlib import closing
+from email.mime.text import MIMEText
+
+import pytest
+
+from utils import email_outbox
+from utils.email_outbox import (
+    MAX_SEND_ATTEMPTS, RETRY_BASE_SECONDS, RETRY_MAX_SECONDS, connect_outbox_db, delivery_status,
+    plan_idempotency_key, queue_email, retry_delay, send_due_emails
+)
+
+RECIPIENT = "founder@example.com"
+
+def fake_smtp_transport(failures=()):
+    """
+    Stand-in for send_pooled that records what it sends
+
+    Args:
+        failures (iterable, optional): Exceptions to raise, in order, before sending succeeds
+
+    Returns:
+        callable: Send function with a ``sent`` list of message subjects
+    """
+    failures = list(failures)
+
+    def send(msg):
+        if failures:
+            raise failures.pop(0)
+        send.sent.append(msg["Subject"])
+
+    send.sent = []
+    return send
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Use a fresh outbox database and keep the background workers from sending"""
+    monkeypatch.setattr(email_outbox, "start_outbox_workers", lambda db_path=None: None)
+    return str(tmp_path / "outbox.db")
+
+def _message(subject="Your plan"):
+    msg = MIMEText("Hello")
+    msg["Subject"] = subject
+    msg["To"] = RECIPIENT
+    return msg
+
+def _make_due(db_path):
+    """Move every unsent email's next attempt into the past, as if the wait elapsed"""
+    with closing(connect_outbox_db(db_path)) as conn, conn:
+        conn.execute("UPDATE outbox SET next_attempt_at = '2000-01-01 00:00:00' WHERE status != 'sent'")
+
+def _next_attempt(db_path, key):
+    with closing(connect_outbox_db(db_path)) as conn:
+        value = conn.execute("SELECT next_attempt_at FROM outbox WHERE idempotency_key = ?", (key,)).fetchone()[0]
+    return datetime.datetime.fromisoformat(value)
+
+def test_same_key_is_queued_and_sent_once(db_path):
+    key = plan_idempotency_key(RECIPIENT, {"startup_name": "Acme"})
+    assert key == plan_idempotency_key(" Founder@Example.com ", {"startup_name": "Acme"})
+    assert key != plan_idempotency_key(RECIPIENT, {"startup_name": "Other"})
+
+    assert queue_email(_message(), key, db_path) is True
+    assert queue_email(_message(), key, db_path) is False
+
+    send = fake_smtp_transport()
+    assert send_due_emails(db_path, send) == {"sent": 1, "failed": 0}
+    assert send.sent == ["Your plan"]
+
+    # Queuing again after delivery doesn't send a second copy
+    assert queue_email(_message(), key, db_path) is False
+    assert send_due_emails(db_path, send) == {"sent": 0, "failed": 0}
+    assert delivery_status(key, db_path) == {"status": "sent", "attempts": 1, "error": None}
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert [retry_delay(attempts) for attempts in (1, 2, 3)] == [
+        RETRY_BASE_SECONDS, RETRY_BASE_SECONDS * 2, RETRY_BASE_SECONDS * 4
+    ]
+    assert retry_delay(50) == RETRY_MAX_SECONDS
+
+def test_failed_send_is_retried_after_backoff(db_path):
+    queue_email(_message(), "key", db_path)
+    send = fake_smtp_transport([smtplib.SMTPDataError(451, b"try later")] * 2)
+
+    before = datetime.datetime.now().replace(microsecond=0)
+    assert send_due_emails(db_path, send) == {"sent": 0, "failed": 1}
+    status = delivery_status("key", db_path)
+    assert status["status"] == "queued" and status["attempts"] == 1 and "try later" in status["error"]
+    delay = (_next_attempt(db_path, "key") - before).total_seconds()
+    assert retry_delay(1) <= delay <= retry_delay(1) + 2
+
+    # Not due yet, so nothing is sent
+    assert send_due_emails(db_path, send) == {"sent": 0, "failed": 0}
+
+    _make_due(db_path)
+    before = datetime.datetime.now().replace(microsecond=0)
+    assert send_due_emails(db_path, send) == {"sent": 0, "failed": 1}
+    delay = (_next_attempt(db_path, "key") - before).total_seconds()
+    assert retry_delay(2) <= delay <= retry_delay(2) + 2
+
+    _make_due(db_path)
+    assert send_due_emails(db_path, send) == {"sent": 1, "failed": 0}
+    assert delivery_status("key", db_path)["status"] == "sent"
+
+def test_email_moves_to_dead_letters_after_max_attempts(db_path):
+    queue_email(_message(), "key", db_path)
+    send = fake_smtp_transport([smtplib.SMTPDataError(554, b"rejected")] * MAX_SEND_ATTEMPTS)
+
+    for _ in range(MAX_SEND_ATTEMPTS):
+        _make_due(db_path)
+        assert send_due_emails(db_path, send) == {"sent": 0, "failed": 1}
+
+    assert delivery_status("key", db_path)["status"] == "failed"
+    with closing(connect_outbox_db(db_path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0] == 0
+        assert conn.execute("SELECT attempts FROM dead_letters").fetchall() == [(MAX_SEND_ATTEMPTS,)]
+
+    # Queuing it again takes it out of the dead letters and sends it
+    assert queue_email(_message(), "key", db_path) is True
+    assert send_due_emails(db_path, send) == {"sent": 1, "failed": 0}
+    with closing(connect_outbox_db(db_path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM dead_letters").fetchone()[0] == 0
+
+def test_email_claimed_by_a_crashed_worker_is_sent_after_its_lease(db_path):
+    queue_email(_message(), "key", db_path)
+    with closing(connect_outbox_db(db_path)) as conn:
+        # A worker claims the email and dies before sending it
+        assert email_outbox._claim_email(conn, datetime.datetime.now()) is not None
+    assert delivery_status("key", db_path)["status"] == "sending"
+
+    send = fake_smtp_transport()
+    # The lease still stands, so no other worker picks it up
+    assert send_due_emails(db_path, send) == {"sent": 0, "failed": 0}
+
+    _make_due(db_path)
+    assert send_due_emails(db_path, send) == {"sent": 1, "failed": 0}
+    assert send.sent == ["Your plan"]
+    assert delivery_status("key", db_path) == {"status": "sent", "attempts": 2, "error": None}
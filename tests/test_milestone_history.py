@@ -0,0 +1,123 @@
+import datetime
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from utils import milestone_db
+from utils.milestone_db import connect_milestone_db, flush_writes, load_user_milestones, queue_write
+from utils.milestone_history import MAX_HISTORY, apply_changes, create_history, record_edit, redo_edit, undo_edit
+from utils.milestone_store import create_milestone_store, insert_milestone, iter_milestones
+
+EMAIL = "founder@example.com"
+
+def _milestone(milestone_id, day, name=None):
+    return {
+        "id": milestone_id,
+        "name": name or f"Milestone {milestone_id}",
+        "date": datetime.date(2030, 1, day),
+        "description": "description",
+        "type": "launch",
+        "created_at": datetime.datetime(2029, 12, 1, 9, 0, day)
+    }
+
+def _ids(store):
+    return [milestone["id"] for milestone in iter_milestones(store)]
+
+def _store(*milestones):
+    store = create_milestone_store()
+    for milestone in milestones:
+        insert_milestone(store, milestone)
+    return store
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Run against a fresh milestone database with no legacy JSON to import"""
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / "milestones.db")
+
+def _persist(db_path, applied):
+    """Save applied changes the way the calendar page does"""
+    for action, milestone, _ in applied:
+        if action == "insert":
+            queue_write("save", EMAIL, milestone, db_path)
+        else:
+            queue_write("delete", EMAIL, milestone["id"], db_path)
+    flush_writes(db_path)
+
+def test_store_keeps_date_order_and_skips_duplicates():
+    store = _store(_milestone("b", 5), _milestone("a", 2), _milestone("c", 5))
+    assert _ids(store) == ["a", "b", "c"]
+
+    duplicate = dict(_milestone("b", 5), id="other")
+    assert insert_milestone(store, duplicate) == (False, "b")
+    assert _ids(store) == ["a", "b", "c"]
+
+def test_undo_and_redo_restore_the_exact_order():
+    store = _store(_milestone("a", 1), _milestone("b", 3), _milestone("c", 3), _milestone("d", 3))
+    history = create_history()
+
+    applied = apply_changes(store, [("remove", _milestone("b", 3), None), ("remove", _milestone("c", 3), None),
+                                    ("insert", _milestone("e", 2), None)])
+    record_edit(history, "Edit", applied)
+    assert _ids(store) == ["a", "e", "d"]
+    assert history['undo'][-1]['version'] == 1
+
+    undo_edit(history, store)
+    # Milestones on the same date come back in their original positions
+    assert _ids(store) == ["a", "b", "c", "d"]
+
+    redo_edit(history, store)
+    assert _ids(store) == ["a", "e", "d"]
+
+    empty = create_history()
+    assert undo_edit(empty, store) == [] and redo_edit(empty, store) == []
+
+def test_new_edit_clears_redo_and_history_is_bounded():
+    store = create_milestone_store()
+    history = create_history()
+    for day in range(1, MAX_HISTORY + 6):
+        record_edit(history, f"Add {day}", apply_changes(store, [("insert", _milestone(str(day), day % 28 + 1), None)]))
+    assert len(history['undo']) == MAX_HISTORY
+    assert history['undo'][0]['version'] == 6
+
+    undo_edit(history, store)
+    assert len(history['redo']) == 1
+    record_edit(history, "Another", apply_changes(store, [("insert", _milestone("new", 1, "New"), None)]))
+    assert history['redo'] == []
+
+    # Edits that change nothing aren't recorded
+    version = history['version']
+    record_edit(history, "Nothing", apply_changes(store, [("insert", _milestone("new", 1, "New"), None)]))
+    assert history['version'] == version
+
+def test_undone_edits_persist_across_a_reopen(db_path):
+    store = create_milestone_store()
+    history = create_history()
+
+    applied = apply_changes(store, [("insert", _milestone("a", 1), None), ("insert", _milestone("b", 2), None)])
+    record_edit(history, "Add", applied)
+    _persist(db_path, applied)
+    applied = apply_changes(store, [("remove", _milestone("a", 1), None)])
+    record_edit(history, "Delete", applied)
+    _persist(db_path, applied)
+    _persist(db_path, undo_edit(history, store))
+
+    # A new process reopens the database, still in WAL mode, and sees the session's calendar
+    milestone_db._prepared_dbs.clear()
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    reopened = _store(*load_user_milestones(EMAIL, db_path))
+    assert _ids(reopened) == _ids(store) == ["a", "b"]
+
+def test_reminder_lookups_use_the_due_time_index(db_path):
+    with closing(connect_milestone_db(db_path)) as conn:
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(reminders)")}
+        assert "idx_reminders_due_at" in indexes
+
+        for query in (
+            "SELECT MIN(due_at) FROM reminders",
+            "SELECT email FROM reminders WHERE due_at <= '2030-01-01' ORDER BY due_at LIMIT 10"
+        ):
+            plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+            assert "idx_reminders_due_at" in plan
@@ -0,0 +1,102 @@
+import datetime
+import random
+
+import pytest
+
+from utils.business_days import business_calendar
+from utils.milestone_scheduler import build_schedule, critical_path, reschedule, topological_order
+
+# A Monday, so working-day arithmetic is easy to follow
+START = datetime.date(2030, 1, 7)
+
+WEEKDAYS = business_calendar("1111100", None)
+
+def _task(duration, *depends_on):
+    return {"duration_days": duration, "depends_on": list(depends_on)}
+
+def _plan():
+    """Two chains into a launch, with work after it"""
+    return {
+        "research": _task(5),
+        "content": _task(10, "research"),
+        "beta": _task(3),
+        "launch": _task(2, "content", "beta"),
+        "analysis": _task(5, "launch"),
+        "growth": _task(20, "launch")
+    }
+
+def test_topological_order_puts_dependencies_first():
+    order, successors = topological_order(_plan())
+    position = {task_id: index for index, task_id in enumerate(order)}
+    for task_id, task in _plan().items():
+        assert all(position[dependency] < position[task_id] for dependency in task["depends_on"])
+    assert sorted(successors["launch"]) == ["analysis", "growth"]
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        topological_order({"a": _task(1, "c"), "b": _task(1, "a"), "c": _task(1, "b")})
+    with pytest.raises(ValueError, match="unknown"):
+        topological_order({"a": _task(1, "missing")})
+
+def test_tasks_finish_after_their_last_dependency():
+    schedule = build_schedule(_plan(), START, calendar=WEEKDAYS)
+
+    assert schedule['finish']["research"] == datetime.date(2030, 1, 14)
+    assert schedule['finish']["content"] == datetime.date(2030, 1, 28)
+    # Content finishes after beta, so it drives the launch
+    assert schedule['start']["launch"] == datetime.date(2030, 1, 28)
+    assert schedule['finish']["launch"] == datetime.date(2030, 1, 30)
+    assert schedule['driver']["launch"] == "content"
+    assert schedule['finish']["growth"] == datetime.date(2030, 2, 27)
+
+def test_critical_path_follows_the_drivers_of_the_last_task():
+    schedule = build_schedule(_plan(), START, calendar=WEEKDAYS)
+    assert critical_path(schedule) == ["research", "content", "launch", "growth"]
+
+def test_pins_move_a_task_and_everything_after_it():
+    schedule = build_schedule(_plan(), START, pins={"launch": datetime.date(2030, 2, 16)}, calendar=WEEKDAYS)
+
+    # A Saturday pin rolls forward to Monday
+    assert schedule['finish']["launch"] == datetime.date(2030, 2, 18)
+    assert schedule['finish']["analysis"] == datetime.date(2030, 2, 25)
+    assert schedule['finish']["content"] == datetime.date(2030, 1, 28)
+    assert schedule['conflicts'] == {}
+
+def test_pins_before_the_dependencies_finish_are_clamped_and_reported():
+    too_early = datetime.date(2030, 1, 9)
+    schedule = build_schedule(_plan(), START, pins={"launch": too_early}, calendar=WEEKDAYS)
+
+    assert schedule['finish']["launch"] == datetime.date(2030, 1, 30)
+    assert schedule['start']["launch"] >= schedule['finish']["content"]
+    assert schedule['conflicts'] == {"launch": too_early}
+
+    # A pin before the start date is clamped as well
+    schedule = build_schedule(_plan(), START, pins={"research": START - datetime.timedelta(days=30)}, calendar=WEEKDAYS)
+    assert schedule['start']["research"] == START
+    assert "research" in schedule['conflicts']
+
+def _dates(schedule):
+    return schedule['start'], schedule['finish'], schedule['conflicts']
+
+def test_reschedule_matches_a_full_rebuild():
+    rng = random.Random(0)
+    schedule = build_schedule(_plan(), START, calendar=WEEKDAYS)
+    pins = {}
+    for _ in range(30):
+        task_id = rng.choice(list(_plan()))
+        date = START + datetime.timedelta(days=rng.randrange(-10, 90))
+        if rng.random() < 0.2:
+            date = None
+            pins.pop(task_id, None)
+        else:
+            pins[task_id] = date
+        reschedule(schedule, task_id, date)
+
+        expected = build_schedule(_plan(), START, pins=pins, calendar=WEEKDAYS)
+        assert _dates(schedule) == _dates(expected)
+        assert critical_path(schedule) == critical_path(expected)
+
+def test_reschedule_only_touches_downstream_tasks():
+    schedule = build_schedule(_plan(), START, calendar=WEEKDAYS)
+    changed = reschedule(schedule, "launch", datetime.date(2030, 3, 4))
+    assert changed == ["launch", "analysis", "growth"]
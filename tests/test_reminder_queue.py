@@ -0,0 +1,118 @@
+import datetime
+from contextlib import closing
+
+import pytest
+
+from utils import milestone_db
+from utils.milestone_db import connect_milestone_db, flush_writes, queue_write
+from utils.reminder_queue import REMINDER_HOUR, REMINDER_LEASE_SECONDS, claim_due_reminders
+from utils.reminder_scheduler import send_due_reminders
+
+TODAY = datetime.date.today()
+
+# Late enough that every reminder of a milestone saved today is due
+LATER = datetime.datetime.combine(TODAY + datetime.timedelta(days=60), datetime.time(REMINDER_HOUR))
+
+def fake_send():
+    """
+    Stand-in for send_messages that records each message it's given, all sent
+
+    Returns:
+        callable: Send function with a ``sent`` list of (recipient, subject) pairs
+    """
+    def send(messages):
+        send.sent.extend((msg["To"], msg["Subject"]) for msg in messages)
+        return [True] * len(messages)
+
+    send.sent = []
+    return send
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Run against a fresh milestone database with no legacy JSON to import"""
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / "milestones.db")
+
+def _save(db_path, email, milestone_id, days_ahead, name="Launch Day"):
+    queue_write("save", email, {
+        "id": milestone_id,
+        "name": name,
+        "date": TODAY + datetime.timedelta(days=days_ahead),
+        "description": f"{name} description",
+        "type": "launch"
+    }, db_path)
+    flush_writes(db_path)
+
+def _pending(db_path):
+    with closing(connect_milestone_db(db_path)) as conn:
+        return conn.execute("SELECT email, milestone_id, days_before, due_at FROM reminders ORDER BY due_at, email").fetchall()
+
+def _due_at(date, days_before):
+    due_at = datetime.datetime.combine(date - datetime.timedelta(days=days_before), datetime.time(REMINDER_HOUR))
+    return due_at.isoformat(sep=" ", timespec="seconds")
+
+def test_reminders_due_at_the_same_time_are_claimed_in_a_fixed_order(db_path):
+    # Saved out of order, all due at the same times
+    _save(db_path, "b@example.com", "m2", 20)
+    _save(db_path, "a@example.com", "m3", 20)
+    _save(db_path, "b@example.com", "m1", 20)
+
+    with closing(connect_milestone_db(db_path)) as conn:
+        claimed = [
+            (reminder["email"], reminder["milestone_id"], reminder["days_before"])
+            for reminder in claim_due_reminders(conn, 10, LATER)
+        ]
+    assert claimed == [
+        ("a@example.com", "m3", 7), ("b@example.com", "m1", 7), ("b@example.com", "m2", 7),
+        ("a@example.com", "m3", 1), ("b@example.com", "m1", 1), ("b@example.com", "m2", 1)
+    ]
+
+def test_moving_a_milestone_reschedules_its_reminders(db_path):
+    _save(db_path, "a@example.com", "m1", 20)
+    _save(db_path, "a@example.com", "m1", 30)
+
+    date = TODAY + datetime.timedelta(days=30)
+    assert _pending(db_path) == [
+        ("a@example.com", "m1", 7, _due_at(date, 7)),
+        ("a@example.com", "m1", 1, _due_at(date, 1))
+    ]
+
+def test_deleting_a_milestone_cancels_its_reminders(db_path):
+    _save(db_path, "a@example.com", "m1", 20)
+    _save(db_path, "a@example.com", "m2", 20)
+    queue_write("delete", "a@example.com", "m1", db_path)
+    flush_writes(db_path)
+
+    assert {milestone_id for _, milestone_id, _, _ in _pending(db_path)} == {"m2"}
+
+    send = fake_send()
+    assert send_due_reminders(db_path, send, now=LATER) == {"sent": 2, "failed": 0}
+    assert len(send.sent) == 2
+
+def test_reminders_fire_once_across_restarts(db_path):
+    _save(db_path, "a@example.com", "m1", 20)
+    send = fake_send()
+
+    assert send_due_reminders(db_path, send, now=LATER) == {"sent": 2, "failed": 0}
+    assert _pending(db_path) == []
+
+    # A new process opens the database from scratch and finds nothing left to send
+    milestone_db._prepared_dbs.clear()
+    assert send_due_reminders(db_path, send, now=LATER) == {"sent": 0, "failed": 0}
+    assert len(send.sent) == 2
+
+def test_reminders_claimed_before_a_crash_are_sent_once_after_the_lease(db_path):
+    _save(db_path, "a@example.com", "m1", 20)
+    with closing(connect_milestone_db(db_path)) as conn:
+        # A worker claims the reminders and dies before sending them
+        assert len(claim_due_reminders(conn, 10, LATER)) == 2
+
+    milestone_db._prepared_dbs.clear()
+    send = fake_send()
+    # The lease still stands, so a restarted worker leaves them alone
+    assert send_due_reminders(db_path, send, now=LATER) == {"sent": 0, "failed": 0}
+
+    after_lease = LATER + datetime.timedelta(seconds=REMINDER_LEASE_SECONDS)
+    assert send_due_reminders(db_path, send, now=after_lease) == {"sent": 2, "failed": 0}
+    assert send_due_reminders(db_path, send, now=after_lease) == {"sent": 0, "failed": 0}
+    assert len(send.sent) == 2
@@ -0,0 +1,131 @@
+import datetime
+import threading
+
+import numpy as np
+
+# Monday to Friday
+DEFAULT_WEEKMASK = "1111100"
+
+# Every day counts, i.e. plain calendar-day arithmetic
+ALL_DAYS_WEEKMASK = "1111111"
+
+# Years around today that holiday calendars cover
+HOLIDAY_YEARS_BEFORE = 1
+HOLIDAY_YEARS_AFTER = 5
+
+_calendar_cache = {}
+_calendar_lock = threading.Lock()
+
+def _nth_weekday(year, month, weekday, n):
+    """Date of the n-th given weekday of a month, counting from the end when n is negative"""
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-n - 1))
+
+def _observed(holiday):
+    """Move a Saturday holiday to Friday and a Sunday holiday to Monday"""
+    if holiday.weekday() == 5:
+        return holiday - datetime.timedelta(days=1)
+    if holiday.weekday() == 6:
+        return holiday + datetime.timedelta(days=1)
+    return holiday
+
+def us_federal_holidays(years):
+    """
+    Compute US federal holidays, as observed, for the given years
+
+    Args:
+        years (iterable): Calendar years
+
+    Returns:
+        list: Sorted holiday dates
+    """
+    holidays = []
+    for year in years:
+        fixed = [(1, 1), (7, 4), (11, 11), (12, 25)]
+        if year >= 2021:
+            fixed.append((6, 19))
+        holidays.extend(_observed(datetime.date(year, month, day)) for month, day in fixed)
+        holidays.extend([
+            _nth_weekday(year, 1, 0, 3),    # Martin Luther King Jr. Day
+            _nth_weekday(year, 2, 0, 3),    # Presidents' Day
+            _nth_weekday(year, 5, 0, -1),   # Memorial Day
+            _nth_weekday(year, 9, 0, 1),    # Labor Day
+            _nth_weekday(year, 10, 0, 2),   # Columbus Day
+            _nth_weekday(year, 11, 3, 4)    # Thanksgiving
+        ])
+    return sorted(holidays)
+
+def business_calendar(weekmask=DEFAULT_WEEKMASK, holidays="US"):
+    """
+    Get a cached NumPy business-day calendar
+
+    Args:
+        weekmask (str, optional): Seven 0/1 flags from Monday, e.g. "1111100"
+        holidays (str or tuple, optional): "US" for US federal holidays around
+            the current year, a tuple of dates, or None for no holidays
+
+    Returns:
+        numpy.busdaycalendar: Business-day calendar
+    """
+    if holidays == "US":
+        this_year = datetime.date.today().year
+        holidays = tuple(us_federal_holidays(range(this_year - HOLIDAY_YEARS_BEFORE, this_year + HOLIDAY_YEARS_AFTER + 1)))
+
+    key = (weekmask, holidays)
+    with _calendar_lock:
+        calendar = _calendar_cache.get(key)
+        if calendar is None:
+            calendar = np.busdaycalendar(weekmask=weekmask, holidays=list(holidays or ()))
+            _calendar_cache[key] = calendar
+        return calendar
+
+def days_per_week(calendar):
+    """Number of working days in a calendar's week"""
+    return int(calendar.weekmask.sum())
+
+def to_datetime64(dates):
+    """Convert a date or sequence of dates to datetime64[D]"""
+    return np.asarray(dates, dtype="datetime64[D]")
+
+def offset_business_days(start_dates, offsets, calendar):
+    """
+    Shift dates by business days, vectorized and broadcast
+
+    Start dates that fall on a non-business day are rolled forward first, so
+    offset 0 is the first business day on or after the start. Passing one
+    start date per plan as a column and a template's offsets as a row shifts
+    a whole batch of plans in one operation.
+
+    Args:
+        start_dates (date or array-like): Start dates
+        offsets (int or array-like): Business days to add
+        calendar (numpy.busdaycalendar): Business-day calendar
+
+    Returns:
+        numpy.ndarray: datetime64[D] dates, shaped like the broadcast inputs
+    """
+    return np.busday_offset(to_datetime64(start_dates), offsets, roll="forward", busdaycal=calendar)
+
+def business_day_index(start_date, date, calendar):
+    """
+    Count business days from a start date up to (not including) a date
+
+    A date on a non-business day maps to the index of the next business day.
+
+    Args:
+        start_date (datetime.date): Start date, index 0
+        date (datetime.date): Date to index
+        calendar (numpy.busdaycalendar): Business-day calendar
+
+    Returns:
+        int: Business-day index, negative for dates before the start
+    """
+    return int(np.busday_count(to_datetime64(start_date), to_datetime64(date), busdaycal=calendar))
+
+def to_dates(values):
+    """Convert datetime64[D] values to a list of datetime.date"""
+    return np.asarray(values, dtype="datetime64[D]").astype(object).tolist()
@@ -4,137 +4,240 @@ import uuid
 import json
 import os
 import calendar
+import html
+import urllib.parse
+from utils.business_days import business_calendar, days_per_week, to_dates
+from utils.calendar_sync import SYNC_CALENDAR_NAME, google_calendar_transport, sync_milestones
+from utils.ics_export import export_ics
+from utils.milestone_conflicts import find_overloads
+from utils.milestone_db import has_saved_calendar, issue_calendar_key, load_user_milestones, queue_write, verify_calendar_key
+from utils.milestone_history import apply_changes, create_history, record_edit, redo_edit, undo_edit
+from utils.milestone_scheduler import build_schedule, critical_path, reschedule
+from utils.milestone_store import create_milestone_store, find_duplicate, get_milestone, insert_milestone, iter_milestones
+from utils.milestone_templates import load_milestone_templates, milestone_template, template_dates
 
-def generate_google_calendar_link(milestone_id=None):
+# Busy weeks and clashing days listed at most, each
+MAX_OVERLOAD_WARNINGS = 3
+
+def milestone_calendar():
+    """
+    Get the working days suggested milestones land on: weekdays outside US federal holidays
+    
+    Resolved on every call, so a long-running server moves its holiday
+    window along with the current year.
+    """
+    return business_calendar()
+
+# Compile the suggested milestone templates at startup
+load_milestone_templates()
+
+def get_milestone_store():
+    """Get this session's milestone store, creating it on first use"""
+    if "milestone_store" not in st.session_state:
+        st.session_state.milestone_store = create_milestone_store()
+    return st.session_state.milestone_store
+
+def load_user_calendar(user_email, calendar_key=None):
     """
-    Generate a Google Calendar URL for adding events
+    Open a user's saved calendar in this session, once per user
+    
+    A saved calendar only opens with the key it was saved with; the email
+    alone isn't enough. An email without a saved calendar gets a new key,
+    kept in this session so the user can write it down.
     
     Args:
-        milestone_id (str, optional): Specific milestone ID
+        user_email (str): User's email
+        calendar_key (str, optional): Key entered by the user
         
     Returns:
-        str: Google Calendar URL
+        bool: True if this session's milestones are saved to the user's calendar
     """
-    from datetime import datetime, timedelta
-    import urllib.parse
-    
-    # Get milestones from session state
-    if "session_milestones" not in st.session_state:
-        return "https://calendar.google.com"
-    
-    milestones = st.session_state.session_milestones
-    
-    if milestone_id:
-        # Export a specific milestone
-        milestone = next((m for m in milestones if m["id"] == milestone_id), None)
-        if milestone:
-            # Format for Google Calendar
-            title = milestone["name"]
-            # Format date properly for Google Calendar (YYYYMMDD)
-            start_date = milestone["date"].replace("-", "")
-            # For all-day events, Google Calendar expects the end date to be the next day
-            date_obj = datetime.strptime(milestone["date"], "%Y-%m-%d")
-            next_day = date_obj + timedelta(days=1)
-            end_date = next_day.strftime("%Y%m%d")
-            
-            details = milestone["description"]
-            
-            # Create Google Calendar link with proper URL encoding
-            google_link = (
-                f"https://calendar.google.com/calendar/render?"
-                f"action=TEMPLATE&text={urllib.parse.quote(title)}"
-                f"&dates={start_date}/{end_date}"
-                f"&details={urllib.parse.quote(details)}"
-                f"&sf=true&output=xml"
+    if not user_email:
+        return False
+    if st.session_state.get("milestone_store_email") == user_email:
+        return True
+    
+    if calendar_key is not None:
+        if not verify_calendar_key(user_email, calendar_key):
+            return False
+        st.session_state.pop("new_calendar_key", None)
+        milestones = load_user_milestones(user_email)
+    else:
+        new_key = None if has_saved_calendar(user_email) else issue_calendar_key(user_email)
+        if new_key is None:
+            return False
+        st.session_state.new_calendar_key = new_key
+        # Milestones added before the calendar was opened are kept and saved
+        milestones = get_session_milestones()
+    
+    store = create_milestone_store()
+    for milestone in milestones:
+        insert_milestone(store, milestone)
+    st.session_state.milestone_store = store
+    st.session_state.milestone_store_email = user_email
+    st.session_state.milestone_history = create_history()
+    if calendar_key is None:
+        for milestone in milestones:
+            save_milestone_change("save", milestone)
+    return True
+
+def render_calendar_key(user_email):
+    """Show a new calendar key, or ask for the key of the user's saved calendar"""
+    if not user_email:
+        return
+    
+    if st.session_state.get("milestone_store_email") == user_email:
+        if st.session_state.get("new_calendar_key"):
+            st.info(
+                f"Your calendar key is **{st.session_state.new_calendar_key}**. "
+                "Keep it somewhere safe: you'll need it to open your saved calendar again."
             )
-            
-            return google_link
+        return
     
-    # For all milestones - limit to the first few to avoid URL length issues
-    if milestones:
-        # Sort milestones by date
-        sorted_milestones = sorted(milestones, key=lambda x: x["date"])
-        
-        # Google Calendar doesn't handle multiple events well in one URL
-        # Instead, let's create a link for the first event that should work reliably
-        milestone = sorted_milestones[0]
-        
-        title = milestone["name"]
-        start_date = milestone["date"].replace("-", "")
-        date_obj = datetime.strptime(milestone["date"], "%Y-%m-%d")
-        next_day = date_obj + timedelta(days=1)
-        end_date = next_day.strftime("%Y%m%d")
-        
-        details = (f"{milestone['description']} - This is the first of {len(sorted_milestones)} "
-                  f"milestones in your launch plan. Type: {milestone['type']}")
-        
-        google_link = (
-            f"https://calendar.google.com/calendar/render?"
-            f"action=TEMPLATE&text={urllib.parse.quote(title)}"
-            f"&dates={start_date}/{end_date}"
-            f"&details={urllib.parse.quote(details)}"
-            f"&sf=true&output=xml"
-        )
-        
-        return google_link
+    st.warning(
+        f"A saved calendar already exists for {user_email}. Enter its calendar key to open it. "
+        "Until then, changes here aren't saved."
+    )
+    calendar_key = st.text_input("Calendar key", type="password")
+    if st.button("Open Saved Calendar"):
+        if load_user_calendar(user_email, calendar_key):
+            st.experimental_rerun()
+        else:
+            st.error("That key doesn't open this calendar.")
+
+def get_milestone_history():
+    """Get this session's undo/redo history of milestone edits"""
+    if "milestone_history" not in st.session_state:
+        st.session_state.milestone_history = create_history()
+    return st.session_state.milestone_history
+
+def save_milestone_change(operation, payload=None):
+    """Queue a change to this session's milestones for the user's saved calendar"""
+    user_email = st.session_state.get("milestone_store_email")
+    if user_email:
+        queue_write(operation, user_email, payload)
+
+def save_applied_changes(applied):
+    """Queue changes applied to this session's milestones for the user's saved calendar"""
+    for action, milestone, _ in applied:
+        if action == "insert":
+            save_milestone_change("save", milestone)
+        else:
+            save_milestone_change("delete", milestone["id"])
+
+def commit_milestone_edit(label, changes):
+    """
+    Apply milestone changes as one undoable edit and save them
     
-    # Default Google Calendar link if no milestones
-    return "https://calendar.google.com"
+    Args:
+        label (str): Description shown in the version history
+        changes (list): ("insert" or "remove", milestone, None) tuples
+        
+    Returns:
+        list: The changes that took effect
+    """
+    applied = apply_changes(get_milestone_store(), changes)
+    record_edit(get_milestone_history(), label, applied)
+    save_applied_changes(applied)
+    return applied
+
+def get_session_milestones():
+    """Get this session's milestones in date order"""
+    return list(iter_milestones(get_milestone_store()))
+
+def parse_milestone_date(value):
+    """Parse a "%Y-%m-%d" milestone date, passing dates through unchanged"""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value)
 
-def add_milestone(milestone_name, milestone_date, milestone_description, milestone_type="launch"):
-    """Add a new milestone to the session state"""
-    # Initialize session milestone list if it doesn't exist
-    if "session_milestones" not in st.session_state:
-        st.session_state.session_milestones = []
+def format_milestone_date(value, date_format="%Y-%m-%d"):
+    """Format a milestone date for display or export"""
+    return value.strftime(date_format)
+
+def milestone_calendar_link(milestone, details=None):
+    """
+    Build a Google Calendar link for one all-day milestone
     
-    # Check for duplicates before adding
-    formatted_date = milestone_date.strftime("%Y-%m-%d") if isinstance(milestone_date, datetime.date) else milestone_date
-    for existing in st.session_state.session_milestones:
-        if (existing["name"] == milestone_name and 
-            existing["date"] == formatted_date and
-            existing["description"] == milestone_description):
-            # This is a duplicate, don't add it
-            return True, existing["id"]
-    
-    # Create milestone object
-    milestone_id = str(uuid.uuid4())
-    milestone = {
-        "id": milestone_id,
+    Args:
+        milestone (dict): Milestone dictionary
+        details (str, optional): Event details, defaults to the milestone description
+        
+    Returns:
+        str: Google Calendar URL
+    """
+    # Format date properly for Google Calendar (YYYYMMDD)
+    start_date = format_milestone_date(milestone["date"], "%Y%m%d")
+    # For all-day events, Google Calendar expects the end date to be the next day
+    end_date = format_milestone_date(milestone["date"] + datetime.timedelta(days=1), "%Y%m%d")
+    
+    # Create Google Calendar link with proper URL encoding
+    return (
+        f"https://calendar.google.com/calendar/render?"
+        f"action=TEMPLATE&text={urllib.parse.quote(milestone['name'])}"
+        f"&dates={start_date}/{end_date}"
+        f"&details={urllib.parse.quote(milestone['description'] if details is None else details)}"
+        f"&sf=true&output=xml"
+    )
+
+def new_milestone(milestone_name, milestone_date, milestone_description, milestone_type="launch", start_date=None):
+    """Create a milestone dictionary, optionally with the date its work starts"""
+    milestone_date = parse_milestone_date(milestone_date)
+    return {
+        "id": str(uuid.uuid4()),
         "name": milestone_name,
-        "date": formatted_date if isinstance(formatted_date, str) else milestone_date.strftime("%Y-%m-%d"),
+        "date": milestone_date,
         "description": milestone_description,
         "type": milestone_type,
-        "created_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        "start_date": parse_milestone_date(start_date) if start_date else milestone_date,
+        "created_at": datetime.datetime.now()
     }
-    
-    # Add to session milestones
-    st.session_state.session_milestones.append(milestone)
-    
-    return True, milestone_id
 
-def delete_milestone(milestone_id):
-    """Delete a specific milestone from session state"""
-    if "session_milestones" not in st.session_state:
-        return False
+def add_milestone(milestone_name, milestone_date, milestone_description, milestone_type="launch", start_date=None):
+    """Add a new milestone to the session state, optionally with the date its work starts"""
+    milestone = new_milestone(milestone_name, milestone_date, milestone_description, milestone_type, start_date)
     
-    # Filter out the milestone to delete
-    original_length = len(st.session_state.session_milestones)
-    st.session_state.session_milestones = [m for m in st.session_state.session_milestones if m["id"] != milestone_id]
+    # Check for duplicates before adding
+    existing = find_duplicate(get_milestone_store(), milestone)
+    if existing:
+        # This is a duplicate, don't add it
+        return True, existing["id"]
     
-    # Return True if a milestone was deleted
-    return len(st.session_state.session_milestones) < original_length
+    commit_milestone_edit(f"Added '{milestone_name}'", [("insert", milestone, None)])
+    return True, milestone["id"]
 
-def create_suggested_milestones(launch_plan):
+def delete_milestones(milestone_ids, label=None):
     """
-    Create suggested milestones based on the launch plan
+    Delete milestones from session state as one undoable edit
     
     Args:
-        launch_plan (dict): The generated launch plan
+        milestone_ids (list): IDs of the milestones to delete
+        label (str, optional): Description shown in the version history
         
     Returns:
-        list: List of suggested milestone dicts
+        int: Number of milestones deleted
     """
-    # Get launch type and funding status with fallbacks
+    store = get_milestone_store()
+    changes = [
+        ("remove", milestone, None)
+        for milestone in (get_milestone(store, milestone_id) for milestone_id in milestone_ids)
+        if milestone is not None
+    ]
+    applied = commit_milestone_edit(label or f"Deleted {len(changes)} milestone(s)", changes)
+    return len(applied)
+
+def delete_milestone(milestone_id):
+    """Delete a specific milestone from session state"""
+    if "milestone_store" not in st.session_state:
+        return False
+    
+    # Return True if a milestone was deleted
+    return delete_milestones([milestone_id]) > 0
+
+def _plan_labels(launch_plan):
+    """Get the launch type and funding status of a launch plan, with fallbacks"""
     launch_type = "New Startup/Product Launch"
     funding_status = "Bootstrapping (No external funding, self-funded)"
     
@@ -150,289 +253,318 @@ def create_suggested_milestones(launch_plan):
         # Direct access if not nested in launch_summary
         funding_status = launch_plan.get("funding_status", funding_status)
     
-    # Base date is today
-    today = datetime.date.today()
+    return launch_type, funding_status
+
+def suggested_milestone_tasks(launch_type, funding_status, calendar=None):
+    """
+    Build the suggested milestones as tasks with dependencies and durations
     
-    # Create different timeline based on funding status
-    if "Bootstrapping" in funding_status:
-        # Shorter timeline for bootstrapped companies (8 weeks)
-        pre_launch_weeks = 4
-        launch_day = today + datetime.timedelta(weeks=pre_launch_weeks)
-        post_launch_weeks = 4
-    elif "under $1M" in funding_status:
-        # Medium timeline (10 weeks)
-        pre_launch_weeks = 5
-        launch_day = today + datetime.timedelta(weeks=pre_launch_weeks)
-        post_launch_weeks = 5
-    else:
-        # Longer timeline for well-funded companies (12 weeks)
-        pre_launch_weeks = 6
-        launch_day = today + datetime.timedelta(weeks=pre_launch_weeks)
-        post_launch_weeks = 6
+    Each milestone's date is when its work finishes: ``duration_days``
+    working days after the last milestone it depends on, or after today if
+    it has none.
     
-    # Create a list of suggested milestones
-    suggested_milestones = [
-        {
-            "name": "Messaging Validation Complete",
-            "date": today + datetime.timedelta(weeks=1),
-            "description": "Complete customer interviews and messaging validation",
-            "type": "pre-launch"
-        },
-        {
-            "name": "Content Creation Deadline",
-            "date": today + datetime.timedelta(weeks=pre_launch_weeks-2),
-            "description": "Finalize all launch content, including website, social media posts, and press materials",
-            "type": "pre-launch"
-        },
-        {
-            "name": "Launch Day",
-            "date": launch_day,
-            "description": f"Official {launch_type.strip('🔄 🚀 💰 📢')} launch date",
-            "type": "launch"
-        },
-        {
-            "name": "Post-Launch Analysis",
-            "date": launch_day + datetime.timedelta(weeks=1),
-            "description": "Analyze initial launch metrics and adjust strategy",
-            "type": "post-launch"
-        },
+    Args:
+        launch_type (str): Type of launch
+        funding_status (str): Funding status
+        calendar (numpy.busdaycalendar, optional): Working days, defaults to milestone_calendar()
+        
+    Returns:
+        dict: Task ID -> milestone task
+    """
+    # Working days in a week of the calendar the milestones are scheduled on
+    week = days_per_week(milestone_calendar() if calendar is None else calendar)
+    
+    # Templates are in weeks; tasks get fresh lists so schedules can't change the template
+    template = milestone_template(launch_type, funding_status)
+    return {
+        key: dict(
+            task,
+            description=_template_description(task, launch_type),
+            duration_days=task["duration_days"] * week,
+            depends_on=list(task["depends_on"])
+        )
+        for key, task in template['tasks'].items()
+    }
+
+def _template_description(task, launch_type):
+    """Fill the launch type into a template milestone's description"""
+    return task["description"].format(launch_type=launch_type.strip('🔄 🚀 💰 📢'))
+
+def scheduled_milestones(schedule):
+    """
+    List the milestones of a schedule with their dates
+    
+    Args:
+        schedule (dict): Schedule from build_schedule
+        
+    Returns:
+        list: Milestone dicts with ``key``, ``date``, the ``start_date`` of their work,
+        whether they are on the ``critical`` path and the ``requested_date`` of
+        a pin that was too early to keep
+    """
+    critical = set(critical_path(schedule))
+    return [
         {
-            "name": "Growth Strategy Implementation",
-            "date": launch_day + datetime.timedelta(weeks=post_launch_weeks),
-            "description": "Implement ongoing growth strategy based on launch results",
-            "type": "post-launch"
+            "key": key,
+            "name": task["name"],
+            "date": schedule['finish'][key],
+            "start_date": schedule['start'][key],
+            "description": task["description"],
+            "type": task["type"],
+            "critical": key in critical,
+            "requested_date": schedule['conflicts'].get(key)
         }
+        for key, task in schedule['tasks'].items()
     ]
+
+def create_suggested_milestones(launch_plan):
+    """
+    Create suggested milestones based on the launch plan
     
-    # Add launch type specific milestones
-    if "New Startup/Product Launch" in launch_type:
-        suggested_milestones.append({
-            "name": "Beta User Feedback Session",
-            "date": today + datetime.timedelta(weeks=2),
-            "description": "Collect feedback from beta users to refine product",
-            "type": "pre-launch"
-        })
-    elif "Brand Repositioning" in launch_type:
-        suggested_milestones.append({
-            "name": "Stakeholder Communication",
-            "date": today + datetime.timedelta(weeks=2),
-            "description": "Communicate rebranding to key stakeholders and team",
-            "type": "pre-launch"
-        })
-    elif "Funding Announcement" in launch_type:
-        suggested_milestones.append({
-            "name": "Investor Relations Setup",
-            "date": today + datetime.timedelta(weeks=2),
-            "description": "Prepare investor relations materials and communications",
-            "type": "pre-launch"
-        })
-    elif "Partnership" in launch_type:
-        suggested_milestones.append({
-            "name": "Partner Coordination Meeting",
-            "date": today + datetime.timedelta(weeks=2),
-            "description": "Coordinate launch activities with partnership team",
-            "type": "pre-launch"
-        })
+    Dates come straight from the compiled template, with every milestone
+    as early as its dependencies allow.
     
-    # Format dates as strings for display
-    for milestone in suggested_milestones:
-        milestone["date"] = milestone["date"].strftime("%Y-%m-%d")
+    Args:
+        launch_plan (dict): The generated launch plan
+        
+    Returns:
+        list: List of suggested milestone dicts
+    """
+    launch_type, funding_status = _plan_labels(launch_plan)
+    calendar = milestone_calendar()
     
-    return suggested_milestones
+    # Base date is today, with milestones on working days only
+    template = milestone_template(launch_type, funding_status)
+    starts, finishes = template_dates(template, datetime.date.today(), calendar, days_per_week(calendar))
+    return [
+        {
+            "key": key,
+            "name": template['tasks'][key]["name"],
+            "date": finish,
+            "start_date": start,
+            "description": _template_description(template['tasks'][key], launch_type),
+            "type": template['tasks'][key]["type"],
+            "critical": critical,
+            "requested_date": None
+        }
+        for key, start, finish, critical in zip(
+            template['keys'], to_dates(starts), to_dates(finishes), template['critical'].tolist()
+        )
+    ]
 
-def display_improved_timeline(milestones, deletable=False):
+def suggested_launch_day(milestones):
+    """Date of Launch Day among suggested milestones"""
+    return next(milestone["date"] for milestone in milestones if milestone["key"] == "launch_day")
+
+def get_suggested_milestones(launch_plan, launch_day=None):
     """
-    Display an improved timeline visualization of milestones
+    Get this session's suggested milestones, recomputed only when the plan, day or Launch Day changes
+    
+    The template's dates are used until Launch Day moves. The plan is then
+    scheduled once, and later moves re-propagate only the milestones
+    downstream of Launch Day.
     
     Args:
-        milestones (list): List of milestone dictionaries
-        deletable (bool): Whether to show delete checkboxes
+        launch_plan (dict): The generated launch plan
+        launch_day (datetime.date, optional): Date to move Launch Day to
+        
+    Returns:
+        list: List of suggested milestone dicts
     """
-    # Sort milestones by date
-    import datetime
+    launch_type, funding_status = _plan_labels(launch_plan)
+    today = datetime.date.today()
+    plan_key = (launch_type, funding_status, today)
+    cached = st.session_state.get("suggested_milestones")
+    if cached is None or cached['key'] != plan_key:
+        cached = {'key': plan_key, 'suggested': create_suggested_milestones(launch_plan), 'schedule': None, 'moved': None}
+        st.session_state.suggested_milestones = cached
+    
+    suggested = cached['suggested']
+    if launch_day is None or launch_day == suggested_launch_day(suggested):
+        return suggested
+    if cached['moved'] is None or cached['moved'][0] != launch_day:
+        if cached['schedule'] is None:
+            calendar = milestone_calendar()
+            tasks = suggested_milestone_tasks(launch_type, funding_status, calendar)
+            cached['schedule'] = build_schedule(tasks, today, calendar=calendar)
+        reschedule(cached['schedule'], "launch_day", launch_day)
+        cached['moved'] = (launch_day, scheduled_milestones(cached['schedule']))
+    return cached['moved'][1]
+
+# Type color mapping
+MILESTONE_TYPE_COLORS = {
+    'pre-launch': '#4299E1',  # Blue
+    'launch': '#FF5A5F',      # Red
+    'post-launch': '#38A169'  # Green
+}
+
+# Type titles
+MILESTONE_TYPE_TITLES = {
+    'pre-launch': '🔍 Pre-Launch Phase',
+    'launch': '🚀 Launch Phase',
+    'post-launch': '📈 Post-Launch Phase'
+}
+
+# Styles shared by every timeline element, sent once per payload.
+# Off-screen cards skip layout and paint, so long phases stay cheap in the browser
+TIMELINE_CSS = """<style>
+.lt-range{display:flex;justify-content:space-between;margin-bottom:15px;font-size:1rem;color:#666;font-weight:500}
+.lt-strip{position:relative;height:100px;margin-bottom:30px;background-color:#f8f9fa;border-radius:8px;padding:10px}
+.lt-axis{position:absolute;top:50px;left:0;right:0;height:3px;background-color:#E2E8F0}
+.lt-marker{position:absolute;border-radius:50%;box-shadow:0 1px 3px rgba(0,0,0,0.2);cursor:pointer;display:flex;align-items:center;justify-content:center;color:white;font-weight:bold}
+.lt-label{position:absolute;top:65px;transform:translateX(-50%) rotate(-45deg);font-size:0.7rem;white-space:nowrap;transform-origin:top left;color:#555;font-weight:500}
+.lt-phase{margin-bottom:16px}
+.lt-phase summary{font-weight:600;cursor:pointer}
+.lt-list{max-height:520px;overflow-y:auto}
+.lt-card{display:flex;gap:12px;align-items:center;margin:12px 0;padding:16px;border-left:4px solid;background-color:#F7FAFC;border-radius:6px;box-shadow:0 1px 2px rgba(0,0,0,0.05);content-visibility:auto;contain-intrinsic-size:auto 90px}
+.lt-body{flex:1}
+.lt-head{display:flex;justify-content:space-between;margin-bottom:8px;align-items:center}
+.lt-name{font-weight:600;font-size:1.05rem;color:#2D3748}
+.lt-date{color:#4A5568;font-size:0.9rem;background-color:#EDF2F7;padding:3px 8px;border-radius:12px}
+.lt-desc{margin:0;color:#4A5568;font-size:0.95rem}
+.lt-link{text-decoration:none;color:white !important;background-color:#4285F4;padding:8px 12px;border-radius:4px;font-size:0.8rem;white-space:nowrap}
+</style>"""
+
+def _timeline_strip_html(sorted_milestones):
+    """Build the timeline strip with one marker per date"""
+    min_date = sorted_milestones[0]["date"]
+    max_date = sorted_milestones[-1]["date"]
+    
+    # Add some padding to the timeline
+    min_date = min_date - datetime.timedelta(days=7)  # Increased padding
+    max_date = max_date + datetime.timedelta(days=7)  # Increased padding
+    total_days = (max_date - min_date).days + 1  # Add 1 to avoid division by zero
+    
+    # Group milestones by date to prevent overlap
+    date_grouped_milestones = {}
+    for milestone in sorted_milestones:
+        date_grouped_milestones.setdefault(milestone["date"], []).append(milestone)
     
-    sorted_milestones = sorted(milestones, key=lambda x: datetime.datetime.strptime(x["date"], "%Y-%m-%d"))
+    parts = [
+        f'<div class="lt-range"><span>{min_date.strftime("%b %d, %Y")}</span><span>{max_date.strftime("%b %d, %Y")}</span></div>',
+        '<div class="lt-strip"><div class="lt-axis"></div>'
+    ]
     
-    # Group milestones by type
-    grouped_milestones = {
-        'pre-launch': [],
-        'launch': [],
-        'post-launch': []
-    }
+    # Add milestone markers - with improved spacing for grouped items
+    for milestone_date, ms_group in date_grouped_milestones.items():
+        position_percent = ((milestone_date - min_date).days / total_days) * 100
+    
+        # Get the dominant type for this date group
+        types = [m.get("type", "pre-launch") for m in ms_group]
+        dominant_type = max(set(types), key=types.count)  # Most common type
+    
+        # Create a larger marker for grouped milestones
+        marker_size = min(10 + (len(ms_group) * 2), 18)  # Larger for more milestones, but with a cap
+    
+        # Format milestone tooltip
+        tooltip_content = "&#10;".join(html.escape(f"{m['name']} ({m['type']})") for m in ms_group)
+    
+        parts.append(
+            f'<div class="lt-marker" style="top:{46 - marker_size/2}px;left:{position_percent:.2f}%;'
+            f'width:{marker_size}px;height:{marker_size}px;font-size:{marker_size/2}px;'
+            f'background-color:{MILESTONE_TYPE_COLORS.get(dominant_type, MILESTONE_TYPE_COLORS["pre-launch"])};'
+            f'transform:translateX(-{marker_size/2}px)" title="{tooltip_content}">{len(ms_group) if len(ms_group) > 1 else ""}</div>'
+        )
+    
+        # Only show some date labels to reduce clutter
+        if (milestone_date.day % 3 == 0) or len(ms_group) > 1:
+            parts.append(
+                f'<div class="lt-label" style="left:{position_percent:.2f}%">{milestone_date.strftime("%b %d")}</div>'
+            )
+    
+    parts.append('</div>')
+    return "".join(parts)
+
+def _milestone_card_html(milestone, color):
+    """Build one milestone card with its Add to Calendar link"""
+    return (
+        f'<div class="lt-card" style="border-left-color:{color}"><div class="lt-body"><div class="lt-head">'
+        f'<span class="lt-name">{html.escape(milestone["name"])}</span>'
+        f'<span class="lt-date">{format_milestone_date(milestone["date"], "%a, %b %d")}</span></div>'
+        f'<p class="lt-desc">{html.escape(milestone["description"])}</p></div>'
+        f'<a class="lt-link" href="{html.escape(milestone_calendar_link(milestone))}" target="_blank">&#128197; Add to Calendar</a>'
+        f'</div>'
+    )
+
+def build_timeline_html(sorted_milestones):
+    """
+    Build the whole timeline, markers and milestone cards, as one HTML payload
+    
+    Args:
+        sorted_milestones (list): Milestone dictionaries in date order
+    
+    Returns:
+        str: Timeline HTML
+    """
+    if not sorted_milestones:
+        return ""
     
+    # Group milestones by type
+    grouped_milestones = {phase_type: [] for phase_type in MILESTONE_TYPE_TITLES}
     for milestone in sorted_milestones:
         milestone_type = milestone.get("type", "pre-launch")
         if milestone_type in grouped_milestones:
             grouped_milestones[milestone_type].append(milestone)
     
-    # Store selected milestones for deletion if in deletable mode
-    if deletable and "milestones_to_delete" not in st.session_state:
-        st.session_state.milestones_to_delete = []
+    parts = [TIMELINE_CSS, _timeline_strip_html(sorted_milestones)]
     
-    # Type color mapping
-    type_colors = {
-        'pre-launch': '#4299E1',  # Blue
-        'launch': '#FF5A5F',      # Red
-        'post-launch': '#38A169'  # Green
-    }
+    # Create expandable sections for each phase type
+    for phase_type, phase_milestones in grouped_milestones.items():
+        if not phase_milestones:
+            continue
     
-    # Type titles
-    type_titles = {
-        'pre-launch': '🔍 Pre-Launch Phase',
-        'launch': '🚀 Launch Phase',
-        'post-launch': '📈 Post-Launch Phase'
-    }
+        color = MILESTONE_TYPE_COLORS[phase_type]
+        parts.append(
+            f'<details open class="lt-phase"><summary>'
+            f'{MILESTONE_TYPE_TITLES[phase_type]} ({len(phase_milestones)} milestones)</summary>'
+            f'<div class="lt-list">'
+        )
+        parts.extend(_milestone_card_html(milestone, color) for milestone in phase_milestones)
+        parts.append('</div></details>')
+    
+    return "".join(parts)
+
+def display_improved_timeline(milestones, deletable=False):
+    """
+    Display an improved timeline visualization of milestones
+    
+    The timeline and every milestone card are sent as a single HTML payload,
+    so render cost doesn't grow with one message per milestone.
+    
+    Args:
+        milestones (list): List of milestone dictionaries
+        deletable (bool): Whether to show milestone selection for deletion
+    
+    Returns:
+        list: IDs of milestones selected for deletion
+    """
+    # Sort milestones by date
+    sorted_milestones = sorted(milestones, key=lambda x: x["date"])
     
     st.markdown("## Your Launch Timeline")
+    st.markdown(build_timeline_html(sorted_milestones), unsafe_allow_html=True)
     
-    # Get date range
-    if sorted_milestones:
-        min_date = datetime.datetime.strptime(sorted_milestones[0]["date"], "%Y-%m-%d")
-        max_date = datetime.datetime.strptime(sorted_milestones[-1]["date"], "%Y-%m-%d")
-        
-        # Add some padding to the timeline
-        min_date = min_date - datetime.timedelta(days=7)  # Increased padding
-        max_date = max_date + datetime.timedelta(days=7)  # Increased padding
-        total_days = (max_date - min_date).days + 1  # Add 1 to avoid division by zero
-        
-        # Calculate weeks for better labeling
-        total_weeks = (total_days // 7) + 1
-        
-        # Display timeline header with cleaner date format and more space
-        st.markdown(f"""
-        <div style="display: flex; justify-content: space-between; margin-bottom: 15px; font-size: 1rem; color: #666; font-weight: 500;">
-            <span>{min_date.strftime('%b %d, %Y')}</span>
-            <span>{max_date.strftime('%b %d, %Y')}</span>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Create main timeline container
-        st.markdown("""
-        <div style="position: relative; height: 100px; margin-bottom: 30px; background-color: #f8f9fa; border-radius: 8px; padding: 10px;">
-            <div style="position: absolute; top: 50px; left: 0; right: 0; height: 3px; background-color: #E2E8F0;"></div>
-        """, unsafe_allow_html=True)
-        
-        # Group milestones by date to prevent overlap
-        date_grouped_milestones = {}
-        for milestone in sorted_milestones:
-            date = milestone["date"]
-            if date not in date_grouped_milestones:
-                date_grouped_milestones[date] = []
-            date_grouped_milestones[date].append(milestone)
-        
-        # Add milestone markers - with improved spacing for grouped items
-        for date, ms_group in date_grouped_milestones.items():
-            milestone_date = datetime.datetime.strptime(date, "%Y-%m-%d")
-            position_percent = ((milestone_date - min_date).days / total_days) * 100
-            
-            # Get the dominant type for this date group
-            types = [m.get("type", "pre-launch") for m in ms_group]
-            dominant_type = max(set(types), key=types.count)  # Most common type
-            
-            # Create a larger marker for grouped milestones
-            marker_size = min(10 + (len(ms_group) * 2), 18)  # Larger for more milestones, but with a cap
-            
-            # Only show every other date label to reduce clutter
-            show_label = (milestone_date.day % 3 == 0) or len(ms_group) > 1
-            
-            # Format milestone tooltip
-            tooltip_content = "<br>".join([f"{m['name']} ({m['type']})" for m in ms_group])
-            
-            st.markdown(f"""
-            <div style="position: absolute; top: {46 - marker_size/2}px; left: {position_percent}%; 
-                        width: {marker_size}px; height: {marker_size}px; 
-                        border-radius: 50%; background-color: {type_colors[dominant_type]}; 
-                        transform: translateX(-{marker_size/2}px); 
-                        box-shadow: 0 1px 3px rgba(0,0,0,0.2); 
-                        cursor: pointer; 
-                        display: flex; align-items: center; justify-content: center; 
-                        color: white; font-weight: bold; font-size: {marker_size/2}px;"
-                        title="{tooltip_content}">
-                {len(ms_group) if len(ms_group) > 1 else ""}
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Show date labels with improved spacing
-            if show_label:
-                st.markdown(f"""
-                <div style="position: absolute; top: 65px; left: {position_percent}%; 
-                            transform: translateX(-50%) rotate(-45deg); 
-                            font-size: 0.7rem; white-space: nowrap; 
-                            transform-origin: top left; 
-                            color: #555; font-weight: 500;">
-                    {milestone_date.strftime('%b %d')}
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # Close main timeline container
-        st.markdown("</div>", unsafe_allow_html=True)
+    if not deletable:
+        return []
     
-    # Create expandable sections for each phase type
-    for phase_type in ['pre-launch', 'launch', 'post-launch']:
-        if not grouped_milestones[phase_type]:
-            continue
-            
-        with st.expander(f"{type_titles[phase_type]} ({len(grouped_milestones[phase_type])} milestones)", expanded=True):
-            # List milestones with cards - improved card design
-            for milestone in grouped_milestones[phase_type]:
-                milestone_date = datetime.datetime.strptime(milestone["date"], "%Y-%m-%d")
-                milestone_id = milestone["id"]
-                
-                # Create columns with appropriate sizing based on mode
-                if deletable:
-                    cols = st.columns([0.1, 0.7, 0.2])
-                else:
-                    cols = st.columns([0.8, 0.2])
-                
-                # Add checkbox for deletion if in deletable mode
-                if deletable:
-                    with cols[0]:
-                        is_selected = milestone_id in st.session_state.milestones_to_delete
-                        if st.checkbox("", value=is_selected, key=f"delete_{milestone_id}"):
-                            if milestone_id not in st.session_state.milestones_to_delete:
-                                st.session_state.milestones_to_delete.append(milestone_id)
-                        else:
-                            if milestone_id in st.session_state.milestones_to_delete:
-                                st.session_state.milestones_to_delete.remove(milestone_id)
-                
-                # Display milestone card
-                with cols[1 if deletable else 0]:
-                    st.markdown(f"""
-                    <div style="margin: 12px 0; padding: 16px; border-left: 4px solid {type_colors[phase_type]}; 
-                                background-color: #F7FAFC; border-radius: 6px; box-shadow: 0 1px 2px rgba(0,0,0,0.05);">
-                        <div style="display: flex; justify-content: space-between; margin-bottom: 8px; align-items: center;">
-                            <span style="font-weight: 600; font-size: 1.05rem; color: #2D3748;">{milestone["name"]}</span>
-                            <span style="color: #4A5568; font-size: 0.9rem; background-color: #EDF2F7; 
-                                        padding: 3px 8px; border-radius: 12px;">
-                                {milestone_date.strftime('%a, %b %d')}
-                            </span>
-                        </div>
-                        <p style="margin: 0; color: #4A5568; font-size: 0.95rem;">{milestone["description"]}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Add calendar button for each milestone
-                with cols[-1]:
-                    # Generate calendar link for this specific milestone
-                    calendar_link = generate_google_calendar_link(milestone_id)
-                    st.markdown(f"""
-                    <a href="{calendar_link}" target="_blank" style="display: inline-block; 
-                       margin-top: 12px; text-decoration: none; color: white; 
-                       background-color: #4285F4; padding: 8px 12px; 
-                       border-radius: 4px; font-size: 0.8rem; text-align: center;
-                       white-space: nowrap; width: 100%;">
-                       <svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" fill="currentColor" 
-                          viewBox="0 0 16 16" style="vertical-align: text-bottom; margin-right: 5px;">
-                          <path d="M8 0a8 8 0 1 0 0 16A8 8 0 0 0 8 0ZM4.5 7.5a.5.5 0 0 1 0-1h5.793L8.146 4.354a.5.5 0 1 1 .708-.708l3 3a.5.5 0 0 1 0 .708l-3 3a.5.5 0 0 1-.708-.708L10.293 7.5H4.5Z"/>
-                       </svg>
-                       Add to Calendar
-                    </a>
-                    """, unsafe_allow_html=True)
+    # One selection widget for every milestone instead of a checkbox per card
+    labels = {
+        milestone["id"]: f"{milestone['name']} ({format_milestone_date(milestone['date'], '%b %d')})"
+        for milestone in sorted_milestones
+    }
+    selected = [
+        milestone_id for milestone_id in st.session_state.get("milestones_to_delete", [])
+        if milestone_id in labels
+    ]
+    st.session_state.milestones_to_delete = st.multiselect(
+        "Select milestones to delete",
+        list(labels),
+        default=selected,
+        format_func=labels.get
+    )
     
     # Return list of milestone IDs to delete
-    if deletable:
-        return st.session_state.milestones_to_delete
-    return []
+    return st.session_state.milestones_to_delete
 
 def milestone_calendar_ui(user_email, launch_plan=None):
     """
@@ -462,9 +594,9 @@ def milestone_calendar_ui(user_email, launch_plan=None):
             # Clear the feedback after showing it
             st.session_state.milestone_added_feedback = None
         
-        # Initialize session milestones if not already done
-        if "session_milestones" not in st.session_state:
-            st.session_state.session_milestones = []
+        # Open the user's saved calendar if not already done, asking for its key if it has one
+        load_user_calendar(user_email)
+        render_calendar_key(user_email)
         
         # Create tabs
         tab1, tab2 = st.tabs(["Add Milestones", "View Calendar"])
@@ -473,7 +605,7 @@ def milestone_calendar_ui(user_email, launch_plan=None):
             render_add_milestones_view(launch_plan)
         
         with tab2:
-            render_calendar_view(user_email)
+            render_calendar_view(st.session_state.get("milestone_store_email"))
         
     except Exception as e:
         st.error(f"An error occurred while displaying the calendar: {str(e)}")
@@ -503,7 +635,24 @@ def render_add_milestones_view(launch_plan):
         st.markdown("#### Suggested Milestones")
         
         try:
-            suggested_milestones = create_suggested_milestones(launch_plan)
+            # Moving Launch Day moves every milestone that depends on it. The
+            # suggested date is as early as its prerequisites allow
+            earliest_launch_day = suggested_launch_day(get_suggested_milestones(launch_plan))
+            launch_day = st.date_input(
+                "Launch Day",
+                value=earliest_launch_day,
+                min_value=earliest_launch_day,
+                help="Milestones after launch move with it. Launch Day can't come before its prerequisites are done."
+            )
+            suggested_milestones = get_suggested_milestones(launch_plan, launch_day)
+            
+            launch_milestone = next(milestone for milestone in suggested_milestones if milestone["key"] == "launch_day")
+            if launch_milestone["requested_date"]:
+                st.warning(
+                    f"Launch Day can't be on {format_milestone_date(launch_milestone['requested_date'])} because "
+                    f"the milestones before it aren't done yet. It's scheduled for "
+                    f"{format_milestone_date(launch_milestone['date'])}, the earliest feasible date."
+                )
             
             # Add option to reset calendar and use only suggested milestones
             use_only_suggested = st.checkbox("Replace existing milestones with these suggestions", 
@@ -521,8 +670,10 @@ def render_add_milestones_view(launch_plan):
                     st.markdown(f"**{milestone['name']}**")
                     st.markdown(f"_{milestone['description']}_")
                 with col3:
-                    st.markdown(f"Date: {milestone['date']}")
+                    st.markdown(f"Date: {format_milestone_date(milestone['date'])}")
                     st.markdown(f"Type: {milestone['type'].capitalize()}")
+                    if milestone['critical']:
+                        st.caption("On the critical path")
                 st.divider()
             
             # Display suggested milestones feedback if present (right above the button)
@@ -541,18 +692,19 @@ def render_add_milestones_view(launch_plan):
             # Add selected milestones
             if st.button("Add Selected Milestones", use_container_width=True, disabled=not selected_milestones):
                 if selected_milestones:
-                    # Clear existing milestones if requested
+                    # Clear existing milestones if requested, in the same undoable edit
+                    changes = []
                     if use_only_suggested:
-                        st.session_state.session_milestones = []
+                        changes = [("remove", milestone, None) for milestone in iter_milestones(get_milestone_store())]
                         
-                    # Add selected milestones
-                    added_count = 0
-                    for milestone in selected_milestones:
-                        milestone_date = datetime.datetime.strptime(milestone['date'], "%Y-%m-%d").date()
-                        success, _ = add_milestone(milestone['name'], milestone_date, 
-                                                    milestone['description'], milestone['type'])
-                        if success:
-                            added_count += 1
+                    # Add selected milestones; duplicates of stored ones are skipped
+                    changes.extend(
+                        ("insert", new_milestone(milestone['name'], milestone['date'], milestone['description'],
+                                                 milestone['type'], milestone['start_date']), None)
+                        for milestone in selected_milestones
+                    )
+                    commit_milestone_edit("Added suggested milestones", changes)
+                    added_count = len(selected_milestones)
                     
                     # Set local feedback for suggested milestones section
                     st.session_state.suggested_milestones_feedback = ("success", f"✅ {added_count} suggested milestones added to your calendar!")
@@ -639,36 +791,92 @@ def render_add_milestones_view(launch_plan):
     if st.button("View Your Calendar", use_container_width=True):
         st.info("Click on the 'View Calendar' tab above to see your milestones.")
 
+def display_overload_warnings(milestones):
+    """
+    Warn about weeks with too much work in progress and days with clashing milestones
+    
+    Args:
+        milestones (list): List of milestone dictionaries
+    """
+    overloads = find_overloads(milestones)
+    
+    for week_start, week_milestones in overloads['weeks'][:MAX_OVERLOAD_WARNINGS]:
+        names = ", ".join(milestone["name"] for milestone in week_milestones[:5])
+        more = f" and {len(week_milestones) - 5} more" if len(week_milestones) > 5 else ""
+        st.warning(
+            f"⚠️ Busy week of {format_milestone_date(datetime.date.fromordinal(week_start), '%b %d')}: "
+            f"{len(week_milestones)} milestones in progress ({names}{more})"
+        )
+    
+    for day, day_milestones in overloads['days'][:MAX_OVERLOAD_WARNINGS]:
+        names = ", ".join(milestone["name"] for milestone in day_milestones[:5])
+        more = f" and {len(day_milestones) - 5} more" if len(day_milestones) > 5 else ""
+        st.warning(
+            f"⚠️ {len(day_milestones)} milestones due on "
+            f"{format_milestone_date(datetime.date.fromordinal(day), '%b %d')}: {names}{more}"
+        )
+    
+    hidden = max(0, len(overloads['weeks']) - MAX_OVERLOAD_WARNINGS) + max(0, len(overloads['days']) - MAX_OVERLOAD_WARNINGS)
+    if hidden:
+        st.caption(f"{hidden} more busy weeks or clashing days not shown.")
+
+def render_edit_history():
+    """Render Undo and Redo buttons and the recent versions of the calendar"""
+    history = get_milestone_history()
+    if not history['undo'] and not history['redo']:
+        return
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        undo_label = f"↶ Undo: {history['undo'][-1]['label']}" if history['undo'] else "↶ Undo"
+        if st.button(undo_label, disabled=not history['undo'], use_container_width=True):
+            save_applied_changes(undo_edit(history, get_milestone_store()))
+            st.experimental_rerun()
+    with col2:
+        redo_label = f"↷ Redo: {history['redo'][-1]['label']}" if history['redo'] else "↷ Redo"
+        if st.button(redo_label, disabled=not history['redo'], use_container_width=True):
+            save_applied_changes(redo_edit(history, get_milestone_store()))
+            st.experimental_rerun()
+    
+    with st.expander("Version history"):
+        for edit in reversed(history['undo']):
+            st.markdown(f"**v{edit['version']}** · {edit['time'].strftime('%H:%M')} · {edit['label']}")
+
 def render_calendar_view(user_email):
     """Render the View Calendar tab content"""
-    if not st.session_state.session_milestones:
+    store = get_milestone_store()
+    
+    # Undo is offered even when an edit left the calendar empty
+    render_edit_history()
+    
+    if not store['milestones']:
         st.info("You haven't added any milestones yet. Add some milestones to see them in your calendar.")
     else:
         # Add a reset calendar button
         col1, col2 = st.columns([3, 1])
         with col2:
             if st.button("Reset Calendar", type="secondary"):
-                st.session_state.session_milestones = []
-                st.success("Calendar has been reset!")
+                delete_milestones(list(store['milestones']), "Reset calendar")
+                st.success("Calendar has been reset! Use Undo to bring it back.")
                 st.experimental_rerun()
         
         # Use checkbox instead of toggle for edit mode
         edit_mode = st.checkbox("Edit Mode (Select milestones to delete)", value=False)
         
         # Show total number of milestones at top
-        st.info(f"You have {len(st.session_state.session_milestones)} milestones in your calendar")
+        st.info(f"You have {len(store['milestones'])} milestones in your calendar")
+        
+        # Warn about overloaded weeks and milestones due on the same day
+        display_overload_warnings(get_session_milestones())
         
         # Use the improved timeline display with delete checkboxes if in edit mode
-        milestones_to_delete = display_improved_timeline(st.session_state.session_milestones, deletable=edit_mode)
+        milestones_to_delete = display_improved_timeline(get_session_milestones(), deletable=edit_mode)
         
         # Show delete button if in edit mode and milestones are selected
         if edit_mode and milestones_to_delete:
             if st.button(f"Delete Selected Milestones ({len(milestones_to_delete)})", type="primary"):
-                # Remove selected milestones
-                st.session_state.session_milestones = [
-                    m for m in st.session_state.session_milestones 
-                    if m["id"] not in milestones_to_delete
-                ]
+                # Remove selected milestones as one undoable edit
+                delete_milestones(milestones_to_delete)
                 
                 # Clear the selection state
                 if "milestones_to_delete" in st.session_state:
@@ -677,6 +885,41 @@ def render_calendar_view(user_email):
                 st.success(f"Deleted {len(milestones_to_delete)} milestone(s).")
                 st.experimental_rerun()
         
-        # Add helpful info text instead of the Export section
+        # Add helpful info text and the export of every milestone
         if not edit_mode:
-            st.info("Click the 'Add to Calendar' button next to any milestone to add it to your Google Calendar.")
\ No newline at end of file
+            st.info("Click the 'Add to Calendar' button next to any milestone to add it to your Google Calendar.")
+            # The file is only built on request, streamed from the store one event at a time
+            if st.button("Export All Milestones (.ics)", use_container_width=True):
+                with export_ics(iter_milestones(store)) as ics_file:
+                    st.download_button(
+                        "Download All Milestones (.ics)",
+                        data=ics_file,
+                        file_name="launch_milestones.ics",
+                        mime="text/calendar",
+                        use_container_width=True,
+                        help="Import into Google Calendar, Outlook or Apple Calendar. Re-importing updates existing events."
+                    )
+            render_calendar_sync(user_email)
+
+def render_calendar_sync(user_email):
+    """Render the Google Calendar sync button, if a service account is configured in secrets"""
+    try:
+        settings = st.secrets.get("google_calendar")
+    except Exception:
+        settings = None
+    if not settings or not user_email:
+        return
+    
+    if st.button("Sync to Google Calendar", use_container_width=True):
+        try:
+            transport = google_calendar_transport(dict(settings["service_account"]))
+            summary = sync_milestones(user_email, transport)
+            st.success(
+                f"Calendar synced: {summary['inserted']} added, {summary['updated']} updated, "
+                f"{summary['deleted']} removed, {summary['unchanged']} unchanged. "
+                f"Your milestones are in the \"{SYNC_CALENDAR_NAME}\" calendar shared with {user_email}."
+            )
+            if summary["failed"]:
+                st.warning(f"{summary['failed']} milestone(s) couldn't be synced and will be retried next time.")
+        except Exception as e:
+            st.error(f"Error syncing calendar: {str(e)}")
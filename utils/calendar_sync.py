@@ -0,0 +1,262 @@
+import datetime
+import json
+import threading
+import zlib
+from contextlib import closing
+
+from utils.milestone_db import MILESTONES_DB_PATH, connect_milestone_db, load_user_milestones
+
+# Requests per batch call; Google Calendar accepts up to 50 per batch
+SYNC_BATCH_SIZE = 50
+
+# Creating and sharing each user's calendar needs more than the events scope
+GOOGLE_CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+# Name of the calendar created for each user
+SYNC_CALENDAR_NAME = "Launch Milestones"
+
+SYNC_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendar_sync (
+    email TEXT NOT NULL,
+    milestone_id TEXT NOT NULL,
+    remote_id TEXT NOT NULL,
+    etag TEXT,
+    fingerprint INTEGER NOT NULL,
+    synced_at TEXT NOT NULL,
+    PRIMARY KEY (email, milestone_id)
+);
+CREATE TABLE IF NOT EXISTS calendar_sync_calendars (
+    email TEXT PRIMARY KEY,
+    calendar_id TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+# Held while a user's calendar is looked up or created, so one sync can't race another into a second calendar
+_calendar_lock = threading.Lock()
+
+def milestone_event(milestone):
+    """
+    Build the calendar event body of an all-day milestone
+
+    Args:
+        milestone (dict): Milestone dictionary with a native ``date``
+
+    Returns:
+        dict: Event body in the Google Calendar API format
+    """
+    return {
+        "summary": milestone["name"],
+        "description": milestone["description"],
+        "start": {"date": milestone["date"].isoformat()},
+        "end": {"date": (milestone["date"] + datetime.timedelta(days=1)).isoformat()},
+        "extendedProperties": {"private": {"milestone_id": milestone["id"], "type": milestone.get("type", "")}}
+    }
+
+def event_fingerprint(event):
+    """Checksum of an event body, used to find milestones changed since the last sync"""
+    return zlib.crc32(json.dumps(event, sort_keys=True).encode("utf-8"))
+
+def _load_sync_state(conn, email):
+    """Remote ID, ETag and fingerprint of each synced milestone"""
+    return {
+        milestone_id: {"remote_id": remote_id, "etag": etag, "fingerprint": fingerprint}
+        for milestone_id, remote_id, etag, fingerprint in conn.execute(
+            "SELECT milestone_id, remote_id, etag, fingerprint FROM calendar_sync WHERE email = ?", (email,)
+        )
+    }
+
+def user_calendar_id(email, transport, db_path=MILESTONES_DB_PATH):
+    """
+    Get the remote calendar a user's milestones are synced to, creating it on first sync
+
+    Every user gets their own calendar, shared with their email, so one
+    founder's milestones never land in another's calendar.
+
+    Args:
+        email (str): User's email
+        transport (dict): Transport with a ``create_calendar`` callable
+        db_path (str, optional): Path to the milestone database
+
+    Returns:
+        str: Remote calendar ID
+    """
+    with _calendar_lock:
+        with closing(connect_milestone_db(db_path)) as conn:
+            conn.executescript(SYNC_SCHEMA)
+            row = conn.execute("SELECT calendar_id FROM calendar_sync_calendars WHERE email = ?", (email,)).fetchone()
+            if row:
+                return row[0]
+
+            calendar_id = transport["create_calendar"](email, SYNC_CALENDAR_NAME)
+            with conn:
+                # Sync state from before per-user calendars points at events elsewhere, so start over
+                conn.execute("DELETE FROM calendar_sync WHERE email = ?", (email,))
+                conn.execute(
+                    "INSERT INTO calendar_sync_calendars (email, calendar_id, created_at) VALUES (?, ?, ?)",
+                    (email, calendar_id, datetime.datetime.now().isoformat(sep=" ", timespec="seconds"))
+                )
+            return calendar_id
+
+def plan_sync(milestones, sync_state):
+    """
+    Work out the requests needed to bring the remote calendar up to date
+
+    Args:
+        milestones (list): The user's milestones
+        sync_state (dict): Milestone ID -> remote ID, ETag and fingerprint from the last sync
+
+    Returns:
+        list: Operations with ``method`` (insert, update or delete), ``milestone_id``,
+        ``remote_id``, ``etag``, ``event`` and ``fingerprint``
+    """
+    operations = []
+    local_ids = set()
+    for milestone in milestones:
+        local_ids.add(milestone["id"])
+        event = milestone_event(milestone)
+        fingerprint = event_fingerprint(event)
+        synced = sync_state.get(milestone["id"])
+        if synced is None:
+            operations.append({"method": "insert", "milestone_id": milestone["id"], "remote_id": None,
+                               "etag": None, "event": event, "fingerprint": fingerprint})
+        elif synced["fingerprint"] != fingerprint:
+            operations.append({"method": "update", "milestone_id": milestone["id"], "remote_id": synced["remote_id"],
+                               "etag": synced["etag"], "event": event, "fingerprint": fingerprint})
+
+    for milestone_id, synced in sync_state.items():
+        if milestone_id not in local_ids:
+            operations.append({"method": "delete", "milestone_id": milestone_id, "remote_id": synced["remote_id"],
+                               "etag": synced["etag"], "event": None, "fingerprint": None})
+    return operations
+
+def _retry_operation(operation, status):
+    """Operation to retry after a failed request, or None"""
+    if operation["method"] == "update" and status in (404, 410):
+        # Deleted on the remote side; the milestone still exists, so recreate it
+        return dict(operation, method="insert", remote_id=None, etag=None)
+    if operation["method"] in ("update", "delete") and status == 412 and operation["etag"]:
+        # Edited on the remote side since the last sync; the local milestone wins
+        return dict(operation, etag=None)
+    return None
+
+def sync_milestones(email, transport, db_path=MILESTONES_DB_PATH, batch_size=SYNC_BATCH_SIZE):
+    """
+    Push a user's milestones to their remote calendar, sending only what changed since the last sync
+
+    Args:
+        email (str): User's email
+        transport (dict): Transport with ``create_calendar`` and ``batch``
+            callables, e.g. from google_calendar_transport
+        db_path (str, optional): Path to the milestone database
+        batch_size (int, optional): Requests per batch call
+
+    Returns:
+        dict: Counts of ``inserted``, ``updated``, ``deleted``, ``unchanged`` and
+        ``failed`` milestones, and the number of ``batches`` sent
+    """
+    calendar_id = user_calendar_id(email, transport, db_path)
+    milestones = load_user_milestones(email, db_path)
+    with closing(connect_milestone_db(db_path)) as conn:
+        sync_state = _load_sync_state(conn, email)
+
+    operations = plan_sync(milestones, sync_state)
+    summary = {"inserted": 0, "updated": 0, "deleted": 0, "failed": 0, "batches": 0,
+               "unchanged": len(milestones) - sum(1 for operation in operations if operation["method"] != "delete")}
+
+    synced_at = datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+    pending = operations
+    for attempt in range(2):
+        retries = []
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            results = transport["batch"](calendar_id, batch)
+            summary["batches"] += 1
+
+            saved, removed = [], []
+            for operation, result in zip(batch, results):
+                if result["status"] < 300:
+                    summary[{"insert": "inserted", "update": "updated", "delete": "deleted"}[operation["method"]]] += 1
+                    if operation["method"] == "delete":
+                        removed.append((email, operation["milestone_id"]))
+                    else:
+                        saved.append((email, operation["milestone_id"], result["remote_id"], result.get("etag"),
+                                      operation["fingerprint"], synced_at))
+                elif operation["method"] == "delete" and result["status"] in (404, 410):
+                    # Already gone on the remote side
+                    summary["deleted"] += 1
+                    removed.append((email, operation["milestone_id"]))
+                else:
+                    retry = _retry_operation(operation, result["status"]) if attempt == 0 else None
+                    if retry:
+                        retries.append(retry)
+                    else:
+                        summary["failed"] += 1
+
+            # Record each batch as it completes, so an interrupted sync resumes where it stopped
+            with closing(connect_milestone_db(db_path)) as conn, conn:
+                conn.executemany("INSERT OR REPLACE INTO calendar_sync VALUES (?, ?, ?, ?, ?, ?)", saved)
+                conn.executemany("DELETE FROM calendar_sync WHERE email = ? AND milestone_id = ?", removed)
+
+        if not retries:
+            break
+        pending = retries
+
+    return summary
+
+def google_calendar_transport(service_account_info):
+    """
+    Transport that sends batched requests to the Google Calendar API
+
+    Args:
+        service_account_info (dict): Service account credentials; the account
+            owns each user's calendar and shares it with the user
+
+    Returns:
+        dict: Transport with ``create_calendar`` and ``batch`` callables
+    """
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+    from googleapiclient.errors import HttpError
+
+    credentials = service_account.Credentials.from_service_account_info(service_account_info, scopes=GOOGLE_CALENDAR_SCOPES)
+    service = build("calendar", "v3", credentials=credentials, cache_discovery=False)
+    events = service.events()
+
+    def create_calendar(email, name):
+        calendar_id = service.calendars().insert(body={"summary": name}).execute()["id"]
+        # Share the calendar with its user only, who gets an invite to add it
+        service.acl().insert(
+            calendarId=calendar_id,
+            body={"role": "reader", "scope": {"type": "user", "value": email}},
+            sendNotifications=True
+        ).execute()
+        return calendar_id
+
+    def batch(calendar_id, operations):
+        results = [None] * len(operations)
+
+        def callback(request_id, response, exception):
+            position = int(request_id)
+            if exception is not None:
+                status = exception.resp.status if isinstance(exception, HttpError) else 500
+                results[position] = {"status": status}
+            else:
+                response = response or {}
+                results[position] = {"status": 200, "remote_id": response.get("id"), "etag": response.get("etag")}
+
+        batch_request = service.new_batch_http_request(callback=callback)
+        for position, operation in enumerate(operations):
+            if operation["method"] == "insert":
+                request = events.insert(calendarId=calendar_id, body=operation["event"])
+            elif operation["method"] == "update":
+                request = events.update(calendarId=calendar_id, eventId=operation["remote_id"], body=operation["event"])
+            else:
+                request = events.delete(calendarId=calendar_id, eventId=operation["remote_id"])
+            if operation["etag"]:
+                request.headers["If-Match"] = operation["etag"]
+            batch_request.add(request, request_id=str(position))
+        batch_request.execute()
+        return results
+
+    return {"create_calendar": create_calendar, "batch": batch}
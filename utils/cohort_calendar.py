@@ -0,0 +1,142 @@
+import heapq
+import hmac
+import json
+import os
+from contextlib import closing
+
+import streamlit as st
+
+from utils.milestone_db import (
+    MILESTONE_COLUMNS, MILESTONES_DB_PATH, connect_milestone_db, flush_writes, milestone_from_row
+)
+
+# Cohorts keyed by ID: {"name": ..., "share_token": ..., "members": {email: company name}}
+COHORTS_PATH = "data/cohorts.json"
+
+COHORT_PAGE_SIZE = 25
+
+def load_cohorts():
+    """Load cohort definitions from JSON file if it exists"""
+    try:
+        if os.path.exists(COHORTS_PATH):
+            with open(COHORTS_PATH, "r") as f:
+                return json.load(f)
+        return {}
+    except Exception as e:
+        st.error(f"Error loading cohorts: {e}")
+        return {}
+
+def get_shared_cohort(cohort_id, share_token):
+    """
+    Get a cohort whose calendar is shared with the holder of its share token
+
+    Cohort IDs are easy to guess, so the ID alone never opens a calendar.
+
+    Args:
+        cohort_id (str): Cohort ID from the ``cohort`` query parameter
+        share_token (str): Token from the ``token`` query parameter
+
+    Returns:
+        dict or None: The cohort, or None if it doesn't exist, has no share token or the token doesn't match
+    """
+    cohort = load_cohorts().get(cohort_id)
+    if not cohort or not cohort.get("share_token") or not share_token:
+        return None
+    if not hmac.compare_digest(str(cohort["share_token"]).encode("utf-8"), share_token.encode("utf-8")):
+        return None
+    return cohort
+
+def cohort_sort_key(milestone):
+    """Order of milestones across a cohort: date, then creation time, then ID"""
+    return milestone["date"], milestone["created_at"], milestone["id"]
+
+def page_cursor(milestone):
+    """Position of a milestone in cohort order, as stored in the database"""
+    return (
+        milestone["date"].isoformat(),
+        milestone["created_at"].isoformat(sep=" ", timespec="seconds"),
+        milestone["id"]
+    )
+
+def iter_member_milestones(conn, email, types=None, after=None, limit=None):
+    """
+    Stream one member's milestones in cohort order, reading rows as they are consumed
+
+    Args:
+        conn (sqlite3.Connection): Open milestone database
+        email (str): Member's email
+        types (list, optional): Milestone types to keep, defaults to all; an
+            empty list keeps none
+        after (tuple, optional): Only milestones after this page_cursor
+        limit (int, optional): Most milestones to read
+
+    Yields:
+        dict: Milestones with native dates and the member's ``email``
+    """
+    if types is not None and not types:
+        return
+
+    query = f"SELECT {MILESTONE_COLUMNS} FROM milestones WHERE email = ?"
+    params = [email]
+    if types is not None:
+        query += f" AND type IN ({', '.join('?' * len(types))})"
+        params.extend(types)
+    if after:
+        query += " AND (date, created_at, id) > (?, ?, ?)"
+        params.extend(after)
+    query += " ORDER BY date, created_at, id"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    for row in conn.execute(query, params):
+        milestone = milestone_from_row(row)
+        milestone["email"] = email
+        yield milestone
+
+def merge_milestone_streams(streams):
+    """
+    Lazily k-way merge date-sorted milestone streams with a heap
+
+    Only the head of each stream is held, so taking n milestones from k
+    streams costs O(n log k) without reading or sorting the rest.
+
+    Args:
+        streams (list): Iterables of milestones, each in cohort order
+
+    Returns:
+        iterator: Milestones from every stream in cohort order
+    """
+    return heapq.merge(*streams, key=cohort_sort_key)
+
+def cohort_calendar_page(emails, types=None, after=None, page_size=COHORT_PAGE_SIZE, db_path=MILESTONES_DB_PATH):
+    """
+    Get one page of a cohort's combined calendar
+
+    Pages are addressed by the cursor of the last milestone before them, so
+    each member stream starts at the page with an indexed query and reads at
+    most one page of rows, however deep into the calendar the page is.
+
+    Args:
+        emails (list): Member emails
+        types (list, optional): Milestone types to keep, defaults to all; an
+            empty list keeps none
+        after (tuple, optional): page_cursor of the last milestone of the previous page
+        page_size (int, optional): Milestones per page
+        db_path (str, optional): Path to the milestone database
+
+    Returns:
+        tuple: (milestones on the page, whether more pages follow)
+    """
+    flush_writes(db_path)
+    with closing(connect_milestone_db(db_path)) as conn:
+        streams = [
+            iter_member_milestones(conn, email, types, after, page_size + 1)
+            for email in dict.fromkeys(emails)
+        ]
+        page = []
+        for milestone in merge_milestone_streams(streams):
+            if len(page) == page_size:
+                return page, True
+            page.append(milestone)
+        return page, False
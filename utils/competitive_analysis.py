@@ -1,12 +1,43 @@
+import itertools
 import json
+import logging
 import os
 import random
+import threading
+import numpy as np
 import streamlit as st
+from utils.competitive_enrichment import funding_range
+from utils.competitive_index import (
+    COMPETITIVE_DATA_PATH, bits_from_row_ids, get_competitive_index, range_rows
+)
+from utils.competitive_ranking import rank_row_ids, rank_rows
+from utils.competitive_store import fetch_examples
+from utils.competitive_takeaways import evaluate_takeaways, extract_features
+from utils.industry_matcher import nearest_industries
+from utils.launch_labels import FUNDING_LEVELS, LAUNCH_TYPES, canonical_funding_level, canonical_launch_type
+from utils.launch_search import make_snippet, search_store
+
+# Form answers that describe the founder beyond launch type, funding and industry
+PROFILE_FIELDS = ('primary_goal', 'audience_readiness', 'post_launch_priority')
+
+# Precomputed bundles share one fallback sample, so they use a fixed seed
+BUNDLE_LIMIT = 3
+BUNDLE_SEED = 0
+MAX_BUNDLES = 10000
+
+# Best examples kept per cell for re-ranking against a founder's profile
+PROFILE_SHORTLIST = 50
+
+# Cells and profile bundles for the current index, shared by all sessions
+_bundle_cache = {'index': None, 'cells': {}, 'profiles': {}}
+_bundle_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
 
 def load_competitive_data():
     """Load competitive launch data from JSON file"""
     try:
-        data_path = "data/competitive_launches.json"
+        data_path = COMPETITIVE_DATA_PATH
         if os.path.exists(data_path):
             with open(data_path, "r") as f:
                 return json.load(f)
@@ -16,91 +47,292 @@ def load_competitive_data():
         st.error(f"Error loading competitive data: {e}")
         return None
 
+def load_competitive_index():
+    """Load the cached facet index over the competitive launch data"""
+    try:
+        return get_competitive_index()
+    except Exception as e:
+        st.error(f"Error loading competitive data: {e}")
+        return None
+
 def get_industries():
     """Get list of available industries from the data"""
-    data = load_competitive_data()
-    if data and 'industries' in data:
-        return list(data['industries'].keys())
+    index = load_competitive_index()
+    if index:
+        return list(index['industries'])
     return []
 
-def get_similar_companies(launch_type=None, funding_status=None, industry=None, limit=3):
+def build_founder_profile(form_data):
+    """Join the free-form answers of the founder's form into profile text for ranking"""
+    if not form_data:
+        return ""
+    return " ".join(str(form_data[field]) for field in PROFILE_FIELDS if form_data.get(field))
+
+def get_session_seed():
+    """Get this session's sampling seed, creating it on first use"""
+    seed = st.session_state.get("competitive_seed")
+    if seed is None:
+        seed = random.getrandbits(64)
+        st.session_state.competitive_seed = seed
+    return seed
+
+def resolve_industry(industry, industries=None):
+    """
+    Map an industry, possibly typed as free text, to a known industry
+    
+    Args:
+        industry (str): Industry name or free-text description
+        industries (list, optional): Known industries, defaults to get_industries()
+        
+    Returns:
+        str: Known industry, or None if nothing is close enough
+    """
+    if industries is None:
+        industries = get_industries()
+    if not industry or industry in industries:
+        return industry or None
+    
+    matches = nearest_industries(industry, industries)
+    return matches[0][0] if matches else None
+
+def get_similar_companies(launch_type=None, funding_status=None, industry=None, limit=3, profile=None, seed=None):
     """
     Get similar company examples based on launch type, funding status, and/or industry
     
+    Examples are ranked by relevance to the founder's profile, so the order is
+    stable for the same inputs.
+    
     Args:
         launch_type (str, optional): Type of launch
         funding_status (str, optional): Funding status
         industry (str, optional): Industry category
         limit (int, optional): Maximum number of examples to return
+        profile (str, optional): Extra founder context, e.g. from build_founder_profile
+        seed (int, optional): Seed for the random fallback sample, defaults to the session's
         
     Returns:
         list: List of company examples
     """
-    data = load_competitive_data()
-    if not data:
+    index = load_competitive_index()
+    if not index:
         return []
     
-    # Companies that match criteria
-    matching_companies = set()
+    row_ids = find_similar_rows(index, launch_type, funding_status, industry, limit, profile, seed)
+    return fetch_examples(index['db_path'], row_ids)
+
+def find_similar_rows(index, launch_type=None, funding_status=None, industry=None, limit=3, profile=None, seed=None):
+    """
+    Find the row IDs of similar examples, see get_similar_companies
     
-    # Add companies by launch type
-    if launch_type and launch_type in data.get('launch_types', {}):
-        matching_companies.update(data['launch_types'][launch_type])
+    Returns:
+        list: Ranked row IDs of company examples
+    """
+    candidate_rows, query_text, facet_rows = similar_candidates(index, launch_type, funding_status, industry, profile, seed)
+    return rank_rows(index, candidate_rows, query_text, facet_rows, limit)
+
+def similar_candidates(index, launch_type=None, funding_status=None, industry=None, profile=None, seed=None):
+    """
+    Select the examples eligible as similar companies and what to rank them by
     
-    # Add companies by funding level
-    if funding_status and funding_status in data.get('funding_levels', {}):
-        # If we already have companies by launch type, prioritize intersection
-        if matching_companies:
-            funding_companies = set(data['funding_levels'][funding_status])
-            matching_companies = matching_companies.intersection(funding_companies)
+    Returns:
+        tuple: (bitset of candidate row IDs, query text, facet bitsets)
+    """
+    facets = index['facets']
+    
+    # Bitset of row IDs that match criteria
+    matching_rows = 0
+    
+    # Add rows by launch type
+    if launch_type and launch_type in facets['launch_type']:
+        matching_rows = facets['launch_type'][launch_type]
+    
+    # Add rows by funding level, from the curated list and the parsed funding amount
+    funding_rows = facets['funding'].get(funding_status, 0) if funding_status else 0
+    bounds = funding_range(funding_status)
+    if bounds:
+        funding_rows |= range_rows(index, 'funding_usd', *bounds, include_high=False)
+    if funding_rows:
+        # If we already have rows by launch type, prioritize intersection
+        if matching_rows:
+            matching_rows &= funding_rows
         else:
-            matching_companies.update(data['funding_levels'][funding_status])
+            matching_rows = funding_rows
     
     # Filter by industry if specified
-    industry_companies = []
-    if industry and industry in data.get('industries', {}):
-        industry_examples = data['industries'][industry]['examples']
-        industry_companies = [example['company'] for example in industry_examples]
-        
-        # If we have companies from other filters, prioritize intersection
-        if matching_companies:
-            matching_companies = matching_companies.intersection(set(industry_companies))
+    industry_rows = facets['industry'].get(industry, 0) if industry else 0
+    if industry_rows:
+        # If we have rows from other filters, prioritize intersection
+        if matching_rows:
+            matching_rows &= industry_rows
         else:
-            matching_companies = set(industry_companies)
-    
-    # Get detailed information for matching companies
-    results = []
-    all_examples = []
-    
-    # Collect all examples from all industries
-    for ind, ind_data in data.get('industries', {}).items():
-        if industry and ind != industry:
-            continue
-        all_examples.extend(ind_data['examples'])
-    
-    # Filter to matching companies
-    for example in all_examples:
-        if example['company'] in matching_companies:
-            results.append(example)
-    
-    # If no matches found but industry specified, return random examples from that industry
-    if not results and industry:
-        industry_examples = data['industries'][industry]['examples']
-        # Shuffle to get random selection
-        random.shuffle(industry_examples)
-        results = industry_examples[:limit]
-    
-    # If still no matches, return random examples across all industries
-    if not results:
-        # Collect some random examples from each industry
-        for ind, ind_data in data.get('industries', {}).items():
-            results.extend(random.sample(ind_data['examples'], min(1, len(ind_data['examples']))))
-    
-    # Limit the number of results
-    random.shuffle(results)
-    return results[:limit]
+            matching_rows = industry_rows
+    
+    # Only rows from the requested industry are eligible
+    if industry:
+        matching_rows &= industry_rows
+    
+    # Score examples against everything we know about the founder
+    query_text = " ".join(str(value) for value in (launch_type, funding_status, industry, profile) if value)
+    facet_rows = [
+        bits for bits in (
+            facets['launch_type'].get(launch_type, 0),
+            funding_rows,
+            industry_rows
+        ) if bits
+    ]
+    
+    # If no matches found but industry specified, rank every example from that industry
+    candidate_rows = matching_rows or industry_rows
+    
+    # If still no matches, rank one random example from each industry
+    if not candidate_rows:
+        # A generator per call keeps sampling off shared state and stable across reruns
+        rng = random.Random(f"{get_session_seed() if seed is None else seed}|{launch_type}|{funding_status}|{industry}")
+        candidate_rows = bits_from_row_ids(
+            row_ids[rng.randrange(len(row_ids))]
+            for row_ids in index['industry_row_ids'].values()
+            if row_ids
+        )
+    
+    return candidate_rows, query_text, facet_rows
+
+def search_launches(query, limit=5):
+    """
+    Full-text search over every competitive launch
+    
+    Args:
+        query (str): Free-text query, e.g. "referral programs"
+        limit (int, optional): Maximum number of results
+        
+    Returns:
+        list: Dicts with the matching ``example`` and a highlighted ``snippet``
+    """
+    index = load_competitive_index()
+    if not index or not query or not query.strip():
+        return []
+    
+    hits = search_store(index['db_path'], query, limit)
+    examples = fetch_examples(index['db_path'], [doc_id for doc_id, _ in hits])
+    return [
+        {'example': example, 'snippet': make_snippet(example, query)}
+        for example in examples
+    ]
+
+def _make_bundle(index, row_ids, launch_type, funding_level, examples=None):
+    """Load the examples and takeaways of one bundle, from ``examples`` when already loaded"""
+    if examples is None:
+        companies = fetch_examples(index['db_path'], row_ids)
+    else:
+        companies = [examples[row_id] for row_id in row_ids]
+    return {
+        'companies': companies,
+        'takeaways': generate_row_takeaways(index, row_ids, launch_type, funding_level)
+    }
+
+def _shortlist_cell(index, key):
+    """Rank a cell's candidates without a profile, keeping enough to re-rank for one"""
+    industry, launch_type, funding_level = key
+    candidate_rows, query_text, facet_rows = similar_candidates(
+        index, launch_type, funding_level, industry, seed=BUNDLE_SEED
+    )
+    shortlist = rank_rows(index, candidate_rows, query_text, facet_rows, PROFILE_SHORTLIST)
+    return {'shortlist': shortlist, 'query_text': query_text, 'facet_rows': facet_rows}
+
+def build_competitive_bundles(index):
+    """
+    Precompute ready-to-render cells for every industry x launch type x funding level
+    
+    Args:
+        index (dict): Competitive index
+        
+    Returns:
+        dict: Cells keyed by (industry, launch type, funding level), each with
+        the ``bundle`` shown without a profile and the ``shortlist`` of row IDs
+        re-ranked for founders who have one
+    """
+    cells = {
+        key: _shortlist_cell(index, key)
+        for key in itertools.product([None] + list(index['industries']), (None,) + LAUNCH_TYPES, (None,) + FUNDING_LEVELS)
+    }
+    
+    # Load every example the grid uses in one pass
+    row_ids = sorted({row_id for cell in cells.values() for row_id in cell['shortlist'][:BUNDLE_LIMIT]})
+    examples = dict(zip(row_ids, fetch_examples(index['db_path'], row_ids)))
+    
+    for key, cell in cells.items():
+        cell['bundle'] = _make_bundle(index, cell['shortlist'][:BUNDLE_LIMIT], key[1], key[2], examples)
+    return cells
 
-def display_competitive_analysis(launch_type=None, funding_status=None, selected_industry=None):
+def _warm_bundles(index):
+    """Build the grid for an index and publish it, unless the index was replaced meanwhile"""
+    try:
+        cells = build_competitive_bundles(index)
+    except Exception:
+        logger.exception("Precomputing competitive bundles failed")
+        return
+    with _bundle_lock:
+        if _bundle_cache['index'] is index:
+            _bundle_cache['cells'].update(cells)
+
+def _current_bundles(index):
+    """Get the cell and profile caches of an index, starting the grid build on its first use"""
+    with _bundle_lock:
+        if _bundle_cache['index'] is not index:
+            _bundle_cache['index'] = index
+            _bundle_cache['cells'] = {}
+            _bundle_cache['profiles'] = {}
+            # The grid takes seconds on large datasets, so build it off the request path
+            threading.Thread(target=_warm_bundles, args=(index,), name="competitive-bundles", daemon=True).start()
+        return _bundle_cache['cells'], _bundle_cache['profiles']
+
+def get_competitive_bundle(launch_type=None, funding_status=None, industry=None, profile=None):
+    """
+    Get the similar companies and takeaways for a founder
+    
+    Bundles for the whole industry x launch type x funding level grid are
+    rebuilt in the background whenever the dataset changes; until then each
+    cell is built on first use. A profile re-ranks the cell's shortlist
+    rather than the whole dataset.
+    
+    Args:
+        launch_type (str, optional): Type of launch
+        funding_status (str, optional): Funding status
+        industry (str, optional): Industry category
+        profile (str, optional): Founder profile text used to rank examples
+        
+    Returns:
+        dict: ``companies`` and ``takeaways``, or None if there is no data
+    """
+    index = load_competitive_index()
+    if not index:
+        return None
+    
+    cells, profiles = _current_bundles(index)
+    key = (industry or None, canonical_launch_type(launch_type), canonical_funding_level(funding_status))
+    cell = cells.get(key)
+    if cell is None:
+        cell = _shortlist_cell(index, key)
+        cell['bundle'] = _make_bundle(index, cell['shortlist'][:BUNDLE_LIMIT], key[1], key[2])
+        with _bundle_lock:
+            # Free-text industries add cells beyond the grid, so keep them bounded
+            if len(cells) < MAX_BUNDLES:
+                cells[key] = cell
+    
+    if not profile:
+        return cell['bundle']
+    
+    profile_key = key + (profile,)
+    bundle = profiles.get(profile_key)
+    if bundle is None:
+        row_ids = rank_row_ids(index, cell['shortlist'], f"{cell['query_text']} {profile}", cell['facet_rows'], BUNDLE_LIMIT)
+        bundle = _make_bundle(index, row_ids, key[1], key[2])
+        with _bundle_lock:
+            if len(profiles) >= MAX_BUNDLES:
+                profiles.clear()
+            profiles[profile_key] = bundle
+    return bundle
+
+def display_competitive_analysis(launch_type=None, funding_status=None, selected_industry=None, profile=None):
     """
     Display competitive analysis UI component
     
@@ -108,12 +340,20 @@ def display_competitive_analysis(launch_type=None, funding_status=None, selected
         launch_type (str, optional): Type of launch
         funding_status (str, optional): Funding status
         selected_industry (str, optional): Selected industry
+        profile (str, optional): Founder profile text used to rank examples
     """
     st.markdown("### Competitive Launch Analysis")
     
     # Get available industries
     industries = get_industries()
     
+    # Map free-text industries (from "Other") to the closest known one
+    if selected_industry and selected_industry not in industries:
+        typed_industry = selected_industry
+        selected_industry = resolve_industry(typed_industry, industries)
+        if selected_industry:
+            st.caption(f"Showing examples from {selected_industry}, the closest match to \"{typed_industry}\".")
+    
     # Let user select or change industry
     industry = st.selectbox(
         "Select your industry for more relevant examples:",
@@ -123,13 +363,9 @@ def display_competitive_analysis(launch_type=None, funding_status=None, selected
     
     selected_industry = None if industry == "All Industries" else industry
     
-    # Get similar companies
-    similar_companies = get_similar_companies(
-        launch_type=launch_type,
-        funding_status=funding_status,
-        industry=selected_industry,
-        limit=3
-    )
+    # Get similar companies and takeaways, precomputed for this cell
+    bundle = get_competitive_bundle(launch_type, funding_status, selected_industry, profile)
+    similar_companies = bundle['companies'] if bundle else []
     
     if not similar_companies:
         st.warning("No similar company examples found. Please try a different industry.")
@@ -162,11 +398,25 @@ def display_competitive_analysis(launch_type=None, funding_status=None, selected
                 st.markdown("**Key Insight:**")
                 st.markdown(f"_{company['retrospective_insight']}_")
     
+    # Search across every industry, beyond the selectbox filter
+    query = st.text_input(
+        "Search all launches:",
+        placeholder="E.g., referral programs, waitlist",
+        key="competitive_search_query"
+    )
+    if query:
+        search_results = search_launches(query)
+        if not search_results:
+            st.info("No launches matched your search.")
+        for result in search_results:
+            example = result['example']
+            st.markdown(f"**{example['company']} ({example['launch_year']})**: {result['snippet']}")
+    
     # Add section for key takeaways
     st.markdown("### Key Takeaways from Successful Launches")
     
-    # Generate some smart takeaways based on the examples
-    takeaways = generate_takeaways(similar_companies, launch_type, funding_status)
+    # Smart takeaways based on the examples
+    takeaways = bundle['takeaways']
     
     for i, takeaway in enumerate(takeaways):
         st.markdown(f"**{i+1}. {takeaway['title']}**")
@@ -184,91 +434,23 @@ def generate_takeaways(companies, launch_type, funding_status):
     Returns:
         list: List of takeaway dictionaries
     """
-    takeaways = []
-    
-    # Look for patterns in the examples
-    has_exclusivity = any("invite-only" in company['approach'].lower() or 
-                         "waitlist" in company['approach'].lower() for company in companies)
-    
-    has_content = any("content" in company['approach'].lower() for company in companies)
-    
-    has_community = any("community" in company['approach'].lower() or 
-                       "community" in str(company['key_strategies']).lower() for company in companies)
-    
-    is_bootstrapped = "Bootstrapping" in str(funding_status) if funding_status else False
-    
-    # Generate relevant takeaways
-    if has_exclusivity:
-        takeaways.append({
-            "title": "Controlled Access Creates Demand",
-            "description": "Several successful companies used waitlists or invite systems to create early demand and control quality. Consider an exclusive beta or staged rollout to build anticipation."
-        })
-    
-    if has_content:
-        takeaways.append({
-            "title": "Content Marketing Builds Authority",
-            "description": "Content-first or content-supported launches help establish authority and educate potential customers. Consider how you can use content to showcase your expertise and use case."
-        })
-    
-    if has_community:
-        takeaways.append({
-            "title": "Community-Driven Growth Is Powerful",
-            "description": "Building a community around your product creates evangelists and provides valuable feedback. Consider how to cultivate early adopters into a supportive community."
-        })
-    
-    if is_bootstrapped:
-        takeaways.append({
-            "title": "Resource Constraints Can Drive Focus",
-            "description": "Bootstrapped companies often succeed through extreme focus on a core value proposition. Consider how to create maximum impact with minimal resources."
-        })
-    
-    # Add general takeaways based on launch type
-    if launch_type and "New Startup/Product Launch" in launch_type:
-        takeaways.append({
-            "title": "Simplicity Wins at Launch",
-            "description": "Successful product launches often start with a focused offering rather than numerous features. Consider launching with your 'hero' feature or product that clearly demonstrates your value."
-        })
-    
-    if launch_type and "Brand Repositioning" in launch_type:
-        takeaways.append({
-            "title": "Narrative Is Critical for Repositioning",
-            "description": "Successful rebrand launches clearly articulate the 'why' behind the change. Ensure your narrative connects past to future while highlighting new value."
-        })
-    
-    if launch_type and "Funding Announcement" in launch_type:
-        takeaways.append({
-            "title": "Connect Funding to Customer Benefit",
-            "description": "The most effective funding announcements tie the investment to specific customer benefits. Frame your funding in terms of how it enables you to better serve customers."
-        })
-    
-    if launch_type and "Partnership" in launch_type:
-        takeaways.append({
-            "title": "Mutual Value Must Be Clear",
-            "description": "Successful partnership launches clearly articulate the value to all parties, including customers. Ensure your partnership story explains benefits for everyone involved."
-        })
-    
-    # Ensure we have at least 3 takeaways
-    generic_takeaways = [
-        {
-            "title": "Timing Can Be As Important As Execution",
-            "description": "Many successful launches benefited from timing with market trends or shifts. Consider how your launch aligns with current market conditions and adjust messaging accordingly."
-        },
-        {
-            "title": "Product Experience Drives Word-of-Mouth",
-            "description": "The initial user experience often determines whether users become advocates. Invest in creating memorable moments in your onboarding and core workflows."
-        },
-        {
-            "title": "Clear Positioning Cuts Through Noise",
-            "description": "Companies that articulate a clear, differentiated position tend to gain traction faster. Ensure your launch clearly communicates what makes your offering unique."
-        }
-    ]
-    
-    # Add generic takeaways if needed
-    while len(takeaways) < 3:
-        if not generic_takeaways:
-            break
-        takeaway = generic_takeaways.pop(0)
-        if takeaway not in takeaways:
-            takeaways.append(takeaway)
+    features = 0
+    for company in companies:
+        features |= extract_features(company)
+    return evaluate_takeaways(features, launch_type, funding_status)
+
+def generate_row_takeaways(index, row_ids, launch_type, funding_status):
+    """
+    Generate takeaways for indexed examples from their precomputed features
     
-    return takeaways
\ No newline at end of file
+    Args:
+        index (dict): Competitive index
+        row_ids (list): Row IDs of the examples shown
+        launch_type (str): Type of launch
+        funding_status (str): Funding status
+        
+    Returns:
+        list: List of takeaway dictionaries
+    """
+    features = int(np.bitwise_or.reduce(index['features'][row_ids])) if row_ids else 0
+    return evaluate_takeaways(features, launch_type, funding_status)
@@ -0,0 +1,91 @@
+import re
+
+from utils.competitive_takeaways import extract_features
+from utils.launch_labels import FUNDING_LEVELS, canonical_funding_level
+
+# Amounts like "$1.5M", "$500k" or "$2,000,000"
+_amount_pattern = re.compile(r"\$\s*(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s*([kmb])?", re.IGNORECASE)
+_stage_pattern = re.compile(r"\b(pre-seed|seed|series\s+[a-z])\b", re.IGNORECASE)
+_year_pattern = re.compile(r"\b(19|20)\d{2}\b")
+
+_multipliers = {'k': 1e3, 'm': 1e6, 'b': 1e9}
+
+# Numeric funding range (USD, half-open [low, high)) for each canonical
+# funding level, so fractional amounts never fall between two levels
+FUNDING_LEVEL_RANGES = {
+    FUNDING_LEVELS[0]: (0, 1),
+    FUNDING_LEVELS[1]: (1, 1_000_000),
+    FUNDING_LEVELS[2]: (1_000_000, 3_000_000),
+    FUNDING_LEVELS[3]: (3_000_000, None)
+}
+
+def parse_funding(text):
+    """
+    Parse free-text funding like "Raised $1.5M seed" into amount and stage
+
+    Args:
+        text (str): Funding at launch description
+
+    Returns:
+        tuple: (amount in USD or None, stage or None)
+    """
+    if not text:
+        return None, None
+
+    if "bootstrap" in text.lower():
+        # Money that was declined doesn't count as funding
+        return 0.0, "bootstrapped"
+
+    amount = None
+    amount_match = _amount_pattern.search(text)
+    if amount_match:
+        multiplier = _multipliers.get((amount_match.group(2) or '').lower(), 1)
+        amount = float(amount_match.group(1).replace(",", "")) * multiplier
+
+    stage = None
+    stage_match = _stage_pattern.search(text)
+    if stage_match:
+        stage = " ".join(stage_match.group(1).lower().split())
+
+    return amount, stage
+
+def parse_launch_year(value):
+    """Parse a launch year from an int or a string such as "2013" or "Spring 2013" """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        match = _year_pattern.search(value)
+        if match:
+            return int(match.group(0))
+    return None
+
+def enrich_example(example):
+    """
+    Derive the typed columns stored alongside an example
+
+    Args:
+        example (dict): Competitive launch example
+
+    Returns:
+        dict: ``funding_usd``, ``funding_stage``, ``launch_year`` and the
+        takeaway ``features`` bitmask
+    """
+    funding_usd, funding_stage = parse_funding(example.get('funding_at_launch'))
+    return {
+        'funding_usd': funding_usd,
+        'funding_stage': funding_stage,
+        'launch_year': parse_launch_year(example.get('launch_year')),
+        'features': extract_features(example)
+    }
+
+def funding_range(funding_status):
+    """
+    Map a founder's funding bucket to a numeric USD range
+
+    Args:
+        funding_status (str): Funding bucket, with or without the form's emoji
+
+    Returns:
+        tuple: Half-open (low, high) bounds where None is unbounded, or None if unknown
+    """
+    return FUNDING_LEVEL_RANGES.get(canonical_funding_level(funding_status))
@@ -0,0 +1,166 @@
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from contextlib import closing
+
+import numpy as np
+
+from utils.competitive_ranking import build_text_matrix
+from utils.competitive_store import COMPETITIVE_DB_PATH, connect_store, iter_examples, sync_document
+
+COMPETITIVE_DATA_PATH = "data/competitive_launches.json"
+
+# Typed columns derived at ingest that support range queries
+NUMERIC_COLUMNS = ('funding_usd',)
+
+# Process-wide cache of built indexes, keyed by data path and invalidated on mtime change
+_index_cache = {}
+_index_lock = threading.Lock()
+
+def bits_from_row_ids(row_ids):
+    """
+    Build an integer bitset with bit ``i`` set for every row ID ``i``
+
+    Args:
+        row_ids (iterable): Row IDs to set
+
+    Returns:
+        int: Bitset of the given row IDs
+    """
+    row_ids = list(row_ids)
+    if not row_ids:
+        return 0
+
+    # Fill a byte buffer first so the cost stays linear in the number of rows
+    buffer = bytearray((max(row_ids) >> 3) + 1)
+    for row_id in row_ids:
+        buffer[row_id >> 3] |= 1 << (row_id & 7)
+    return int.from_bytes(buffer, "little")
+
+def build_competitive_index(db_path=COMPETITIVE_DB_PATH):
+    """
+    Build an inverted facet index over the competitive launch store
+
+    Row IDs are the store's launch IDs. Each industry, launch type and funding
+    level maps to a bitset of the row IDs carrying that value, so filtering is
+    a bitwise AND followed by direct row access. Example payloads stay in the
+    store and are loaded with fetch_examples for the rows a query returns.
+
+    Args:
+        db_path (str, optional): Path to the SQLite store
+
+    Returns:
+        dict: Index with ``size`` (one past the largest row ID), ``industries``
+        (in display order), ``industry_row_ids``, ``facets``, sorted
+        ``numeric`` columns, takeaway ``features`` per row and the
+        ``text_matrix`` used for ranking. The
+        index is shared across sessions and must not be mutated.
+    """
+    with closing(connect_store(db_path)) as conn:
+        industries = [name for (name,) in conn.execute("SELECT name FROM industries ORDER BY position")]
+        size = (conn.execute("SELECT MAX(id) FROM launches").fetchone()[0] or 0) + 1
+
+        # Immutable per-industry row IDs let callers sample by position without copying
+        industry_row_ids = {
+            industry: tuple(row_ids)
+            for industry, row_ids in _group_rows(conn.execute("SELECT industry, id FROM launches ORDER BY id")).items()
+        }
+
+        facets = {
+            'industry': {
+                industry: bits_from_row_ids(row_ids)
+                for industry, row_ids in industry_row_ids.items()
+            },
+            'launch_type': _facet_bits(conn.execute("SELECT launch_type, launch_id FROM launch_types")),
+            'funding': _facet_bits(conn.execute(
+                "SELECT funding_bucket, id FROM launches WHERE funding_bucket IS NOT NULL"
+            ))
+        }
+
+        # Typed columns as parallel sorted arrays of values and row IDs for bisect range queries
+        numeric = {}
+        for column in NUMERIC_COLUMNS:
+            pairs = conn.execute(
+                f"SELECT {column}, id FROM launches WHERE {column} IS NOT NULL ORDER BY {column}, id"
+            ).fetchall()
+            numeric[column] = ([value for value, _ in pairs], [row_id for _, row_id in pairs])
+        text_matrix = build_text_matrix(iter_examples(conn), size)
+
+        # Takeaway feature bitmask per row, extracted at ingest
+        features = np.zeros(size, dtype=np.int64)
+        for row_id, row_features in conn.execute("SELECT id, features FROM launches"):
+            features[row_id] = row_features
+
+    return {
+        # Absolute, so background work on the index doesn't depend on the working directory
+        'db_path': os.path.abspath(db_path),
+        'size': size,
+        'industries': industries,
+        'industry_row_ids': industry_row_ids,
+        'facets': facets,
+        'numeric': numeric,
+        'features': features,
+        'text_matrix': text_matrix
+    }
+
+def range_rows(index, column, low=None, high=None, include_high=True):
+    """
+    Find the rows whose typed column falls in a range
+
+    Args:
+        index (dict): Competitive index
+        column (str): One of NUMERIC_COLUMNS
+        low (float, optional): Inclusive lower bound, unbounded if None
+        high (float, optional): Upper bound, unbounded if None
+        include_high (bool, optional): Whether ``high`` itself matches; False
+            for half-open ranges such as FUNDING_LEVEL_RANGES
+
+    Returns:
+        int: Bitset of matching row IDs
+    """
+    values, row_ids = index['numeric'][column]
+    start = 0 if low is None else bisect_left(values, low)
+    if high is None:
+        stop = len(values)
+    else:
+        stop = bisect_right(values, high) if include_high else bisect_left(values, high)
+    return bits_from_row_ids(row_ids[start:stop])
+
+def _group_rows(value_rows):
+    """Group ``(value, row_id)`` pairs into a list of row IDs per value"""
+    grouped = {}
+    for value, row_id in value_rows:
+        grouped.setdefault(value, []).append(row_id)
+    return grouped
+
+def _facet_bits(value_rows):
+    """Group ``(value, row_id)`` pairs into a bitset per value"""
+    return {value: bits_from_row_ids(row_ids) for value, row_ids in _group_rows(value_rows).items()}
+
+def get_competitive_index(data_path=COMPETITIVE_DATA_PATH, db_path=COMPETITIVE_DB_PATH):
+    """
+    Get the cached competitive index, rebuilding it when the store changes
+
+    The JSON document is re-imported into the store first if it was edited
+    since the last import.
+
+    Args:
+        data_path (str, optional): Path to the competitive launch JSON file
+        db_path (str, optional): Path to the SQLite store
+
+    Returns:
+        dict: Competitive index, or None if there is no data
+    """
+    with _index_lock:
+        sync_document(data_path, db_path)
+        if not os.path.exists(db_path):
+            return None
+
+        mtime = os.path.getmtime(db_path)
+        cached = _index_cache.get(db_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        index = build_competitive_index(db_path)
+        _index_cache[db_path] = (mtime, index)
+        return index
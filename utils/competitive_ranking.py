@@ -0,0 +1,215 @@
+import math
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+
+# Terms are hashed into 2**18 buckets, which keeps collisions rare for short launch write-ups
+HASH_BITS = 18
+HASH_MASK = (1 << HASH_BITS) - 1
+
+# Score added for each facet (launch type, funding, industry) an example matches
+FACET_WEIGHT = 0.5
+
+RANKED_FIELDS = ('approach', 'key_strategies', 'notable_tactics')
+
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have',
+    'in', 'into', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'their',
+    'this', 'to', 'vs', 'was', 'we', 'were', 'while', 'with', 'you', 'your'
+])
+
+_token_pattern = re.compile(r"[a-z0-9$][a-z0-9$+\-]*")
+
+def tokenize(text):
+    """Split text into lowercase word tokens, dropping stop words"""
+    return [token for token in _token_pattern.findall(text.lower()) if token not in STOP_WORDS]
+
+def hashed_terms(text):
+    """
+    Hash the unigrams and bigrams of a text into feature buckets
+
+    Args:
+        text (str): Text to featurize
+
+    Returns:
+        Counter: Term frequency per hash bucket
+    """
+    tokens = tokenize(text)
+    terms = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    # crc32 is stable across processes, unlike the built-in hash()
+    return Counter(zlib.crc32(term.encode("utf-8")) & HASH_MASK for term in terms)
+
+def example_text(example):
+    """Join the text fields of an example that are used for ranking"""
+    parts = []
+    for field in RANKED_FIELDS:
+        value = example.get(field) or ''
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value)
+        else:
+            parts.append(str(value))
+    return " ".join(parts)
+
+def build_text_matrix(examples, size):
+    """
+    Vectorize example text into an L2-normalized TF-IDF matrix
+
+    The matrix is stored in CSR form (``indptr``, ``indices``, ``data``) so
+    memory grows with the number of terms rather than rows x buckets.
+
+    Args:
+        examples (iterable): ``(row_id, example)`` pairs in ascending row ID order
+        size (int): Number of matrix rows; row IDs without an example stay empty
+
+    Returns:
+        dict: CSR arrays plus the ``idf`` weight of every bucket
+    """
+    indptr = [0]
+    indices = []
+    counts = []
+    documents = 0
+    for row_id, example in examples:
+        # Leave empty rows for IDs that have no example
+        indptr.extend([len(indices)] * (row_id - len(indptr) + 1))
+        terms = hashed_terms(example_text(example))
+        indices.extend(terms.keys())
+        counts.extend(terms.values())
+        indptr.append(len(indices))
+        documents += 1
+    indptr.extend([len(indices)] * (size + 1 - len(indptr)))
+
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.float32)
+
+    document_frequency = np.bincount(indices, minlength=HASH_MASK + 1)
+    idf = (np.log((1.0 + documents) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+
+    data = (1.0 + np.log(counts)) * idf[indices] if len(indices) else counts
+    norms = np.sqrt(_row_sums(data * data, indptr))
+    norms[norms == 0] = 1.0
+    data = (data / np.repeat(norms, np.diff(indptr))).astype(np.float32)
+
+    return {
+        'indptr': indptr,
+        'indices': indices,
+        'data': data,
+        'idf': idf
+    }
+
+def _row_sums(values, indptr):
+    """Sum CSR values per row, returning 0 for empty rows"""
+    if len(indptr) < 2:
+        return np.zeros(0, dtype=np.float32)
+
+    # Pad so reduceat offsets of trailing empty rows stay in bounds
+    padded = np.append(values, np.float32(0))
+    sums = np.add.reduceat(padded, indptr[:-1])
+    sums[np.diff(indptr) == 0] = 0
+    return sums
+
+def vectorize_query(text, idf):
+    """
+    Vectorize a query into a dense, L2-normalized TF-IDF vector
+
+    Args:
+        text (str): Query text, e.g. the founder's profile
+        idf (numpy.ndarray): Bucket weights from ``build_text_matrix``
+
+    Returns:
+        numpy.ndarray: Query vector, all zeros if the text has no terms
+    """
+    vector = np.zeros(HASH_MASK + 1, dtype=np.float32)
+    terms = hashed_terms(text or '')
+    if not terms:
+        return vector
+
+    buckets = np.fromiter(terms.keys(), dtype=np.int64, count=len(terms))
+    frequencies = np.fromiter(terms.values(), dtype=np.float32, count=len(terms))
+    vector[buckets] = (1.0 + np.log(frequencies)) * idf[buckets]
+
+    norm = math.sqrt(float(np.dot(vector[buckets], vector[buckets])))
+    if norm:
+        vector[buckets] /= norm
+    return vector
+
+def text_scores(matrix, query_vector):
+    """Cosine similarity of every row against a query vector (one sparse mat-vec)"""
+    return _row_sums(matrix['data'] * query_vector[matrix['indices']], matrix['indptr'])
+
+def bits_to_mask(bits, size):
+    """Expand an integer bitset of row IDs into a boolean array of length ``size``"""
+    if size == 0:
+        return np.zeros(0, dtype=bool)
+
+    packed = np.frombuffer(bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(packed, bitorder="little", count=size).astype(bool)
+
+def rank_rows(index, candidate_rows, query_text, facet_rows=(), limit=3):
+    """
+    Rank candidate rows by text relevance plus facet matches
+
+    Args:
+        index (dict): Competitive index with a ``text_matrix``
+        candidate_rows (int): Bitset of row IDs eligible for the result
+        query_text (str): Founder profile text to score against
+        facet_rows (iterable, optional): Bitsets of the facets the founder selected
+        limit (int, optional): Number of rows to return
+
+    Returns:
+        list: Up to ``limit`` row IDs, best first with ties broken by row ID
+    """
+    size = index['size']
+    candidates = bits_to_mask(candidate_rows, size)
+    count = min(limit, int(candidates.sum()))
+    if count <= 0:
+        return []
+
+    matrix = index['text_matrix']
+    scores = text_scores(matrix, vectorize_query(query_text, matrix['idf']))
+    for bits in facet_rows:
+        scores += FACET_WEIGHT * bits_to_mask(bits, size)
+    scores[~candidates] = -np.inf
+
+    top = np.argpartition(-scores, count - 1)[:count]
+    order = np.lexsort((top, -scores[top]))
+    return top[order].tolist()
+
+def rank_row_ids(index, row_ids, query_text, facet_rows=(), limit=3):
+    """
+    Rank a short list of rows, scoring only those rows
+
+    Scores match rank_rows, so re-ranking a shortlist from rank_rows with a
+    longer query costs a few rows rather than a pass over the whole matrix.
+
+    Args:
+        index (dict): Competitive index with a ``text_matrix``
+        row_ids (list): Row IDs eligible for the result
+        query_text (str): Founder profile text to score against
+        facet_rows (iterable, optional): Bitsets of the facets the founder selected
+        limit (int, optional): Number of rows to return
+
+    Returns:
+        list: Up to ``limit`` row IDs, best first with ties broken by row ID
+    """
+    if not row_ids or limit <= 0:
+        return []
+
+    matrix = index['text_matrix']
+    row_ids = np.asarray(row_ids, dtype=np.int64)
+    starts = matrix['indptr'][row_ids]
+    lengths = matrix['indptr'][row_ids + 1] - starts
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    # Positions of every stored term of the selected rows, row after row
+    positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+    query_vector = vectorize_query(query_text, matrix['idf'])
+    values = matrix['data'][positions] * query_vector[matrix['indices'][positions]]
+    scores = _row_sums(values, offsets)
+    for bits in facet_rows:
+        scores += FACET_WEIGHT * np.array([(bits >> int(row_id)) & 1 for row_id in row_ids], dtype=np.float32)
+
+    order = np.lexsort((row_ids, -scores))[:limit]
+    return row_ids[order].tolist()
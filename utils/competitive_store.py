@@ -0,0 +1,397 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import closing
+
+from utils.competitive_enrichment import enrich_example
+
+COMPETITIVE_DB_PATH = "data/competitive_launches.db"
+
+# Rows imported from the hand-edited JSON document are tagged with this source
+DOCUMENT_SOURCE = "json"
+
+# Records are inserted in batches so bulk imports stream with bounded memory
+BATCH_SIZE = 1000
+
+# Ingestion fields that describe where an example belongs rather than the example itself
+RECORD_FIELDS = ('industry', 'launch_types', 'funding_level')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS industries (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS launches (
+    id INTEGER PRIMARY KEY,
+    company TEXT NOT NULL,
+    industry TEXT NOT NULL,
+    funding_bucket TEXT,
+    launch_year INTEGER,
+    source TEXT NOT NULL,
+    example TEXT NOT NULL,
+    funding_usd REAL,
+    funding_stage TEXT,
+    features INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS launch_types (
+    launch_id INTEGER NOT NULL,
+    launch_type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Columns computed by enrich_example, added to older stores on connect
+DERIVED_COLUMNS = (
+    ('funding_usd', 'REAL'),
+    ('funding_stage', 'TEXT'),
+    ('features', 'INTEGER NOT NULL DEFAULT 0')
+)
+
+# Bump when enrich_example changes, so stored derived columns are recomputed
+DERIVED_VERSION = "2"
+
+# Created after migrations so indexes on added columns don't fail on older stores
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_launches_industry ON launches (industry);
+CREATE INDEX IF NOT EXISTS idx_launches_funding_bucket ON launches (funding_bucket);
+CREATE INDEX IF NOT EXISTS idx_launches_launch_year ON launches (launch_year, id);
+CREATE INDEX IF NOT EXISTS idx_launches_funding_usd ON launches (funding_usd, id);
+CREATE INDEX IF NOT EXISTS idx_launches_source ON launches (source);
+CREATE INDEX IF NOT EXISTS idx_launch_types_launch_type ON launch_types (launch_type, launch_id);
+CREATE INDEX IF NOT EXISTS idx_launch_types_launch_id ON launch_types (launch_id);
+"""
+
+# Stores whose schema and migrations already ran in this process
+_prepared_stores = set()
+
+# Signature of the document each store was last synced with in this process,
+# so unchanged documents are detected without opening the store
+_synced_signatures = {}
+
+_prepare_lock = threading.Lock()
+
+def connect_store(db_path=COMPETITIVE_DB_PATH):
+    """Open the competitive launch store, creating or migrating the schema once per process"""
+    key = os.path.abspath(db_path)
+    # A store deleted since it was prepared is created again
+    prepared = key in _prepared_stores and os.path.exists(db_path)
+    conn = sqlite3.connect(db_path)
+    if not prepared:
+        with _prepare_lock:
+            conn.executescript(SCHEMA)
+            _add_derived_columns(conn)
+            conn.executescript(INDEXES)
+            _prepared_stores.add(key)
+    return conn
+
+def _add_derived_columns(conn):
+    """Add derived columns to older stores, and recompute them when their derivation changed"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(launches)")}
+    missing = [(name, definition) for name, definition in DERIVED_COLUMNS if name not in columns]
+    version = conn.execute("SELECT value FROM store_meta WHERE key = 'derived_version'").fetchone()
+    if not missing and version and version[0] == DERIVED_VERSION:
+        return
+
+    with conn:
+        for name, definition in missing:
+            conn.execute(f"ALTER TABLE launches ADD COLUMN {name} {definition}")
+
+        last_id = 0
+        while True:
+            batch = conn.execute(
+                "SELECT id, example FROM launches WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, BATCH_SIZE)
+            ).fetchall()
+            if not batch:
+                break
+            updates = []
+            for row_id, example in batch:
+                derived = enrich_example(json.loads(example))
+                updates.append((
+                    derived['funding_usd'], derived['funding_stage'], derived['launch_year'],
+                    derived['features'], row_id
+                ))
+            conn.executemany(
+                "UPDATE launches SET funding_usd = ?, funding_stage = ?, launch_year = ?, features = ? "
+                "WHERE id = ?",
+                updates
+            )
+            last_id = batch[-1][0]
+
+        conn.execute(
+            "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('derived_version', ?)",
+            (DERIVED_VERSION,)
+        )
+
+def iter_document_records(data):
+    """
+    Flatten the legacy competitive launch JSON document into ingestion records
+
+    Args:
+        data (dict): Parsed competitive launch document
+
+    Yields:
+        dict: Example fields plus ``industry``, ``launch_types`` and ``funding_level``
+    """
+    # Launch types and funding levels reference companies by name
+    company_launch_types = {}
+    for launch_type, companies in data.get('launch_types', {}).items():
+        for company in companies:
+            company_launch_types.setdefault(company, []).append(launch_type)
+
+    company_funding = {}
+    for funding_level, companies in data.get('funding_levels', {}).items():
+        for company in companies:
+            company_funding.setdefault(company, funding_level)
+
+    for industry, industry_data in data.get('industries', {}).items():
+        for example in industry_data.get('examples', []):
+            record = dict(example)
+            record['industry'] = industry
+            record['launch_types'] = company_launch_types.get(example['company'], [])
+            record['funding_level'] = company_funding.get(example['company'])
+            yield record
+
+def iter_jsonl_records(lines):
+    """
+    Parse ingestion records from JSON Lines, one example per line
+
+    Args:
+        lines (iterable): Lines of a JSONL file
+
+    Yields:
+        dict: Parsed record
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if not record.get('company') or not record.get('industry'):
+            raise ValueError(f"Line {line_number}: records need a 'company' and an 'industry'")
+        yield record
+
+def ingest_records(conn, records, source):
+    """
+    Insert ingestion records into the store in batches
+
+    Args:
+        conn (sqlite3.Connection): Open store connection
+        records (iterable): Records from iter_jsonl_records or iter_document_records
+        source (str): Source tag stored with each row
+
+    Returns:
+        int: Number of records inserted
+    """
+    known_industries = {name for (name,) in conn.execute("SELECT name FROM industries")}
+    count = 0
+    batch = []
+
+    with conn:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                count += _insert_batch(conn, batch, source, known_industries)
+                batch = []
+        if batch:
+            count += _insert_batch(conn, batch, source, known_industries)
+
+    return count
+
+def _insert_batch(conn, batch, source, known_industries):
+    """Insert one batch of records and their launch types"""
+    launch_type_rows = []
+    for record in batch:
+        industry = record['industry']
+        if industry not in known_industries:
+            conn.execute(
+                "INSERT INTO industries (name, position) VALUES (?, (SELECT COUNT(*) FROM industries))",
+                (industry,)
+            )
+            known_industries.add(industry)
+
+        example = {key: value for key, value in record.items() if key not in RECORD_FIELDS}
+        derived = enrich_example(example)
+        cursor = conn.execute(
+            "INSERT INTO launches (company, industry, funding_bucket, launch_year, source, example, "
+            "funding_usd, funding_stage, features) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record['company'],
+                industry,
+                record.get('funding_level'),
+                derived['launch_year'],
+                source,
+                json.dumps(example),
+                derived['funding_usd'],
+                derived['funding_stage'],
+                derived['features']
+            )
+        )
+        launch_type_rows.extend((cursor.lastrowid, launch_type) for launch_type in record.get('launch_types') or [])
+
+    conn.executemany("INSERT INTO launch_types (launch_id, launch_type) VALUES (?, ?)", launch_type_rows)
+    return len(batch)
+
+def delete_source(conn, source):
+    """Delete every row that was ingested from a source"""
+    with conn:
+        conn.execute(
+            "DELETE FROM launch_types WHERE launch_id IN (SELECT id FROM launches WHERE source = ?)",
+            (source,)
+        )
+        conn.execute("DELETE FROM launches WHERE source = ?", (source,))
+
+def import_document(conn, data):
+    """
+    Replace the rows from the JSON document with its current contents
+
+    Industries keep the document's order, followed by any industries that
+    only exist in bulk-imported sources.
+
+    Args:
+        conn (sqlite3.Connection): Open store connection
+        data (dict): Parsed competitive launch document
+
+    Returns:
+        int: Number of examples imported
+    """
+    delete_source(conn, DOCUMENT_SOURCE)
+
+    with conn:
+        other_industries = [
+            name for (name,) in conn.execute(
+                "SELECT industry FROM launches GROUP BY industry ORDER BY MIN(id)"
+            )
+        ]
+        conn.execute("DELETE FROM industries")
+        ordered = list(data.get('industries', {}).keys())
+        ordered.extend(name for name in other_industries if name not in ordered)
+        conn.executemany(
+            "INSERT INTO industries (name, position) VALUES (?, ?)",
+            [(name, position) for position, name in enumerate(ordered)]
+        )
+
+    return ingest_records(conn, iter_document_records(data), DOCUMENT_SOURCE)
+
+def document_signature(data_path):
+    """Modification time and size of the JSON document, to tell whether it changed"""
+    stat = os.stat(data_path)
+    return json.dumps([stat.st_mtime_ns, stat.st_size])
+
+def _record_document_signature(conn, signature):
+    """Remember the signature of the document the store was last imported from"""
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('document_signature', ?)",
+            (signature,)
+        )
+
+def sync_document(data_path, db_path=COMPETITIVE_DB_PATH):
+    """
+    Re-import the JSON document when it changed since it was last imported
+
+    The document's modification time and size are stored with the import,
+    so writes to the store itself (such as bulk ingests) don't hide later
+    edits to the document. The last signature seen is also kept in process,
+    so an unchanged document costs one stat call.
+
+    Args:
+        data_path (str): Path to the competitive launch JSON file
+        db_path (str, optional): Path to the SQLite store
+
+    Returns:
+        bool: True if the document was imported
+    """
+    if not os.path.exists(data_path):
+        return False
+
+    signature = document_signature(data_path)
+    key = (os.path.abspath(data_path), os.path.abspath(db_path))
+    if _synced_signatures.get(key) == signature and os.path.exists(db_path):
+        return False
+
+    with closing(connect_store(db_path)) as conn:
+        stored = conn.execute("SELECT value FROM store_meta WHERE key = 'document_signature'").fetchone()
+        imported = not (stored and stored[0] == signature)
+        if imported:
+            with open(data_path, "r") as f:
+                data = json.load(f)
+            import_document(conn, data)
+            _record_document_signature(conn, signature)
+    _synced_signatures[key] = signature
+    return imported
+
+def fetch_examples(db_path, row_ids):
+    """
+    Load examples by row ID
+
+    Args:
+        db_path (str): Path to the SQLite store
+        row_ids (list): Row IDs to load
+
+    Returns:
+        list: Examples in the order of ``row_ids``
+    """
+    if not row_ids:
+        return []
+
+    found = {}
+    with closing(sqlite3.connect(db_path)) as conn:
+        # Stay well under SQLite's bound parameter limit
+        for start in range(0, len(row_ids), 500):
+            chunk = row_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(conn.execute(
+                f"SELECT id, example FROM launches WHERE id IN ({placeholders})", chunk
+            ))
+    return [json.loads(found[row_id]) for row_id in row_ids if row_id in found]
+
+def iter_examples(conn):
+    """Stream ``(row_id, example)`` pairs in row ID order"""
+    for row_id, example in conn.execute("SELECT id, example FROM launches ORDER BY id"):
+        yield row_id, json.loads(example)
+
+def main(argv=None):
+    """Command line entry point for bulk imports into the competitive launch store"""
+    parser = argparse.ArgumentParser(description="Manage the competitive launch store")
+    parser.add_argument("--db", default=COMPETITIVE_DB_PATH, help="Path to the SQLite store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Stream a JSONL file of examples into the store")
+    ingest_parser.add_argument("path", help="JSONL file to import, or - for stdin")
+    ingest_parser.add_argument("--source", help="Source tag for the rows (defaults to the file name)")
+    ingest_parser.add_argument("--replace", action="store_true", help="Delete earlier rows from the same source first")
+
+    document_parser = subparsers.add_parser("import-json", help="Import a competitive launch JSON document")
+    document_parser.add_argument("path", help="JSON document to import")
+
+    args = parser.parse_args(argv)
+
+    with closing(connect_store(args.db)) as conn:
+        if args.command == "ingest":
+            source = args.source or ("stdin" if args.path == "-" else os.path.basename(args.path))
+            if source == DOCUMENT_SOURCE:
+                parser.error(f"'{DOCUMENT_SOURCE}' is reserved for the JSON document")
+            if args.replace:
+                delete_source(conn, source)
+            if args.path == "-":
+                count = ingest_records(conn, iter_jsonl_records(sys.stdin), source)
+            else:
+                with open(args.path, "r") as f:
+                    count = ingest_records(conn, iter_jsonl_records(f), source)
+        else:
+            signature = document_signature(args.path)
+            with open(args.path, "r") as f:
+                count = import_document(conn, json.load(f))
+            _record_document_signature(conn, signature)
+
+    print(f"Imported {count} examples into {args.db}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import re
+
+# Keyword features extracted from each example at ingest, with the fields they are looked for in
+TAKEAWAY_FEATURES = {
+    'exclusivity': {'keywords': ('invite-only', 'waitlist'), 'fields': ('approach',)},
+    'content': {'keywords': ('content',), 'fields': ('approach',)},
+    'community': {'keywords': ('community',), 'fields': ('approach', 'key_strategies')}
+}
+
+FEATURE_BITS = {name: 1 << position for position, name in enumerate(TAKEAWAY_FEATURES)}
+
+# Each rule fires when the examples carry its feature, or when the founder's
+# launch type or funding status contains its marker. Rules are checked in order.
+TAKEAWAY_RULES = (
+    {
+        "feature": "exclusivity",
+        "title": "Controlled Access Creates Demand",
+        "description": "Several successful companies used waitlists or invite systems to create early demand and control quality. Consider an exclusive beta or staged rollout to build anticipation."
+    },
+    {
+        "feature": "content",
+        "title": "Content Marketing Builds Authority",
+        "description": "Content-first or content-supported launches help establish authority and educate potential customers. Consider how you can use content to showcase your expertise and use case."
+    },
+    {
+        "feature": "community",
+        "title": "Community-Driven Growth Is Powerful",
+        "description": "Building a community around your product creates evangelists and provides valuable feedback. Consider how to cultivate early adopters into a supportive community."
+    },
+    {
+        "funding_status": "Bootstrapping",
+        "title": "Resource Constraints Can Drive Focus",
+        "description": "Bootstrapped companies often succeed through extreme focus on a core value proposition. Consider how to create maximum impact with minimal resources."
+    },
+    {
+        "launch_type": "New Startup/Product Launch",
+        "title": "Simplicity Wins at Launch",
+        "description": "Successful product launches often start with a focused offering rather than numerous features. Consider launching with your 'hero' feature or product that clearly demonstrates your value."
+    },
+    {
+        "launch_type": "Brand Repositioning",
+        "title": "Narrative Is Critical for Repositioning",
+        "description": "Successful rebrand launches clearly articulate the 'why' behind the change. Ensure your narrative connects past to future while highlighting new value."
+    },
+    {
+        "launch_type": "Funding Announcement",
+        "title": "Connect Funding to Customer Benefit",
+        "description": "The most effective funding announcements tie the investment to specific customer benefits. Frame your funding in terms of how it enables you to better serve customers."
+    },
+    {
+        "launch_type": "Partnership",
+        "title": "Mutual Value Must Be Clear",
+        "description": "Successful partnership launches clearly articulate the value to all parties, including customers. Ensure your partnership story explains benefits for everyone involved."
+    }
+)
+
+# Used in order to make sure there are at least MIN_TAKEAWAYS
+GENERIC_TAKEAWAYS = (
+    {
+        "title": "Timing Can Be As Important As Execution",
+        "description": "Many successful launches benefited from timing with market trends or shifts. Consider how your launch aligns with current market conditions and adjust messaging accordingly."
+    },
+    {
+        "title": "Product Experience Drives Word-of-Mouth",
+        "description": "The initial user experience often determines whether users become advocates. Invest in creating memorable moments in your onboarding and core workflows."
+    },
+    {
+        "title": "Clear Positioning Cuts Through Noise",
+        "description": "Companies that articulate a clear, differentiated position tend to gain traction faster. Ensure your launch clearly communicates what makes your offering unique."
+    }
+)
+
+MIN_TAKEAWAYS = 3
+
+def _compile_field_matchers():
+    """Compile one alternation per field that finds every feature keyword in a single pass"""
+    keyword_bits = {}
+    for name, feature in TAKEAWAY_FEATURES.items():
+        for field in feature['fields']:
+            for keyword in feature['keywords']:
+                field_bits = keyword_bits.setdefault(field, {})
+                field_bits[keyword] = field_bits.get(keyword, 0) | FEATURE_BITS[name]
+
+    matchers = {}
+    for field, bits in keyword_bits.items():
+        # Longest keywords first so a keyword never shadows a longer one it prefixes
+        alternation = "|".join(re.escape(keyword) for keyword in sorted(bits, key=len, reverse=True))
+        matchers[field] = (re.compile(alternation, re.IGNORECASE), bits)
+    return matchers
+
+def _compile_rules():
+    """Resolve rule feature names to bits once, at import"""
+    return [
+        (
+            FEATURE_BITS.get(rule.get('feature'), 0),
+            rule.get('launch_type'),
+            rule.get('funding_status'),
+            {"title": rule['title'], "description": rule['description']}
+        )
+        for rule in TAKEAWAY_RULES
+    ]
+
+_field_matchers = _compile_field_matchers()
+_compiled_rules = _compile_rules()
+
+def extract_features(example):
+    """
+    Extract the takeaway feature bitmask of an example
+
+    Args:
+        example (dict): Competitive launch example
+
+    Returns:
+        int: OR of FEATURE_BITS for every feature whose keywords appear
+    """
+    features = 0
+    for field, (pattern, keyword_bits) in _field_matchers.items():
+        value = example.get(field) or ''
+        text = "\n".join(str(item) for item in value) if isinstance(value, list) else str(value)
+        for match in pattern.finditer(text):
+            features |= keyword_bits[match.group(0).lower()]
+    return features
+
+def evaluate_takeaways(features, launch_type=None, funding_status=None):
+    """
+    Evaluate the takeaway rules against combined example features
+
+    Args:
+        features (int): OR of the feature bitmasks of the examples shown
+        launch_type (str, optional): Type of launch
+        funding_status (str, optional): Funding status
+
+    Returns:
+        list: List of takeaway dictionaries
+    """
+    takeaways = []
+    for bit, launch_marker, funding_marker, takeaway in _compiled_rules:
+        if (bit and features & bit) or \
+                (launch_marker and launch_type and launch_marker in launch_type) or \
+                (funding_marker and funding_status and funding_marker in str(funding_status)):
+            takeaways.append(dict(takeaway))
+
+    for takeaway in GENERIC_TAKEAWAYS:
+        if len(takeaways) >= MIN_TAKEAWAYS:
+            break
+        if takeaway not in takeaways:
+            takeaways.append(dict(takeaway))
+
+    return takeaways
@@ -0,0 +1,270 @@
+import datetime
+import email
+import hashlib
+import json
+import logging
+import smtplib
+import sqlite3
+import threading
+from contextlib import closing
+
+from utils.email_sender import SMTP_POOL_SIZE, authentication_help, send_pooled
+
+OUTBOX_DB_PATH = "data/outbox.db"
+
+# One worker per pooled connection
+OUTBOX_WORKERS = SMTP_POOL_SIZE
+
+# Retry delays double from RETRY_BASE_SECONDS up to RETRY_MAX_SECONDS; emails
+# still failing after MAX_SEND_ATTEMPTS move to the dead-letter table
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+MAX_SEND_ATTEMPTS = 6
+
+# An email being sent by a worker that died becomes due again after this long
+SEND_LEASE_SECONDS = 120
+
+# Longest a worker sleeps between checks for due emails
+MAX_SLEEP_SECONDS = 600
+
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    idempotency_key TEXT PRIMARY KEY,
+    recipient TEXT NOT NULL,
+    message BLOB NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TEXT NOT NULL,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    sent_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    idempotency_key TEXT PRIMARY KEY,
+    recipient TEXT NOT NULL,
+    message BLOB NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    failed_at TEXT NOT NULL
+);
+"""
+
+logger = logging.getLogger(__name__)
+
+# Set when an email is queued, so sleeping workers pick it up right away
+_outbox_changed = threading.Event()
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+def _timestamp(value):
+    """Format a datetime the way outbox times are stored, so they sort as text"""
+    return value.isoformat(sep=" ", timespec="seconds")
+
+def connect_outbox_db(db_path=OUTBOX_DB_PATH):
+    """
+    Open the outbox database in WAL mode, creating it if needed
+
+    Args:
+        db_path (str, optional): Path to the SQLite database
+
+    Returns:
+        sqlite3.Connection: Open connection
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(OUTBOX_SCHEMA)
+    return conn
+
+def plan_idempotency_key(recipient_email, plan):
+    """
+    Key identifying one plan sent to one recipient
+
+    Args:
+        recipient_email (str): Recipient's email address
+        plan (dict): The generated launch plan
+
+    Returns:
+        str: Hex digest of the recipient and the plan's contents
+    """
+    digest = hashlib.sha256(recipient_email.strip().lower().encode("utf-8"))
+    digest.update(json.dumps(plan, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+def queue_email(msg, idempotency_key, db_path=OUTBOX_DB_PATH):
+    """
+    Durably queue an email, unless one with the same key is already queued or sent
+
+    An email that was dead-lettered is queued again, so users can retry.
+
+    Args:
+        msg (email.message.Message): Email to send
+        idempotency_key (str): Key of the email, e.g. from plan_idempotency_key
+        db_path (str, optional): Path to the outbox database
+
+    Returns:
+        bool: True if the email was queued, False if it was a duplicate
+    """
+    now = _timestamp(datetime.datetime.now())
+    with closing(connect_outbox_db(db_path)) as conn, conn:
+        conn.execute("DELETE FROM dead_letters WHERE idempotency_key = ?", (idempotency_key,))
+        queued = conn.execute(
+            "INSERT OR IGNORE INTO outbox (idempotency_key, recipient, message, status, next_attempt_at, created_at) "
+            "VALUES (?, ?, ?, 'queued', ?, ?)",
+            (idempotency_key, msg["To"], msg.as_bytes(), now, now)
+        ).rowcount == 1
+    start_outbox_workers(db_path)
+    _outbox_changed.set()
+    return queued
+
+def delivery_status(idempotency_key, db_path=OUTBOX_DB_PATH):
+    """
+    Get the delivery status of an email
+
+    Args:
+        idempotency_key (str): Key the email was queued with
+        db_path (str, optional): Path to the outbox database
+
+    Returns:
+        dict: ``status`` (queued, sending, sent or failed), ``attempts`` and the
+        last ``error``, or None if no such email was queued
+    """
+    with closing(connect_outbox_db(db_path)) as conn:
+        row = conn.execute(
+            "SELECT status, attempts, last_error FROM outbox WHERE idempotency_key = ?", (idempotency_key,)
+        ).fetchone()
+        if row is None:
+            row = conn.execute(
+                "SELECT 'failed', attempts, last_error FROM dead_letters WHERE idempotency_key = ?", (idempotency_key,)
+            ).fetchone()
+    if row is None:
+        return None
+    status, attempts, error = row
+    return {"status": status, "attempts": attempts, "error": error}
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt after ``attempts`` failed ones"""
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+def _claim_email(conn, now):
+    """Lease the next due email for sending, or return None"""
+    # BEGIN IMMEDIATE takes the write lock first, so two workers never claim the same email
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT idempotency_key, message, attempts FROM outbox "
+            "WHERE status IN ('queued', 'sending') AND next_attempt_at <= ? "
+            "ORDER BY next_attempt_at LIMIT 1",
+            (_timestamp(now),)
+        ).fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE outbox SET status = 'sending', attempts = attempts + 1, next_attempt_at = ? "
+                "WHERE idempotency_key = ?",
+                (_timestamp(now + datetime.timedelta(seconds=SEND_LEASE_SECONDS)), row[0])
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return row
+
+def _record_failure(conn, idempotency_key, attempts, error, now):
+    """Schedule a retry with backoff, or move the email to the dead-letter table"""
+    with conn:
+        if attempts >= MAX_SEND_ATTEMPTS:
+            conn.execute(
+                "INSERT OR REPLACE INTO dead_letters (idempotency_key, recipient, message, attempts, last_error, failed_at) "
+                "SELECT idempotency_key, recipient, message, attempts, ?, ? FROM outbox WHERE idempotency_key = ?",
+                (error, _timestamp(now), idempotency_key)
+            )
+            conn.execute("DELETE FROM outbox WHERE idempotency_key = ?", (idempotency_key,))
+        else:
+            conn.execute(
+                "UPDATE outbox SET status = 'queued', next_attempt_at = ?, last_error = ? WHERE idempotency_key = ?",
+                (_timestamp(now + datetime.timedelta(seconds=retry_delay(attempts))), error, idempotency_key)
+            )
+
+def send_due_emails(db_path=OUTBOX_DB_PATH, send=send_pooled):
+    """
+    Send due emails one at a time until none are due
+
+    Delivery is at least once: an email is marked sent only after the
+    server accepted it, so a crash in between sends it again.
+
+    Args:
+        db_path (str, optional): Path to the outbox database
+        send (callable, optional): Sends one message, raising on failure
+
+    Returns:
+        dict: Counts of ``sent`` and ``failed`` attempts
+    """
+    summary = {"sent": 0, "failed": 0}
+    with closing(connect_outbox_db(db_path)) as conn:
+        while True:
+            now = datetime.datetime.now()
+            claimed = _claim_email(conn, now)
+            if claimed is None:
+                return summary
+
+            idempotency_key, message, attempts = claimed
+            try:
+                send(email.message_from_bytes(message))
+            except smtplib.SMTPAuthenticationError as auth_error:
+                _record_failure(conn, idempotency_key, attempts + 1, authentication_help(auth_error), datetime.datetime.now())
+                summary["failed"] += 1
+                continue
+            except Exception as e:
+                logger.warning("Sending email %s failed: %s", idempotency_key, e)
+                _record_failure(conn, idempotency_key, attempts + 1, str(e), datetime.datetime.now())
+                summary["failed"] += 1
+                continue
+
+            with conn:
+                conn.execute(
+                    "UPDATE outbox SET status = 'sent', sent_at = ?, last_error = NULL WHERE idempotency_key = ?",
+                    (_timestamp(datetime.datetime.now()), idempotency_key)
+                )
+            summary["sent"] += 1
+
+def _seconds_until_next_email(db_path):
+    """Seconds until the earliest unsent email is due, capped at MAX_SLEEP_SECONDS"""
+    with closing(connect_outbox_db(db_path)) as conn:
+        row = conn.execute(
+            "SELECT MIN(next_attempt_at) FROM outbox WHERE status IN ('queued', 'sending')"
+        ).fetchone()
+    if not row[0]:
+        return MAX_SLEEP_SECONDS
+    next_due = datetime.datetime.fromisoformat(row[0])
+    return min(max((next_due - datetime.datetime.now()).total_seconds(), 0), MAX_SLEEP_SECONDS)
+
+def _run_outbox_worker(db_path):
+    """Send due emails, then sleep until the next one is due or a new one is queued"""
+    while True:
+        try:
+            send_due_emails(db_path)
+            timeout = _seconds_until_next_email(db_path)
+        except Exception:
+            logger.exception("Email outbox worker failed")
+            timeout = RETRY_BASE_SECONDS
+        _outbox_changed.wait(timeout)
+        _outbox_changed.clear()
+
+def start_outbox_workers(db_path=OUTBOX_DB_PATH):
+    """
+    Start the threads that send queued emails, once per process
+
+    Args:
+        db_path (str, optional): Path to the outbox database
+    """
+    with _workers_lock:
+        if db_path in _workers:
+            return
+        _workers[db_path] = [
+            threading.Thread(target=_run_outbox_worker, args=(db_path,), name=f"email-outbox-{number}", daemon=True)
+            for number in range(OUTBOX_WORKERS)
+        ]
+        for worker in _workers[db_path]:
+            worker.start()
@@ -1,8 +1,140 @@
+import os
 import smtplib
+import threading
+import time
 import streamlit as st
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from html import escape
+
+# Gmail SMTP settings
+SMTP_SERVER = "smtp.gmail.com"
+SMTP_PORT = 587
+
+# Display name emails are sent under, from the SMTP account's address
+SENDER_NAME = "Roy at Moxie"
+
+# Authenticated connections kept open at most
+SMTP_POOL_SIZE = 2
+
+# Idle connections are checked with NOOP before reuse after this long,
+# and closed after SMTP_MAX_IDLE_SECONDS, before the server drops them
+SMTP_KEEPALIVE_SECONDS = 30
+SMTP_MAX_IDLE_SECONDS = 240
+
+# Idle pooled connections as (server, last used) pairs
+_idle_connections = []
+_pool_lock = threading.Lock()
+_pool_slots = threading.BoundedSemaphore(SMTP_POOL_SIZE)
+
+def smtp_credentials():
+    """
+    Get the Gmail address and App Password to send from
+    
+    Read from the ``smtp`` section of Streamlit secrets (``username`` and
+    ``password``), falling back to the SMTP_USERNAME and SMTP_PASSWORD
+    environment variables.
+    
+    Returns:
+        tuple: (username, password), each None if not configured
+    """
+    try:
+        settings = st.secrets.get("smtp", {})
+    except Exception:
+        settings = {}
+    return (
+        settings.get("username") or os.environ.get("SMTP_USERNAME"),
+        settings.get("password") or os.environ.get("SMTP_PASSWORD")
+    )
+
+def _open_connection():
+    """Open an authenticated SMTP connection"""
+    username, password = smtp_credentials()
+    if not username or not password:
+        raise smtplib.SMTPAuthenticationError(535, b"SMTP credentials are not configured")
+    
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=30)
+    try:
+        server.starttls()
+        server.login(username, password)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+def _close_connection(server):
+    """Close an SMTP connection, ignoring a server that already hung up"""
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+def _reusable_connection():
+    """Take an idle pooled connection that's still alive, or None"""
+    while True:
+        with _pool_lock:
+            if not _idle_connections:
+                return None
+            server, last_used = _idle_connections.pop()
+        idle = time.monotonic() - last_used
+        if idle > SMTP_MAX_IDLE_SECONDS:
+            _close_connection(server)
+            continue
+        if idle > SMTP_KEEPALIVE_SECONDS:
+            try:
+                if server.noop()[0] != 250:
+                    raise smtplib.SMTPServerDisconnected("NOOP failed")
+            except (smtplib.SMTPException, OSError):
+                _close_connection(server)
+                continue
+        return server
+
+@contextmanager
+def smtp_connection(fresh=False):
+    """
+    Borrow an authenticated SMTP connection from the pool
+    
+    At most SMTP_POOL_SIZE connections are open at once. A connection that
+    raised is closed instead of returned to the pool.
+    
+    Args:
+        fresh (bool, optional): Open a new connection instead of reusing an idle one
+    
+    Yields:
+        smtplib.SMTP: Logged-in connection
+    """
+    with _pool_slots:
+        server = (None if fresh else _reusable_connection()) or _open_connection()
+        try:
+            yield server
+        except Exception:
+            _close_connection(server)
+            raise
+        with _pool_lock:
+            _idle_connections.append((server, time.monotonic()))
+            surplus = _idle_connections[:-SMTP_POOL_SIZE]
+            del _idle_connections[:-SMTP_POOL_SIZE]
+        for server, _ in surplus:
+            _close_connection(server)
+
+def send_pooled(msg):
+    """
+    Send one email over a pooled connection, reconnecting once if the server hung up
+    
+    Args:
+        msg (email.message.Message): Email to send
+        
+    Raises:
+        smtplib.SMTPException: If sending fails
+    """
+    try:
+        with smtp_connection() as server:
+            server.send_message(msg)
+    except (smtplib.SMTPServerDisconnected, ConnectionError):
+        with smtp_connection(fresh=True) as server:
+            server.send_message(msg)
 
 def send_email_to_user(recipient_email, plan):
     """
@@ -16,53 +148,118 @@ def send_email_to_user(recipient_email, plan):
         bool: Success status of the email sending
     """
     try:
-        # Gmail SMTP settings
-        smtp_server = "smtp.gmail.com"
-        smtp_port = 587
+        send_pooled(create_plan_message(recipient_email, plan))
+        st.success("Email sent successfully!")
+        return True
+    except smtplib.SMTPAuthenticationError as auth_error:
+        st.error(authentication_help(auth_error))
+        return False
+    except Exception as e:
+        st.error(f"Error sending email: {e}")
+        return False
+
+def authentication_help(auth_error):
+    """Explain a Gmail authentication error"""
+    return f"""
+    Gmail Authentication Error: {str(auth_error)}
+    
+    For Gmail accounts, you need to:
+    1. Make sure you're using an App Password, not your regular password
+    2. Verify that 2-Step Verification is enabled on your account
+    3. Check that the email address is correct
+    """
+
+def create_plan_message(recipient_email, plan):
+    """
+    Create the launch plan email
+    
+    Args:
+        recipient_email (str): The user's email address
+        plan (dict): The generated launch plan
         
-        # Your Gmail address
-        smtp_username = "stephanie@moxieaibrands.com"  # Update if this is not your Gmail address
+    Returns:
+        email.message.Message: Launch plan email
+    """
+    return _create_message(recipient_email, "Your High-Impact Launch Plan 🚀", _create_email_html(plan))
+
+def send_messages(messages):
+    """
+    Send a batch of emails over one pooled SMTP connection, without any UI output
+    
+    A message the server rejects fails on its own and the rest of the
+    batch is still sent. If the connection drops mid-batch, the messages
+    not yet sent fail.
+    
+    Args:
+        messages (list): Email messages, e.g. from _create_message
         
-        # Your App Password (NOT your regular Gmail password)
-        smtp_password = "tymimbzzquhxsksd"  # Your Gmail App Password without spaces
+    Returns:
+        list: Success status of each message
         
-        # Create message container
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = "Your High-Impact Launch Plan 🚀"
-        msg['From'] = f"Roy at Moxie <{smtp_username}>"
-        msg['To'] = recipient_email
+    Raises:
+        smtplib.SMTPException: If connecting or logging in fails
+    """
+    results = []
+    try:
+        with smtp_connection() as server:
+            for msg in messages:
+                try:
+                    server.send_message(msg)
+                    results.append(True)
+                except smtplib.SMTPServerDisconnected:
+                    # Raised through the pool, so the dead connection is closed rather than reused
+                    raise
+                except smtplib.SMTPException:
+                    results.append(False)
+    except smtplib.SMTPServerDisconnected:
+        if not results:
+            raise
+        # Messages after the one that lost the connection weren't sent
+        results.extend([False] * (len(messages) - len(results)))
+    return results
+
+def _create_message(recipient_email, subject, html_content):
+    """Create an HTML email from the app's sender"""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = f"{SENDER_NAME} <{smtp_credentials()[0] or ''}>"
+    msg['To'] = recipient_email
+    msg.attach(MIMEText(html_content, 'html'))
+    return msg
+
+def create_reminder_message(reminder):
+    """
+    Create the reminder email for an upcoming milestone
+    
+    Args:
+        reminder (dict): Reminder with the milestone's ``name``, ``date``,
+            ``description`` and the ``days_before`` it
         
-        # Create the email content
-        html_content = _create_email_html(plan)
+    Returns:
+        email.message.Message: Reminder email
+    """
+    when = "tomorrow" if reminder["days_before"] == 1 else f"in {reminder['days_before']} days"
+    html = f'''
+    <html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333333;">
+        <p>Hey there,</p>
         
-        # Attach HTML content
-        msg.attach(MIMEText(html_content, 'html'))
+        <p>Quick heads-up: your launch milestone <strong>{escape(reminder['name'])}</strong> is due {when}, on {reminder['date'].strftime('%A, %B %d')}.</p>
         
-        # Connect to server and send
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()
+        <p style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 5px solid #FF5A5F;">
+            {escape(reminder['description'])}
+        </p>
         
-        try:
-            server.login(smtp_username, smtp_password)
-            server.send_message(msg)
-            server.quit()
-            st.success("Email sent successfully!")
-            return True
-        except smtplib.SMTPAuthenticationError as auth_error:
-            st.error(f"""
-            Gmail Authentication Error: {str(auth_error)}
-            
-            For Gmail accounts, you need to:
-            1. Make sure you're using an App Password, not your regular password
-            2. Verify that 2-Step Verification is enabled on your account
-            3. Check that the email address is correct
-            """)
-            server.quit()
-            return False
+        <p>You've got this—I'll be cheering for you.</p>
         
-    except Exception as e:
-        st.error(f"Error sending email: {e}")
-        return False
+        <p>
+            Best,<br>
+            <strong>Steph</strong>
+        </p>
+    </body>
+    </html>
+    '''
+    return _create_message(reminder["email"], f"⏰ {reminder['name']} is due {when}", html)
 
 def _create_email_html(plan):
     """
@@ -0,0 +1,114 @@
+import datetime
+import tempfile
+
+# Domain part of event UIDs, so re-imports match events by milestone ID
+UID_DOMAIN = "launch-planner"
+
+PRODUCT_ID = "-//Launch Planner//Milestones//EN"
+
+# RFC 5545 limits content lines to 75 octets, continued on lines starting with a space
+MAX_LINE_OCTETS = 75
+
+def escape_text(value):
+    """Escape a TEXT property value"""
+    return (
+        str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+def fold_line(line):
+    """
+    Fold a content line into 75-octet pieces without splitting UTF-8 characters
+
+    Args:
+        line (str): Unfolded content line
+
+    Returns:
+        str: Folded line ending in CRLF
+    """
+    encoded = line.encode("utf-8")
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+
+    pieces = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Back up to the start of a UTF-8 character
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        pieces.append(encoded[start:end].decode("utf-8"))
+        start = end
+        # Continuation lines spend one octet on the leading space
+        limit = MAX_LINE_OCTETS - 1
+    return "\r\n ".join(pieces) + "\r\n"
+
+def milestone_event_lines(milestone, stamp):
+    """
+    Build the VEVENT content lines of one all-day milestone
+
+    Args:
+        milestone (dict): Milestone dictionary with a native ``date``
+        stamp (str): DTSTAMP value in UTC
+
+    Returns:
+        list: Unfolded content lines
+    """
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{milestone['id']}@{UID_DOMAIN}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;VALUE=DATE:{milestone['date'].strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(milestone['date'] + datetime.timedelta(days=1)).strftime('%Y%m%d')}",
+        f"SUMMARY:{escape_text(milestone['name'])}",
+        f"DESCRIPTION:{escape_text(milestone['description'])}"
+    ]
+    if milestone.get("type"):
+        lines.append(f"CATEGORIES:{escape_text(milestone['type'])}")
+    lines.append("END:VEVENT")
+    return lines
+
+def iter_ics(milestones, calendar_name="Launch Milestones"):
+    """
+    Stream an iCalendar document with one event per milestone
+
+    Events use the milestone ID as UID, so importing the file again updates
+    events instead of duplicating them.
+
+    Args:
+        milestones (iterable): Milestone dictionaries, consumed lazily
+        calendar_name (str, optional): Calendar display name
+
+    Yields:
+        str: Folded content lines of the calendar header, each event and the footer
+    """
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    yield "".join(fold_line(line) for line in (
+        "BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODUCT_ID}", "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH", f"X-WR-CALNAME:{escape_text(calendar_name)}"
+    ))
+
+    for milestone in milestones:
+        yield "".join(fold_line(line) for line in milestone_event_lines(milestone, stamp))
+
+    yield fold_line("END:VCALENDAR")
+
+def export_ics(milestones, calendar_name="Launch Milestones"):
+    """
+    Write milestones to a temporary .ics file, one event at a time
+
+    Args:
+        milestones (iterable): Milestone dictionaries
+        calendar_name (str, optional): Calendar display name
+
+    Returns:
+        file: Unbuffered binary file positioned at the start of the document,
+        accepted as data by st.download_button
+    """
+    ics_file = tempfile.TemporaryFile(buffering=0)
+    for chunk in iter_ics(milestones, calendar_name):
+        ics_file.write(chunk.encode("utf-8"))
+    ics_file.seek(0)
+    return ics_file
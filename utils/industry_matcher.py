@@ -0,0 +1,136 @@
+import threading
+
+# Alternative names founders type for each industry in data/competitive_launches.json
+INDUSTRY_SYNONYMS = {
+    "SaaS": [
+        "software as a service", "b2b saas", "cloud software", "productivity software",
+        "subscription software", "web app"
+    ],
+    "D2C / E-commerce": [
+        "ecommerce", "e-commerce", "direct to consumer", "dtc", "d2c", "retail", "consumer goods",
+        "consumer products", "fashion", "apparel", "beauty", "cosmetics", "online store", "cpg"
+    ],
+    "Fintech": [
+        "finance", "financial services", "financial technology", "banking", "payments", "lending",
+        "insurtech", "crypto", "web3", "investing", "wealth management", "accounting"
+    ],
+    "Healthcare": [
+        "health", "healthtech", "health tech", "medtech", "medical", "medicine", "wellness",
+        "telehealth", "telemedicine", "digital health", "biotech", "pharma", "mental health", "fitness"
+    ],
+    "Enterprise Software": [
+        "enterprise", "b2b", "b2b software", "devtools", "developer tools", "collaboration",
+        "it software", "cybersecurity", "security", "infrastructure", "hr tech", "martech"
+    ],
+    "AI/ML": [
+        "ai", "artificial intelligence", "machine learning", "ml", "generative ai", "genai",
+        "data science", "llm", "computer vision", "deep learning", "automation"
+    ],
+    "Service": [
+        "services", "agency", "consulting", "consultancy", "marketplace", "freelance",
+        "professional services", "coaching", "education", "edtech", "scheduling"
+    ]
+}
+
+# Minimum Dice similarity of character trigrams for a match
+MIN_SIMILARITY = 0.4
+
+# Similarity given when a word or phrase of the input is a known alias
+PHRASE_SIMILARITY = 0.9
+
+# Matchers built per set of known industries
+_matcher_cache = {}
+_matcher_lock = threading.Lock()
+
+def _normalize(text):
+    """Lowercase and collapse whitespace and separators"""
+    return " ".join(text.lower().replace("/", " ").replace("-", " ").replace("&", " and ").split())
+
+def char_trigrams(text):
+    """Character trigrams of a normalized, space-padded string"""
+    padded = f" {_normalize(text)} "
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+def build_industry_matcher(industries):
+    """
+    Build a trigram inverted index over industries and their synonyms
+
+    Args:
+        industries (list): Known industry names
+
+    Returns:
+        dict: ``aliases`` as (normalized alias, industry) pairs, an ``exact``
+        alias lookup, trigram counts per alias (``sizes``) and trigram
+        ``postings`` (trigram -> alias positions)
+    """
+    aliases = []
+    for industry in industries:
+        for alias in [industry] + INDUSTRY_SYNONYMS.get(industry, []):
+            aliases.append((_normalize(alias), industry))
+
+    postings = {}
+    sizes = []
+    for position, (alias, _) in enumerate(aliases):
+        trigrams = char_trigrams(alias)
+        sizes.append(len(trigrams))
+        for trigram in trigrams:
+            postings.setdefault(trigram, []).append(position)
+
+    return {
+        'aliases': aliases,
+        'exact': {alias: industry for alias, industry in aliases},
+        'sizes': sizes,
+        'postings': postings
+    }
+
+def nearest_industries(text, industries, limit=1):
+    """
+    Map free-text industry input to the closest known industries
+
+    Args:
+        text (str): Industry as typed by the founder, e.g. "Health & wellness"
+        industries (list): Known industry names
+        limit (int, optional): Maximum number of industries to return
+
+    Returns:
+        list: ``(industry, similarity)`` pairs, best first; empty if nothing is close
+    """
+    if not text or not text.strip():
+        return []
+
+    key = tuple(industries)
+    with _matcher_lock:
+        matcher = _matcher_cache.get(key)
+        if matcher is None:
+            matcher = build_industry_matcher(industries)
+            _matcher_cache.clear()
+            _matcher_cache[key] = matcher
+
+    normalized = _normalize(text)
+    exact = matcher['exact'].get(normalized)
+    if exact:
+        return [(exact, 1.0)]
+
+    best = {}
+
+    # Whole words or phrases that name an industry, e.g. "AI tools for lawyers"
+    words = normalized.split()
+    for size in range(1, 4):
+        for start in range(len(words) - size + 1):
+            industry = matcher['exact'].get(" ".join(words[start:start + size]))
+            if industry:
+                best[industry] = max(best.get(industry, 0.0), PHRASE_SIMILARITY)
+
+    trigrams = char_trigrams(text)
+    shared = {}
+    for trigram in trigrams:
+        for position in matcher['postings'].get(trigram, ()):
+            shared[position] = shared.get(position, 0) + 1
+
+    for position, count in shared.items():
+        similarity = 2.0 * count / (len(trigrams) + matcher['sizes'][position])
+        industry = matcher['aliases'][position][1]
+        if similarity >= MIN_SIMILARITY and similarity > best.get(industry, 0.0):
+            best[industry] = similarity
+
+    return sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
@@ -0,0 +1,63 @@
+# Canonical launch types and funding levels, as named in data/competitive_launches.json
+LAUNCH_TYPES = (
+    "New Startup/Product Launch",
+    "Brand Repositioning (Rebrand or Pivot)",
+    "Funding Announcement",
+    "Major Partnership or Publicity Push"
+)
+
+FUNDING_LEVELS = (
+    "Bootstrapping (No external funding)",
+    "Raised under $1M",
+    "Raised $1M-$3M",
+    "Raised $3M+"
+)
+
+# Substrings that identify each canonical value in form labels such as
+# "🚀 Bootstrapping (No external funding, self-funded)"
+_LAUNCH_TYPE_MARKERS = (
+    ("New Startup/Product Launch", LAUNCH_TYPES[0]),
+    ("Brand Repositioning", LAUNCH_TYPES[1]),
+    ("Funding Announcement", LAUNCH_TYPES[2]),
+    ("Partnership", LAUNCH_TYPES[3])
+)
+
+_FUNDING_LEVEL_MARKERS = (
+    ("Bootstrapping", FUNDING_LEVELS[0]),
+    ("under $1M", FUNDING_LEVELS[1]),
+    ("$1M-$3M", FUNDING_LEVELS[2]),
+    ("$3M+", FUNDING_LEVELS[3])
+)
+
+def _canonical(label, markers):
+    """Find the canonical value whose marker appears in a label"""
+    if not label:
+        return None
+    for marker, canonical in markers:
+        if marker in label:
+            return canonical
+    return None
+
+def canonical_launch_type(label):
+    """
+    Map a launch type label to its canonical name
+
+    Args:
+        label (str): Launch type, with or without the form's emoji
+
+    Returns:
+        str: Canonical launch type, or None if unknown
+    """
+    return _canonical(label, _LAUNCH_TYPE_MARKERS)
+
+def canonical_funding_level(label):
+    """
+    Map a funding status label to its canonical funding level
+
+    Args:
+        label (str): Funding status, with or without the form's emoji
+
+    Returns:
+        str: Canonical funding level, or None if unknown
+    """
+    return _canonical(label, _FUNDING_LEVEL_MARKERS)
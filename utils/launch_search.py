@@ -0,0 +1,219 @@
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from contextlib import closing
+
+from utils.competitive_ranking import tokenize
+
+# Example fields that are searchable, in the order snippets prefer them
+SEARCH_FIELDS = ('company', 'approach', 'key_strategies', 'results', 'retrospective_insight', 'notable_tactics')
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+# Words shown on each side of the first match in a snippet
+SNIPPET_RADIUS = 12
+
+_word_pattern = re.compile(r"\S+")
+
+# Process-wide search index per store, refreshed incrementally when the store changes
+_search_cache = {}
+_search_lock = threading.Lock()
+
+def normalize_term(token):
+    """Fold simple plurals so "programs" matches "program" """
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def search_terms(text):
+    """Tokenize text into normalized search terms"""
+    return [normalize_term(token) for token in tokenize(text)]
+
+def _field_text(value):
+    """Flatten a field value into text"""
+    if isinstance(value, list):
+        return "\n".join(str(item) for item in value)
+    return str(value or '')
+
+def build_search_index():
+    """
+    Create an empty BM25 inverted index
+
+    Returns:
+        dict: Postings (term -> doc ID -> term frequency) plus per-document terms,
+        lengths and fingerprints
+    """
+    return {
+        'postings': {},
+        'doc_terms': {},
+        'doc_lengths': {},
+        'fingerprints': {},
+        'total_length': 0
+    }
+
+def add_document(search_index, doc_id, example, fingerprint=None):
+    """
+    Add or replace one document in the index
+
+    Args:
+        search_index (dict): Index from build_search_index
+        doc_id (int): Row ID of the example
+        example (dict): Competitive launch example
+        fingerprint (int, optional): Checksum of the stored example, used to skip unchanged rows
+    """
+    if doc_id in search_index['doc_terms']:
+        remove_document(search_index, doc_id)
+
+    terms = Counter()
+    for field in SEARCH_FIELDS:
+        terms.update(search_terms(_field_text(example.get(field))))
+
+    postings = search_index['postings']
+    for term, frequency in terms.items():
+        postings.setdefault(term, {})[doc_id] = frequency
+
+    length = sum(terms.values())
+    search_index['doc_terms'][doc_id] = tuple(terms)
+    search_index['doc_lengths'][doc_id] = length
+    search_index['fingerprints'][doc_id] = fingerprint
+    search_index['total_length'] += length
+
+def remove_document(search_index, doc_id):
+    """Remove one document from the index, if present"""
+    terms = search_index['doc_terms'].pop(doc_id, None)
+    if terms is None:
+        return
+
+    postings = search_index['postings']
+    for term in terms:
+        term_postings = postings[term]
+        del term_postings[doc_id]
+        if not term_postings:
+            del postings[term]
+
+    search_index['total_length'] -= search_index['doc_lengths'].pop(doc_id)
+    search_index['fingerprints'].pop(doc_id, None)
+
+def search(search_index, query, limit=5):
+    """
+    Rank documents against a query with BM25
+
+    Args:
+        search_index (dict): Index from build_search_index
+        query (str): Free-text query, e.g. "referral programs"
+        limit (int, optional): Maximum number of hits
+
+    Returns:
+        list: ``(doc_id, score)`` pairs, best first with ties broken by doc ID
+    """
+    document_count = len(search_index['doc_lengths'])
+    if not document_count:
+        return []
+
+    average_length = search_index['total_length'] / document_count or 1
+    doc_lengths = search_index['doc_lengths']
+    scores = {}
+    for term in set(search_terms(query)):
+        term_postings = search_index['postings'].get(term)
+        if not term_postings:
+            continue
+        idf = math.log(1 + (document_count - len(term_postings) + 0.5) / (len(term_postings) + 0.5))
+        for doc_id, frequency in term_postings.items():
+            norm = K1 * (1 - B + B * doc_lengths[doc_id] / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+
+    return heapq.nsmallest(limit, scores.items(), key=lambda hit: (-hit[1], hit[0]))
+
+def make_snippet(example, query):
+    """
+    Build a short snippet of an example with the query terms in bold
+
+    Args:
+        example (dict): Competitive launch example
+        query (str): The search query
+
+    Returns:
+        str: Markdown snippet from the field with the most matches
+    """
+    query_terms = set(search_terms(query))
+    best_words, best_matches = None, []
+    for field in SEARCH_FIELDS[1:]:
+        words = _word_pattern.findall(_field_text(example.get(field)))
+        matches = [
+            position for position, word in enumerate(words)
+            if any(normalize_term(token) in query_terms for token in tokenize(word))
+        ]
+        if len(matches) > len(best_matches):
+            best_words, best_matches = words, matches
+
+    if not best_matches:
+        return _field_text(example.get('approach'))
+
+    start = max(0, best_matches[0] - SNIPPET_RADIUS)
+    stop = min(len(best_words), best_matches[0] + SNIPPET_RADIUS + 1)
+    matched = set(best_matches)
+    snippet = " ".join(
+        f"**{word}**" if position in matched else word
+        for position, word in enumerate(best_words[start:stop], start)
+    )
+    return ("… " if start else "") + snippet + (" …" if stop < len(best_words) else "")
+
+def sync_search_index(search_index, db_path):
+    """
+    Bring the index up to date with the store, re-indexing only changed rows
+
+    Args:
+        search_index (dict): Index from build_search_index
+        db_path (str): Path to the competitive launch store
+
+    Returns:
+        int: Number of documents added, replaced or removed
+    """
+    changes = 0
+    seen = set()
+    fingerprints = search_index['fingerprints']
+    with closing(sqlite3.connect(db_path)) as conn:
+        for doc_id, example in conn.execute("SELECT id, example FROM launches"):
+            seen.add(doc_id)
+            fingerprint = zlib.crc32(example.encode("utf-8"))
+            if fingerprints.get(doc_id) != fingerprint or doc_id not in search_index['doc_terms']:
+                add_document(search_index, doc_id, json.loads(example), fingerprint)
+                changes += 1
+
+    for doc_id in [doc_id for doc_id in search_index['doc_terms'] if doc_id not in seen]:
+        remove_document(search_index, doc_id)
+        changes += 1
+
+    return changes
+
+def search_store(db_path, query, limit=5):
+    """
+    Search a competitive launch store, syncing its cached index first if the store changed
+
+    Args:
+        db_path (str): Path to the competitive launch store
+        query (str): Free-text query
+        limit (int, optional): Maximum number of hits
+
+    Returns:
+        list: ``(doc_id, score)`` pairs, best first
+    """
+    mtime = os.path.getmtime(db_path)
+    # Searches hold the lock too, since syncing updates the index in place
+    with _search_lock:
+        cached = _search_cache.get(db_path)
+        if cached and cached[0] == mtime:
+            search_index = cached[1]
+        else:
+            search_index = cached[1] if cached else build_search_index()
+            sync_search_index(search_index, db_path)
+            _search_cache[db_path] = (mtime, search_index)
+        return search(search_index, query, limit)
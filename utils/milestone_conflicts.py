@@ -0,0 +1,151 @@
+import numpy as np
+
+# More milestones than this in progress during one week is an overload
+MAX_WEEKLY_LOAD = 4
+
+# More milestones than this due on one day is a clash
+MAX_DUE_PER_DAY = 1
+
+def milestone_interval(milestone):
+    """Days a milestone is in progress, as inclusive (start, end) ordinals"""
+    end = milestone["date"].toordinal()
+    start_date = milestone.get("start_date")
+    start = start_date.toordinal() if start_date else end
+    return min(start, end), end
+
+def build_interval_tree(intervals):
+    """
+    Build a static interval tree over inclusive (start, end) intervals
+
+    Intervals are sorted by start and laid out as an implicit balanced
+    binary tree, each node augmented with the largest end in its subtree,
+    so overlap queries take O(log n + k).
+
+    Args:
+        intervals (list): (start, end) pairs, e.g. from milestone_interval
+
+    Returns:
+        dict: ``starts``, ``ends`` and subtree ``max_ends`` arrays, plus the
+        original position of each sorted interval in ``items``
+    """
+    starts = np.array([start for start, _ in intervals], dtype=np.int64)
+    ends = np.array([end for _, end in intervals], dtype=np.int64)
+    order = np.lexsort((ends, starts))
+    starts, ends = starts[order], ends[order]
+
+    max_ends = ends.copy()
+    # Fill subtree maxima bottom-up: each node covers a contiguous range centred on it
+    stack = [(0, len(starts), False)]
+    while stack:
+        low, high, children_done = stack.pop()
+        if low >= high:
+            continue
+        middle = (low + high) // 2
+        if children_done:
+            if low < middle:
+                max_ends[middle] = max(max_ends[middle], max_ends[(low + middle) // 2])
+            if middle + 1 < high:
+                max_ends[middle] = max(max_ends[middle], max_ends[(middle + 1 + high) // 2])
+        else:
+            stack.append((low, high, True))
+            stack.append((low, middle, False))
+            stack.append((middle + 1, high, False))
+
+    return {'starts': starts, 'ends': ends, 'max_ends': max_ends, 'items': order}
+
+def query_overlaps(tree, start, end):
+    """
+    Find intervals overlapping an inclusive range
+
+    Args:
+        tree (dict): Tree from build_interval_tree
+        start (int): First day of the range
+        end (int): Last day of the range
+
+    Returns:
+        list: Original positions of the overlapping intervals
+    """
+    starts, ends, max_ends, items = tree['starts'], tree['ends'], tree['max_ends'], tree['items']
+    found = []
+    stack = [(0, len(starts))]
+    while stack:
+        low, high = stack.pop()
+        if low >= high:
+            continue
+        middle = (low + high) // 2
+        # Nothing in this subtree ends on or after the range start
+        if max_ends[middle] < start:
+            continue
+        stack.append((low, middle))
+        if starts[middle] <= end:
+            if ends[middle] >= start:
+                found.append(int(items[middle]))
+            # Intervals to the right start later, so only look there while they can still overlap
+            stack.append((middle + 1, high))
+    return sorted(found)
+
+def weekly_load(intervals, first_day):
+    """
+    Count the milestones in progress during each week
+
+    Args:
+        intervals (list): Inclusive (start, end) ordinals
+        first_day (int): Ordinal of the first day of week 0
+
+    Returns:
+        numpy.ndarray: Milestones in progress per week
+    """
+    starts = np.array([start for start, _ in intervals], dtype=np.int64)
+    ends = np.array([end for _, end in intervals], dtype=np.int64)
+    start_weeks = (starts - first_day) // 7
+    end_weeks = (ends - first_day) // 7
+    weeks = int(end_weeks.max()) + 2
+
+    # +1 in the first week of each interval and -1 after its last, summed up
+    changes = np.bincount(start_weeks, minlength=weeks) - np.bincount(end_weeks + 1, minlength=weeks)
+    return np.cumsum(changes)[:weeks - 1]
+
+def find_overloads(milestones, max_weekly_load=MAX_WEEKLY_LOAD, max_due_per_day=MAX_DUE_PER_DAY):
+    """
+    Find overloaded weeks and days with clashing milestones
+
+    Args:
+        milestones (list): Milestone dictionaries with native dates
+        max_weekly_load (int, optional): Most milestones in progress in one week
+        max_due_per_day (int, optional): Most milestones due on one day
+
+    Returns:
+        dict: ``weeks`` as (week start ordinal, milestones in progress) and
+        ``days`` as (day ordinal, milestones due), each with their milestones
+    """
+    if not milestones:
+        return {'weeks': [], 'days': []}
+
+    intervals = [milestone_interval(milestone) for milestone in milestones]
+    first = min(start for start, _ in intervals)
+    # Weeks start on Monday
+    first_day = first - (first - 1) % 7
+
+    weeks = []
+    load = weekly_load(intervals, first_day)
+    overloaded = np.flatnonzero(load > max_weekly_load)
+    if len(overloaded):
+        tree = build_interval_tree(intervals)
+        for week in overloaded:
+            week_start = first_day + 7 * int(week)
+            positions = query_overlaps(tree, week_start, week_start + 6)
+            weeks.append((week_start, [milestones[position] for position in positions]))
+
+    due = np.array([end for _, end in intervals], dtype=np.int64)
+    due_counts = np.bincount(due - first)
+    days = []
+    clash_days = np.flatnonzero(due_counts > max_due_per_day)
+    if len(clash_days):
+        clash_set = set((clash_days + first).tolist())
+        by_day = {}
+        for milestone, (_, end) in zip(milestones, intervals):
+            if end in clash_set:
+                by_day.setdefault(end, []).append(milestone)
+        days = sorted(by_day.items())
+
+    return {'weeks': weeks, 'days': days}
@@ -0,0 +1,301 @@
+import atexit
+import datetime
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import threading
+from contextlib import closing
+
+from utils.reminder_queue import REMINDER_SCHEMA, backfill_reminders, cancel_reminders, queue_reminders, reminders_changed
+
+MILESTONES_DB_PATH = "data/milestones.db"
+
+# Milestones saved before the database existed, imported once
+MILESTONES_JSON_PATH = "data/milestones.json"
+
+# Writes queued within this many seconds are committed together
+WRITE_DELAY_SECONDS = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS milestones (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    description TEXT NOT NULL,
+    type TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    start_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_milestones_email_date ON milestones (email, date, created_at);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS calendar_keys (
+    email TEXT PRIMARY KEY,
+    key_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+# Queued writes per database, flushed by a timer in one transaction
+_pending_writes = {}
+_pending_timers = {}
+_pending_lock = threading.Lock()
+
+# Held while committing, so batches reach the database in the order they were queued
+_flush_lock = threading.Lock()
+
+# Databases whose schema, migrations and JSON import already ran in this process
+_prepared_dbs = set()
+_prepare_lock = threading.Lock()
+
+def connect_milestone_db(db_path=MILESTONES_DB_PATH, json_path=MILESTONES_JSON_PATH):
+    """
+    Open the milestone database in WAL mode, creating it and importing saved JSON milestones if needed
+
+    The schema, migrations and import run on the first connection in each
+    process; later connections are opened as is.
+
+    Args:
+        db_path (str, optional): Path to the SQLite database
+        json_path (str, optional): Legacy JSON milestones keyed by email
+
+    Returns:
+        sqlite3.Connection: Open connection
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    key = (os.path.abspath(db_path), json_path)
+    if key not in _prepared_dbs:
+        with _prepare_lock:
+            if key not in _prepared_dbs:
+                _prepare_db(conn, json_path)
+                _prepared_dbs.add(key)
+    return conn
+
+def _prepare_db(conn, json_path):
+    """Create the schema, migrate older databases and import the legacy JSON milestones"""
+    # WAL lets sessions read while another session's writes are committed; the mode is kept in the file
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    conn.executescript(REMINDER_SCHEMA)
+    _add_start_date_column(conn)
+    _import_json(conn, json_path)
+    backfill_reminders(conn)
+
+def _add_start_date_column(conn):
+    """Add the start_date column to databases created before it existed"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(milestones)")}
+    if "start_date" not in columns:
+        with conn:
+            conn.execute("ALTER TABLE milestones ADD COLUMN start_date TEXT")
+
+def _import_json(conn, json_path):
+    """Import the legacy JSON milestones once"""
+    if conn.execute("SELECT 1 FROM store_meta WHERE key = 'json_imported'").fetchone():
+        return
+
+    data = {}
+    if json_path and os.path.exists(json_path):
+        with open(json_path, "r") as f:
+            data = json.load(f) or {}
+
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO milestones (id, email, name, date, description, type, created_at, start_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                _milestone_row(email, milestone)
+                for email, milestones in data.items()
+                for milestone in milestones
+            )
+        )
+        conn.execute("INSERT INTO store_meta (key, value) VALUES ('json_imported', ?)", (json_path or "",))
+
+def _milestone_row(email, milestone):
+    """Serialize a milestone into a database row"""
+    created_at = milestone.get("created_at") or datetime.datetime.now()
+    return (
+        milestone["id"],
+        email,
+        milestone["name"],
+        str(milestone["date"]),
+        milestone["description"],
+        milestone.get("type", "pre-launch"),
+        created_at.isoformat(sep=" ", timespec="seconds") if isinstance(created_at, datetime.datetime) else str(created_at),
+        str(milestone["start_date"]) if milestone.get("start_date") else None
+    )
+
+# Columns of a milestone row, in the order milestone_from_row reads them
+MILESTONE_COLUMNS = "id, name, date, description, type, created_at, start_date"
+
+def milestone_from_row(row):
+    """Deserialize a MILESTONE_COLUMNS row into a milestone with native dates"""
+    milestone_id, name, date, description, milestone_type, created_at, start_date = row
+    return {
+        "id": milestone_id,
+        "name": name,
+        "date": datetime.date.fromisoformat(date),
+        "description": description,
+        "type": milestone_type,
+        "created_at": datetime.datetime.fromisoformat(created_at),
+        "start_date": datetime.date.fromisoformat(start_date) if start_date else None
+    }
+
+def load_user_milestones(email, db_path=MILESTONES_DB_PATH):
+    """
+    Load a user's milestones in date order with one indexed query
+
+    Writes still waiting to be committed are flushed first.
+
+    Args:
+        email (str): User's email
+        db_path (str, optional): Path to the SQLite database
+
+    Returns:
+        list: Milestone dictionaries with native dates
+    """
+    flush_writes(db_path)
+    with closing(connect_milestone_db(db_path)) as conn:
+        rows = conn.execute(
+            f"SELECT {MILESTONE_COLUMNS} FROM milestones WHERE email = ? ORDER BY date, created_at",
+            (email,)
+        ).fetchall()
+
+    return [milestone_from_row(row) for row in rows]
+
+def _key_hash(calendar_key):
+    """Hash a calendar key for storage, so the database never holds the key itself"""
+    return hashlib.sha256(calendar_key.encode("utf-8")).hexdigest()
+
+def has_saved_calendar(email, db_path=MILESTONES_DB_PATH):
+    """
+    Check whether a user's calendar is saved, so it only opens with its key
+
+    Args:
+        email (str): User's email
+        db_path (str, optional): Path to the SQLite database
+
+    Returns:
+        bool: True if the email has a calendar key or saved milestones
+    """
+    flush_writes(db_path)
+    with closing(connect_milestone_db(db_path)) as conn:
+        return conn.execute(
+            "SELECT 1 FROM calendar_keys WHERE email = ? UNION ALL SELECT 1 FROM milestones WHERE email = ? LIMIT 1",
+            (email, email)
+        ).fetchone() is not None
+
+def issue_calendar_key(email, db_path=MILESTONES_DB_PATH):
+    """
+    Issue the key that opens a user's saved calendar, if the email has none yet
+
+    Milestones saved before keys existed have no key, so their email can't
+    be claimed by whoever types it in first.
+
+    Args:
+        email (str): User's email
+        db_path (str, optional): Path to the SQLite database
+
+    Returns:
+        str or None: The new key, shown to the user once, or None if the email already has a saved calendar
+    """
+    calendar_key = secrets.token_urlsafe(16)
+    flush_writes(db_path)
+    with closing(connect_milestone_db(db_path)) as conn, conn:
+        # BEGIN IMMEDIATE takes the write lock first, so two sessions never both claim an email
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT 1 FROM milestones WHERE email = ? LIMIT 1", (email,)).fetchone():
+            return None
+        inserted = conn.execute(
+            "INSERT OR IGNORE INTO calendar_keys (email, key_hash, created_at) VALUES (?, ?, ?)",
+            (email, _key_hash(calendar_key), datetime.datetime.now().isoformat(sep=" ", timespec="seconds"))
+        ).rowcount
+    return calendar_key if inserted else None
+
+def verify_calendar_key(email, calendar_key, db_path=MILESTONES_DB_PATH):
+    """
+    Check a key against the one a user's calendar was saved with
+
+    Args:
+        email (str): User's email
+        calendar_key (str): Key entered by the user
+        db_path (str, optional): Path to the SQLite database
+
+    Returns:
+        bool: True if the key opens the user's calendar
+    """
+    if not calendar_key:
+        return False
+    with closing(connect_milestone_db(db_path)) as conn:
+        row = conn.execute("SELECT key_hash FROM calendar_keys WHERE email = ?", (email,)).fetchone()
+    return row is not None and hmac.compare_digest(row[0], _key_hash(calendar_key.strip()))
+
+def queue_write(operation, email, payload=None, db_path=MILESTONES_DB_PATH):
+    """
+    Queue a milestone write, committed with others queued within WRITE_DELAY_SECONDS
+
+    Args:
+        operation (str): "save" (payload is a milestone) or "delete" (payload is
+            a milestone ID)
+        email (str): User's email
+        payload (dict or str, optional): Milestone or milestone ID
+        db_path (str, optional): Path to the SQLite database
+    """
+    with _pending_lock:
+        _pending_writes.setdefault(db_path, []).append((operation, email, payload))
+        if db_path not in _pending_timers:
+            timer = threading.Timer(WRITE_DELAY_SECONDS, flush_writes, args=(db_path,))
+            timer.daemon = True
+            _pending_timers[db_path] = timer
+            timer.start()
+
+def flush_writes(db_path=MILESTONES_DB_PATH):
+    """
+    Commit queued writes in one transaction, in the order they were queued
+
+    Args:
+        db_path (str, optional): Path to the SQLite database
+
+    Returns:
+        int: Number of writes committed
+    """
+    with _flush_lock:
+        with _pending_lock:
+            writes = _pending_writes.pop(db_path, [])
+            timer = _pending_timers.pop(db_path, None)
+        if timer:
+            timer.cancel()
+        if not writes:
+            return 0
+
+        with closing(connect_milestone_db(db_path)) as conn, conn:
+            for operation, email, payload in writes:
+                if operation == "save":
+                    conn.execute(
+                        "INSERT OR REPLACE INTO milestones (id, email, name, date, description, type, created_at, start_date) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        _milestone_row(email, payload)
+                    )
+                    queue_reminders(conn, email, payload)
+                elif operation == "delete":
+                    conn.execute("DELETE FROM milestones WHERE id = ? AND email = ?", (payload, email))
+                    cancel_reminders(conn, email, payload)
+        # A reminder may now be due sooner than the one the worker is waiting for
+        reminders_changed.set()
+        return len(writes)
+
+def flush_all_writes():
+    """Commit queued writes for every database"""
+    with _pending_lock:
+        db_paths = list(_pending_writes)
+    for db_path in db_paths:
+        flush_writes(db_path)
+
+# Don't lose writes still waiting for their timer when the server stops
+atexit.register(flush_all_writes)
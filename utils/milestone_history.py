@@ -0,0 +1,111 @@
+import datetime
+
+from utils.milestone_store import get_milestone, insert_milestone, milestone_sequence, remove_milestone
+
+# Edits kept for undo
+MAX_HISTORY = 50
+
+def create_history():
+    """
+    Create an empty edit history
+
+    Each edit records only the milestones it inserted or removed, as
+    references to the same milestone dictionaries the store holds, so a
+    version costs memory proportional to the change, not to the calendar.
+    Milestones are never modified in place; changing one means removing it
+    and inserting a new dictionary.
+
+    Returns:
+        dict: Edit history with ``undo`` and ``redo`` stacks
+    """
+    return {'undo': [], 'redo': [], 'version': 0}
+
+def apply_changes(store, changes):
+    """
+    Apply insert and remove changes to a store, in order
+
+    Args:
+        store (dict): Milestone store
+        changes (list): ("insert" or "remove", milestone, sequence) tuples;
+            sequence restores a milestone's position and may be None
+
+    Returns:
+        list: The changes that took effect, with the stored milestone and its sequence
+    """
+    applied = []
+    for action, milestone, sequence in changes:
+        if action == "insert":
+            inserted, _ = insert_milestone(store, milestone, sequence)
+            if inserted:
+                applied.append(("insert", milestone, milestone_sequence(store, milestone["id"])))
+        else:
+            stored = get_milestone(store, milestone["id"])
+            if stored is not None:
+                sequence = milestone_sequence(store, milestone["id"])
+                remove_milestone(store, milestone["id"])
+                applied.append(("remove", stored, sequence))
+    return applied
+
+def inverse_changes(changes):
+    """Changes that undo the given ones"""
+    return [
+        ("remove" if action == "insert" else "insert", milestone, sequence)
+        for action, milestone, sequence in reversed(changes)
+    ]
+
+def record_edit(history, label, applied):
+    """
+    Record applied changes as one undoable edit, discarding anything to redo
+
+    Args:
+        history (dict): Edit history
+        label (str): Description shown in the version history
+        applied (list): Changes returned by apply_changes
+    """
+    if not applied:
+        return
+    history['version'] += 1
+    history['undo'].append({
+        'version': history['version'],
+        'label': label,
+        'changes': applied,
+        'time': datetime.datetime.now()
+    })
+    del history['undo'][:-MAX_HISTORY]
+    history['redo'].clear()
+
+def undo_edit(history, store):
+    """
+    Undo the latest edit
+
+    Args:
+        history (dict): Edit history
+        store (dict): Milestone store
+
+    Returns:
+        list: Changes applied to the store, empty if there was nothing to undo
+    """
+    if not history['undo']:
+        return []
+    edit = history['undo'].pop()
+    applied = apply_changes(store, inverse_changes(edit['changes']))
+    history['redo'].append(edit)
+    return applied
+
+def redo_edit(history, store):
+    """
+    Redo the latest undone edit
+
+    Args:
+        history (dict): Edit history
+        store (dict): Milestone store
+
+    Returns:
+        list: Changes applied to the store, empty if there was nothing to redo
+    """
+    if not history['redo']:
+        return []
+    edit = history['redo'].pop()
+    applied = apply_changes(store, edit['changes'])
+    history['undo'].append(edit)
+    return applied
@@ -0,0 +1,196 @@
+import heapq
+
+from utils.business_days import (
+    ALL_DAYS_WEEKMASK, business_calendar, business_day_index, offset_business_days, to_dates
+)
+
+def topological_order(tasks):
+    """
+    Order tasks so every task comes after its dependencies (Kahn's algorithm)
+
+    Args:
+        tasks (dict): Task ID -> task with ``depends_on`` (list of task IDs)
+
+    Returns:
+        tuple: (order, successors) where successors maps task ID -> dependent task IDs
+
+    Raises:
+        ValueError: If a dependency is unknown or the dependencies form a cycle
+    """
+    successors = {task_id: [] for task_id in tasks}
+    remaining = {}
+    for task_id, task in tasks.items():
+        depends_on = task.get('depends_on', ())
+        for dependency in depends_on:
+            if dependency not in tasks:
+                raise ValueError(f"Milestone '{task_id}' depends on unknown milestone '{dependency}'")
+            successors[dependency].append(task_id)
+        remaining[task_id] = len(depends_on)
+
+    order = [task_id for task_id, count in remaining.items() if count == 0]
+    for task_id in order:
+        for successor in successors[task_id]:
+            remaining[successor] -= 1
+            if remaining[successor] == 0:
+                order.append(successor)
+
+    if len(order) < len(tasks):
+        raise ValueError("Milestone dependencies form a cycle")
+    return order, successors
+
+def build_schedule(tasks, start_date, pins=None, calendar=None):
+    """
+    Schedule every task at its earliest date
+
+    A task starts when its last dependency finishes (or at ``start_date``)
+    and finishes ``duration_days`` working days later; the milestone date is
+    the finish. Pinned tasks finish on their pinned date, rolled forward to a
+    working day. A pin earlier than the task's dependencies allow is clamped
+    to its earliest feasible finish and reported in ``conflicts``.
+
+    Dates are computed as working-day indices from the start, then turned
+    into dates for all tasks in one vectorized step.
+
+    Args:
+        tasks (dict): Task ID -> task with ``duration_days`` and ``depends_on``
+        start_date (datetime.date): Date tasks without dependencies start
+        pins (dict, optional): Task ID -> fixed finish date
+        calendar (numpy.busdaycalendar, optional): Working days, defaults to every day
+
+    Returns:
+        dict: Schedule with ``start`` and ``finish`` dates per task, the
+        topological ``order``, the ``driver`` dependency of each task and
+        ``conflicts``, the requested date of each clamped pin
+    """
+    order, successors = topological_order(tasks)
+    schedule = {
+        'tasks': tasks,
+        'start_date': start_date,
+        'calendar': calendar if calendar is not None else business_calendar(ALL_DAYS_WEEKMASK, None),
+        'pins': {},
+        'pin_dates': {},
+        'conflicts': {},
+        'order': order,
+        'position': {task_id: position for position, task_id in enumerate(order)},
+        'successors': successors,
+        'start_index': {},
+        'finish_index': {},
+        'start': {},
+        'finish': {},
+        'driver': {}
+    }
+    for task_id, pin in (pins or {}).items():
+        _pin_task(schedule, task_id, pin)
+    for task_id in order:
+        _schedule_task(schedule, task_id)
+    _materialize_dates(schedule, order)
+    return schedule
+
+def _pin_task(schedule, task_id, finish_date):
+    """Store a pinned finish date as a working-day index"""
+    schedule['pins'][task_id] = business_day_index(schedule['start_date'], finish_date, schedule['calendar'])
+    schedule['pin_dates'][task_id] = finish_date
+
+def _unpin_task(schedule, task_id):
+    """Drop a task's pin and any conflict it caused"""
+    schedule['pins'].pop(task_id, None)
+    schedule['pin_dates'].pop(task_id, None)
+    schedule['conflicts'].pop(task_id, None)
+
+def _schedule_task(schedule, task_id):
+    """Compute one task's working-day indices from its dependencies; returns True if its finish moved"""
+    task = schedule['tasks'][task_id]
+    duration = task.get('duration_days', 0)
+    finish_indices = schedule['finish_index']
+
+    # The dependency that finishes last drives this task's earliest start
+    start, driver = 0, None
+    for dependency in task.get('depends_on', ()):
+        if finish_indices[dependency] > start:
+            start, driver = finish_indices[dependency], dependency
+
+    pin = schedule['pins'].get(task_id)
+    if pin is not None:
+        if pin - duration >= start:
+            start, driver = pin - duration, None
+            schedule['conflicts'].pop(task_id, None)
+        else:
+            # Too early for its dependencies, or before the start date: keep the earliest feasible finish
+            schedule['conflicts'][task_id] = schedule['pin_dates'][task_id]
+
+    finish = start + duration
+    moved = finish_indices.get(task_id) != finish
+    schedule['start_index'][task_id] = start
+    finish_indices[task_id] = finish
+    schedule['driver'][task_id] = driver
+    return moved
+
+def _materialize_dates(schedule, task_ids):
+    """Turn the working-day indices of tasks into dates in one vectorized call"""
+    if not task_ids:
+        return
+    indices = [schedule['start_index'][task_id] for task_id in task_ids]
+    indices += [schedule['finish_index'][task_id] for task_id in task_ids]
+    dates = to_dates(offset_business_days(schedule['start_date'], indices, schedule['calendar']))
+    for task_id, start, finish in zip(task_ids, dates, dates[len(task_ids):]):
+        schedule['start'][task_id] = start
+        schedule['finish'][task_id] = finish
+
+def reschedule(schedule, task_id, finish_date):
+    """
+    Pin one task's date and re-propagate only the tasks downstream of it
+
+    A date earlier than the task's dependencies allow is clamped and
+    reported, as in build_schedule.
+
+    Args:
+        schedule (dict): Schedule from build_schedule, updated in place
+        task_id (str): Task to move
+        finish_date (datetime.date): New date, or None to unpin the task
+
+    Returns:
+        list: IDs of tasks whose dates changed, in topological order
+    """
+    if finish_date is None:
+        _unpin_task(schedule, task_id)
+    else:
+        _pin_task(schedule, task_id, finish_date)
+
+    position = schedule['position']
+    queue = [(position[task_id], task_id)]
+    queued = {task_id}
+    changed = []
+    while queue:
+        _, current = heapq.heappop(queue)
+        if not _schedule_task(schedule, current):
+            continue
+        changed.append(current)
+        for successor in schedule['successors'][current]:
+            if successor not in queued:
+                queued.add(successor)
+                heapq.heappush(queue, (position[successor], successor))
+
+    _materialize_dates(schedule, changed)
+    return changed
+
+def critical_path(schedule):
+    """
+    Find the chain of tasks that determines the latest finish date
+
+    Args:
+        schedule (dict): Schedule from build_schedule
+
+    Returns:
+        list: Task IDs from the first task of the chain to the last-finishing task
+    """
+    if not schedule['order']:
+        return []
+
+    finish_indices = schedule['finish_index']
+    task_id = max(schedule['order'], key=lambda candidate: (finish_indices[candidate], -schedule['position'][candidate]))
+    path = []
+    while task_id is not None:
+        path.append(task_id)
+        task_id = schedule['driver'][task_id]
+    path.reverse()
+    return path
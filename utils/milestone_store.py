@@ -0,0 +1,111 @@
+import bisect
+
+def create_milestone_store():
+    """
+    Create an empty milestone store
+
+    The store keeps milestones by ID, a uniqueness index on
+    (name, date, description) and a date-sorted order, so adding, deleting
+    and looking up a milestone never scans the whole calendar.
+
+    Returns:
+        dict: Empty milestone store
+    """
+    return {
+        'milestones': {},
+        'keys': {},
+        'order': [],
+        'sort_keys': {},
+        'next_sequence': 0
+    }
+
+def milestone_key(milestone):
+    """Uniqueness key of a milestone"""
+    return (milestone["name"], milestone["date"], milestone["description"])
+
+def find_duplicate(store, milestone):
+    """
+    Find a stored milestone with the same name, date and description
+
+    Args:
+        store (dict): Milestone store
+        milestone (dict): Milestone to check
+
+    Returns:
+        dict: The stored duplicate, or None
+    """
+    milestone_id = store['keys'].get(milestone_key(milestone))
+    return store['milestones'].get(milestone_id)
+
+def insert_milestone(store, milestone, sequence=None):
+    """
+    Insert a milestone, unless an identical one is already stored
+
+    Args:
+        store (dict): Milestone store
+        milestone (dict): Milestone with ``id``, ``name``, ``date`` and ``description``
+        sequence (int, optional): Position among milestones on the same date,
+            e.g. from milestone_sequence to put a removed milestone back in place
+
+    Returns:
+        tuple: (inserted, ID of the stored milestone)
+    """
+    duplicate = find_duplicate(store, milestone)
+    if duplicate:
+        return False, duplicate["id"]
+
+    if milestone["id"] in store['milestones']:
+        remove_milestone(store, milestone["id"])
+
+    # Milestones on the same date keep the order they were added in
+    if sequence is None:
+        sequence = store['next_sequence']
+        store['next_sequence'] += 1
+    sort_key = (milestone["date"], sequence, milestone["id"])
+    bisect.insort(store['order'], sort_key)
+    store['sort_keys'][milestone["id"]] = sort_key
+    store['keys'][milestone_key(milestone)] = milestone["id"]
+    store['milestones'][milestone["id"]] = milestone
+    return True, milestone["id"]
+
+def remove_milestone(store, milestone_id):
+    """
+    Remove a milestone by ID
+
+    Args:
+        store (dict): Milestone store
+        milestone_id (str): ID of the milestone
+
+    Returns:
+        bool: True if a milestone was removed
+    """
+    milestone = store['milestones'].pop(milestone_id, None)
+    if milestone is None:
+        return False
+
+    sort_key = store['sort_keys'].pop(milestone_id)
+    del store['order'][bisect.bisect_left(store['order'], sort_key)]
+    del store['keys'][milestone_key(milestone)]
+    return True
+
+def milestone_sequence(store, milestone_id):
+    """Position of a stored milestone among milestones on the same date, or None"""
+    sort_key = store['sort_keys'].get(milestone_id)
+    return sort_key[1] if sort_key else None
+
+def get_milestone(store, milestone_id):
+    """Look up a milestone by ID, or None"""
+    return store['milestones'].get(milestone_id)
+
+def iter_milestones(store):
+    """Iterate over milestones in date order"""
+    milestones = store['milestones']
+    for _, _, milestone_id in store['order']:
+        yield milestones[milestone_id]
+
+def clear_milestones(store):
+    """Remove every milestone"""
+    store['milestones'].clear()
+    store['keys'].clear()
+    store['order'].clear()
+    store['sort_keys'].clear()
@@ -0,0 +1,123 @@
+import datetime
+import json
+import threading
+
+import numpy as np
+
+from utils.business_days import ALL_DAYS_WEEKMASK, business_calendar, offset_business_days
+from utils.launch_labels import FUNDING_LEVELS, LAUNCH_TYPES, canonical_funding_level, canonical_launch_type
+from utils.milestone_scheduler import build_schedule, critical_path
+
+MILESTONE_TEMPLATES_PATH = "data/milestone_templates.json"
+
+_templates_cache = {}
+_templates_lock = threading.Lock()
+
+def _template_tasks(definition, launch_type, funding_level):
+    """Expand the template definition for one launch type and funding level into scheduler tasks in weeks"""
+    tasks = {}
+    required_by = []
+    for milestone in definition["milestones"] + definition["launch_types"].get(launch_type, []):
+        duration = milestone["duration_weeks"]
+        if isinstance(duration, dict):
+            duration = duration.get(funding_level, duration["default"])
+        tasks[milestone["key"]] = {
+            "name": milestone["name"],
+            "description": milestone["description"],
+            "type": milestone["type"],
+            "duration_days": duration,
+            "depends_on": list(milestone["depends_on"])
+        }
+        required_by.extend((successor, milestone["key"]) for successor in milestone.get("required_by", ()))
+
+    for successor, dependency in required_by:
+        tasks[successor]["depends_on"].append(dependency)
+    return tasks
+
+def compile_template(tasks):
+    """
+    Compile milestone tasks into offsets ready to shift onto any start date
+
+    Args:
+        tasks (dict): Task ID -> task with ``duration_days`` and ``depends_on``,
+            durations in any unit
+
+    Returns:
+        dict: Template with the task ``keys`` and ``tasks``, ``start_offsets``
+        and ``finish_offsets`` arrays in the same unit, and ``critical`` flags
+    """
+    # Offsets don't depend on dates, so schedule once on a plain calendar
+    schedule = build_schedule(tasks, datetime.date(2000, 1, 1), calendar=business_calendar(ALL_DAYS_WEEKMASK, None))
+    keys = list(tasks)
+    critical = set(critical_path(schedule))
+    return {
+        'keys': keys,
+        'tasks': tasks,
+        'start_offsets': np.array([schedule['start_index'][key] for key in keys], dtype=np.int64),
+        'finish_offsets': np.array([schedule['finish_index'][key] for key in keys], dtype=np.int64),
+        'critical': np.array([key in critical for key in keys])
+    }
+
+def load_milestone_templates(path=MILESTONE_TEMPLATES_PATH):
+    """
+    Load and compile the milestone templates once per file
+
+    Templates are compiled for every canonical launch type and funding
+    level, plus None for labels that match neither.
+
+    Args:
+        path (str, optional): Template definition file
+
+    Returns:
+        dict: (launch type, funding level) -> template from compile_template,
+        with offsets in weeks
+    """
+    with _templates_lock:
+        templates = _templates_cache.get(path)
+        if templates is None:
+            with open(path, "r") as f:
+                definition = json.load(f)
+            templates = {
+                (launch_type, funding_level): compile_template(_template_tasks(definition, launch_type, funding_level))
+                for launch_type in LAUNCH_TYPES + (None,)
+                for funding_level in FUNDING_LEVELS + (None,)
+            }
+            _templates_cache[path] = templates
+        return templates
+
+def milestone_template(launch_type, funding_status, path=MILESTONE_TEMPLATES_PATH):
+    """
+    Get the compiled template for a plan's launch type and funding status labels
+
+    Args:
+        launch_type (str): Launch type label
+        funding_status (str): Funding status label
+        path (str, optional): Template definition file
+
+    Returns:
+        dict: Template from compile_template, with offsets in weeks
+    """
+    templates = load_milestone_templates(path)
+    return templates[(canonical_launch_type(launch_type), canonical_funding_level(funding_status))]
+
+def template_dates(template, start_dates, calendar, week):
+    """
+    Shift a template onto start dates, vectorized over plans and milestones
+
+    Args:
+        template (dict): Template from milestone_template
+        start_dates (date or array-like): One start date, or one per plan
+        calendar (numpy.busdaycalendar): Working days
+        week (int): Working days per template week
+
+    Returns:
+        tuple: (start dates, finish dates) as datetime64[D] arrays with one
+        column per milestone, and one row per plan when several start dates are given
+    """
+    start_dates = np.asarray(start_dates, dtype="datetime64[D]")
+    if start_dates.ndim:
+        start_dates = start_dates[:, np.newaxis]
+    offsets = np.concatenate((template['start_offsets'], template['finish_offsets'])) * week
+    dates = offset_business_days(start_dates, offsets, calendar)
+    middle = len(template['keys'])
+    return dates[..., :middle], dates[..., middle:]
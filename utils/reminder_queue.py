@@ -0,0 +1,199 @@
+import datetime
+import threading
+
+# Days before a milestone that its reminders are due
+REMINDER_DAYS_BEFORE = (7, 1)
+
+# Local hour reminders go out at
+REMINDER_HOUR = 9
+
+# Claimed reminders that aren't confirmed sent become due again after this long
+REMINDER_LEASE_SECONDS = 300
+
+# Reminders still failing after this many attempts are dropped
+MAX_REMINDER_ATTEMPTS = 5
+
+# The reminders table, indexed on due time, is the persistent priority
+# queue: the next due reminder is one index seek away and nothing is held
+# in memory
+REMINDER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reminders (
+    email TEXT NOT NULL,
+    milestone_id TEXT NOT NULL,
+    days_before INTEGER NOT NULL,
+    due_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (email, milestone_id, days_before)
+);
+CREATE INDEX IF NOT EXISTS idx_reminders_due_at ON reminders (due_at);
+"""
+
+# Set when reminders are queued, so a sleeping worker checks for an earlier one
+reminders_changed = threading.Event()
+
+def _timestamp(value):
+    """Format a datetime the way due times are stored, so they sort as text"""
+    return value.isoformat(sep=" ", timespec="seconds")
+
+def reminder_due_times(milestone_date, now=None):
+    """
+    Due times of a milestone's reminders that are still in the future
+
+    Args:
+        milestone_date (datetime.date): Milestone date
+        now (datetime.datetime, optional): Current time
+
+    Returns:
+        list: (days before, due datetime) pairs
+    """
+    now = now or datetime.datetime.now()
+    due_times = []
+    for days_before in REMINDER_DAYS_BEFORE:
+        due_at = datetime.datetime.combine(milestone_date - datetime.timedelta(days=days_before), datetime.time(REMINDER_HOUR))
+        if due_at > now:
+            due_times.append((days_before, due_at))
+    return due_times
+
+def queue_reminders(conn, email, milestone):
+    """
+    Replace a milestone's pending reminders with ones for its current date
+
+    Args:
+        conn (sqlite3.Connection): Milestone database, inside the caller's transaction
+        email (str): User's email
+        milestone (dict): Milestone with ``id`` and a native ``date``
+    """
+    cancel_reminders(conn, email, milestone["id"])
+    conn.executemany(
+        "INSERT INTO reminders (email, milestone_id, days_before, due_at) VALUES (?, ?, ?, ?)",
+        [
+            (email, milestone["id"], days_before, _timestamp(due_at))
+            for days_before, due_at in reminder_due_times(milestone["date"])
+        ]
+    )
+
+def cancel_reminders(conn, email, milestone_id):
+    """
+    Drop pending reminders of one milestone
+
+    Args:
+        conn (sqlite3.Connection): Milestone database, inside the caller's transaction
+        email (str): User's email
+        milestone_id (str): Milestone ID
+    """
+    conn.execute("DELETE FROM reminders WHERE email = ? AND milestone_id = ?", (email, milestone_id))
+
+def backfill_reminders(conn):
+    """Queue reminders once for milestones saved before reminders existed"""
+    if conn.execute("SELECT 1 FROM store_meta WHERE key = 'reminders_backfilled'").fetchone():
+        return
+
+    now = datetime.datetime.now()
+    with conn:
+        rows = conn.execute("SELECT email, id, date FROM milestones WHERE date >= ?", (now.date().isoformat(),))
+        conn.executemany(
+            "INSERT OR IGNORE INTO reminders (email, milestone_id, days_before, due_at) VALUES (?, ?, ?, ?)",
+            [
+                (email, milestone_id, days_before, _timestamp(due_at))
+                for email, milestone_id, date in rows.fetchall()
+                for days_before, due_at in reminder_due_times(datetime.date.fromisoformat(date), now)
+            ]
+        )
+        conn.execute("INSERT INTO store_meta (key, value) VALUES ('reminders_backfilled', ?)", (_timestamp(now),))
+
+def next_reminder_due(conn):
+    """Due time of the earliest pending reminder, or None"""
+    row = conn.execute("SELECT MIN(due_at) FROM reminders").fetchone()
+    return datetime.datetime.fromisoformat(row[0]) if row[0] else None
+
+def claim_due_reminders(conn, limit, now=None):
+    """
+    Claim a batch of due reminders for sending
+
+    Claimed reminders are leased rather than removed: they become due again
+    after REMINDER_LEASE_SECONDS unless release_reminders confirms them, so
+    a worker that dies mid-batch doesn't lose them. Reminders due at the same
+    time are claimed in a fixed order, by user and milestone.
+
+    Args:
+        conn (sqlite3.Connection): Milestone database
+        limit (int): Most reminders to claim
+        now (datetime.datetime, optional): Current time
+
+    Returns:
+        list: Reminder dicts with the milestone's ``name``, ``date`` and ``description``
+    """
+    now = now or datetime.datetime.now()
+    lease = _timestamp(now + datetime.timedelta(seconds=REMINDER_LEASE_SECONDS))
+    # BEGIN IMMEDIATE takes the write lock first, so two workers never claim the same reminders
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows = conn.execute(
+            "SELECT r.email, r.milestone_id, r.days_before, r.attempts, m.name, m.date, m.description "
+            "FROM reminders r LEFT JOIN milestones m ON m.id = r.milestone_id AND m.email = r.email "
+            "WHERE r.due_at <= ? ORDER BY r.due_at, r.email, r.milestone_id, r.days_before DESC LIMIT ?",
+            (_timestamp(now), limit)
+        ).fetchall()
+        conn.executemany(
+            "UPDATE reminders SET due_at = ?, attempts = attempts + 1 "
+            "WHERE email = ? AND milestone_id = ? AND days_before = ?",
+            [(lease, email, milestone_id, days_before) for email, milestone_id, days_before, _, name, *_ in rows if name is not None]
+        )
+        # Reminders whose milestone is gone can never be sent
+        conn.executemany(
+            "DELETE FROM reminders WHERE email = ? AND milestone_id = ? AND days_before = ?",
+            [(email, milestone_id, days_before) for email, milestone_id, days_before, _, name, *_ in rows if name is None]
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    return [
+        {
+            "email": email,
+            "milestone_id": milestone_id,
+            "days_before": days_before,
+            "attempts": attempts + 1,
+            "name": name,
+            "date": datetime.date.fromisoformat(date),
+            "description": description,
+            "lease": lease
+        }
+        for email, milestone_id, days_before, attempts, name, date, description in rows
+        if name is not None
+    ]
+
+# Matches a claimed reminder only while its lease stands, so a reminder
+# replaced by a milestone edit during sending is left alone
+_CLAIMED = "email = ? AND milestone_id = ? AND days_before = ? AND due_at = ?"
+
+def _claim_key(reminder):
+    """Parameters of _CLAIMED for a claimed reminder"""
+    return reminder["email"], reminder["milestone_id"], reminder["days_before"], reminder["lease"]
+
+def release_reminders(conn, sent, failed, retry_seconds):
+    """
+    Remove sent reminders and reschedule failed ones
+
+    Args:
+        conn (sqlite3.Connection): Milestone database
+        sent (list): Reminders from claim_due_reminders that were sent
+        failed (list): Reminders that failed; retried after ``retry_seconds``
+            times their attempts, and dropped after MAX_REMINDER_ATTEMPTS
+        retry_seconds (int): Base retry delay
+    """
+    now = datetime.datetime.now()
+    with conn:
+        conn.executemany(
+            f"DELETE FROM reminders WHERE {_CLAIMED}",
+            [_claim_key(reminder) for reminder in sent]
+            + [_claim_key(reminder) for reminder in failed if reminder["attempts"] >= MAX_REMINDER_ATTEMPTS]
+        )
+        conn.executemany(
+            f"UPDATE reminders SET due_at = ? WHERE {_CLAIMED}",
+            [
+                (_timestamp(now + datetime.timedelta(seconds=retry_seconds * reminder["attempts"])),) + _claim_key(reminder)
+                for reminder in failed if reminder["attempts"] < MAX_REMINDER_ATTEMPTS
+            ]
+        )
@@ -0,0 +1,92 @@
+import datetime
+import logging
+import threading
+from contextlib import closing
+
+from utils.email_sender import create_reminder_message, send_messages
+from utils.milestone_db import MILESTONES_DB_PATH, connect_milestone_db
+from utils.reminder_queue import claim_due_reminders, next_reminder_due, release_reminders, reminders_changed
+
+# Reminders sent per SMTP connection
+REMINDER_BATCH_SIZE = 100
+
+# Longest the worker sleeps between checks, so clock changes and reminders
+# queued by other processes are picked up eventually
+MAX_SLEEP_SECONDS = 3600
+
+# Base delay before a failed reminder is retried, multiplied by its attempts
+RETRY_SECONDS = 600
+
+logger = logging.getLogger(__name__)
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+def send_due_reminders(db_path=MILESTONES_DB_PATH, send=send_messages, batch_size=REMINDER_BATCH_SIZE, now=None):
+    """
+    Send every due reminder, one batch per SMTP connection
+
+    Args:
+        db_path (str, optional): Path to the milestone database
+        send (callable, optional): Sends a list of messages and returns their success
+        batch_size (int, optional): Reminders per batch
+        now (datetime.datetime, optional): Current time
+
+    Returns:
+        dict: Counts of ``sent`` and ``failed`` reminders
+    """
+    summary = {"sent": 0, "failed": 0}
+    with closing(connect_milestone_db(db_path)) as conn:
+        while True:
+            reminders = claim_due_reminders(conn, batch_size, now)
+            if not reminders:
+                return summary
+
+            try:
+                results = send([create_reminder_message(reminder) for reminder in reminders])
+            except Exception as e:
+                logger.warning("Sending reminders failed: %s", e)
+                results = [False] * len(reminders)
+
+            sent = [reminder for reminder, success in zip(reminders, results) if success]
+            failed = [reminder for reminder, success in zip(reminders, results) if not success]
+            release_reminders(conn, sent, failed, RETRY_SECONDS)
+            summary["sent"] += len(sent)
+            summary["failed"] += len(failed)
+            if failed and not sent:
+                # The server is refusing everything; leave the rest for the retry
+                return summary
+
+def _seconds_until_next_reminder(db_path):
+    """Seconds until the earliest pending reminder is due, capped at MAX_SLEEP_SECONDS"""
+    with closing(connect_milestone_db(db_path)) as conn:
+        next_due = next_reminder_due(conn)
+    if next_due is None:
+        return MAX_SLEEP_SECONDS
+    return min(max((next_due - datetime.datetime.now()).total_seconds(), 0), MAX_SLEEP_SECONDS)
+
+def _run_worker(db_path):
+    """Sleep until the next reminder is due or new ones are queued, then send what's due"""
+    while True:
+        try:
+            send_due_reminders(db_path)
+            timeout = _seconds_until_next_reminder(db_path)
+        except Exception:
+            logger.exception("Reminder worker failed")
+            timeout = RETRY_SECONDS
+        reminders_changed.wait(timeout)
+        reminders_changed.clear()
+
+def start_reminder_worker(db_path=MILESTONES_DB_PATH):
+    """
+    Start the background thread that sends reminder emails, once per process
+
+    Args:
+        db_path (str, optional): Path to the milestone database
+    """
+    with _workers_lock:
+        if db_path in _workers:
+            return
+        worker = threading.Thread(target=_run_worker, args=(db_path,), name="reminder-worker", daemon=True)
+        _workers[db_path] = worker
+        worker.start()
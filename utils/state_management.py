@@ -19,8 +19,14 @@ def reset_form():
     st.session_state.show_calendar = False
     
     # Reset milestone-related session state
-    if "session_milestones" in st.session_state:
-        del st.session_state.session_milestones
+    if "milestone_store" in st.session_state:
+        del st.session_state.milestone_store
+    if "milestone_store_email" in st.session_state:
+        del st.session_state.milestone_store_email
+    if "new_calendar_key" in st.session_state:
+        del st.session_state.new_calendar_key
+    if "milestone_history" in st.session_state:
+        del st.session_state.milestone_history
     if "milestones_to_delete" in st.session_state:
         del st.session_state.milestones_to_delete
         